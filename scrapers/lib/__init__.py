@@ -1,6 +1,7 @@
 from .base import BaseScraper
 from .cityspark import CitySparkScraper, BohemianScraper, PressDemocratScraper
 from .elfsight import ElfsightCalendarScraper, fetch_elfsight_data, expand_recurring_events
+from .http_client import HttpClient, get_http_client
 from .ics import IcsScraper, GoogleCalendarScraper
 from .jsonld import JsonLdScraper, extract_jsonld_blocks, extract_events_from_blocks, parse_location
 from .rss import RssScraper
@@ -22,6 +23,8 @@ __all__ = [
     'ElfsightCalendarScraper',
     'fetch_elfsight_data',
     'expand_recurring_events',
+    'HttpClient',
+    'get_http_client',
     'IcsScraper',
     'GoogleCalendarScraper',
     'JsonLdScraper',
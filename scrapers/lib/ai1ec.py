@@ -25,7 +25,6 @@ from datetime import datetime, timedelta
 from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
-import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
@@ -84,7 +83,7 @@ class Ai1ecScraper(BaseScraper):
 
     def _fetch_page(self, url: str) -> list[dict[str, Any]]:
         """Fetch and parse events from a single calendar page."""
-        response = requests.get(url, headers=BROWSER_HEADERS, timeout=30)
+        response = self.http.get(url, headers=BROWSER_HEADERS, timeout=30)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -11,6 +11,8 @@ from zoneinfo import ZoneInfo
 
 from icalendar import Calendar, Event
 
+from .http_client import ScopedHttpClient, get_http_client
+from .pagination import DEFAULT_PAGE_CONCURRENCY
 from .utils import generate_uid
 
 
@@ -30,16 +32,32 @@ class BaseScraper(ABC):
     - url: str (optional)
     - location: str (optional)
     - description: str (optional)
+
+    HTTP requests should go through self.http, the shared pooled client
+    (see http_client.py); host_rate_limits maps a host to its own
+    requests-per-second limit. Paginated libraries fetch up to
+    page_concurrency pages at once (see pagination.py).
     """
 
     name: str = "Unknown Source"
     domain: str = "example.com"
     timezone: str = "America/Los_Angeles"
     default_url: Optional[str] = None
+    host_rate_limits: dict[str, float] = {}
+    page_concurrency: int = DEFAULT_PAGE_CONCURRENCY
 
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.months_ahead = int(os.environ.get('SCRAPE_MONTHS', 6))
+        self.page_concurrency = int(os.environ.get('SCRAPE_PAGE_CONCURRENCY', self.page_concurrency))
+
+    @property
+    def http(self) -> ScopedHttpClient:
+        """Shared HTTP client with pooling, retry/backoff and per-host rate limits.
+
+        This scraper's host_rate_limits apply to its own requests only.
+        """
+        return get_http_client().scoped(self.host_rate_limits)
 
     @classmethod
     def setup_logging(cls, level: int = logging.INFO):
@@ -4,10 +4,10 @@ from datetime import datetime, timedelta
 from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
-import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
+from .pagination import fetch_pages
 
 
 class BibliocommonsEventsScraper(BaseScraper):
@@ -48,8 +48,15 @@ class BibliocommonsEventsScraper(BaseScraper):
         events: list[dict[str, Any]] = []
         seen_ids: set[str] = set()
 
-        for page in range(1, self.max_pages + 1):
-            payload = self._fetch_page(base_url, page)
+        # Pages after the first are fetched concurrently, up to the page
+        # count in the first response's pagination block when present
+        pages = fetch_pages(
+            lambda page: self._fetch_page(base_url, page),
+            page_count=lambda payload: payload["events"]["pagination"]["pages"],
+            max_pages=self.max_pages,
+            max_workers=self.page_concurrency,
+        )
+        for _, payload in pages:
             if not payload:
                 break
 
@@ -98,7 +105,7 @@ class BibliocommonsEventsScraper(BaseScraper):
 
     def _fetch_page(self, base_url: str, page: int) -> Optional[dict[str, Any]]:
         try:
-            resp = requests.get(
+            resp = self.http.get(
                 base_url,
                 params={"limit": self.page_limit, "page": page},
                 headers=self.headers,
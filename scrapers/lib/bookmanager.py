@@ -24,7 +24,6 @@ from datetime import date, datetime
 from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
-import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
@@ -68,13 +67,13 @@ class BookmanagerEventsScraper(BaseScraper):
     def _post(self, endpoint: str, params: dict[str, str]) -> dict[str, Any]:
         """POST multipart form to Bookmanager API with the right Origin header."""
         url = f"{self.api_base}{endpoint}?_cb={self.san}"
-        # requests.post with files= forces multipart/form-data encoding even for
+        # A POST with files= forces multipart/form-data encoding even for
         # plain string fields, which matches what the SPA sends.
         files = {k: (None, str(v)) for k, v in params.items()}
         headers = dict(self.headers)
         headers["Origin"] = f"https://{self.domain}"
         headers["Referer"] = f"https://{self.domain}/events"
-        resp = requests.post(url, files=files, headers=headers, timeout=self.request_timeout)
+        resp = self.http.post(url, files=files, headers=headers, timeout=self.request_timeout)
         resp.raise_for_status()
         return resp.json()
 
@@ -8,9 +8,8 @@ from datetime import datetime, timedelta
 from typing import Any
 from zoneinfo import ZoneInfo
 
-import requests
-
 from .base import BaseScraper
+from .pagination import fetch_pages
 
 
 class CitySparkScraper(BaseScraper):
@@ -34,13 +33,14 @@ class CitySparkScraper(BaseScraper):
     lng: float = 0.0
     distance: int = 30
     calendar_url: str = ""
+    page_size: int = 100  # API max
     API_BASE = "https://portal.cityspark.com/v1/events"
 
     def fetch_events(self) -> list[dict[str, Any]]:
         """Fetch events from CitySpark API."""
         results = []
         seen_ids = set()
-        page_size = 100  # API max
+        page_size = self.page_size
 
         # Fetch from today to N months ahead
         now = datetime.now()
@@ -50,9 +50,8 @@ class CitySparkScraper(BaseScraper):
         start_str = start_date.strftime("%Y-%m-%dT%H:%M:%S")
         end_str = end_date.strftime("%Y-%m-%dT%H:%M:%S")
 
-        skip = 0
-        while True:
-            url = f"{self.API_BASE}/{self.api_slug}"
+        def fetch_page(page: int) -> dict:
+            skip = (page - 1) * page_size
             payload = {
                 "ppid": self.ppid,
                 "start": start_str,
@@ -64,12 +63,15 @@ class CitySparkScraper(BaseScraper):
                 "skip": skip,
                 "tps": str(page_size)
             }
-
             self.logger.info(f"Fetching page at skip={skip}")
-            response = requests.post(url, json=payload, headers={'Content-Type': 'application/json'})
+            response = self.http.post(f"{self.API_BASE}/{self.api_slug}", json=payload,
+                                      headers={'Content-Type': 'application/json'})
             response.raise_for_status()
-            data = response.json()
+            return response.json()
 
+        # The API reports no total, so pages are fetched a bounded window
+        # ahead of the one being read; a short page ends the listing.
+        for _, data in fetch_pages(fetch_page, max_workers=self.page_concurrency):
             events = data.get('Value') or []
             if not events:
                 break
@@ -86,7 +88,6 @@ class CitySparkScraper(BaseScraper):
 
             if len(events) < page_size:
                 break
-            skip += page_size
 
         return results
 
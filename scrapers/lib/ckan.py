@@ -7,7 +7,6 @@ The datastore API is standardized: same pagination, same JSON envelope.
 Subclasses provide a resource_id and map_record() to convert rows to events.
 """
 
-import requests
 from abc import abstractmethod
 from typing import Any, Optional
 
@@ -67,7 +66,7 @@ class CKANScraper(BaseScraper):
             url = f"{self.ckan_base_url}/api/3/action/datastore_search"
             self.logger.info(f"Fetching offset={offset}")
 
-            resp = requests.get(url, params=params, headers=HEADERS, timeout=30)
+            resp = self.http.get(url, params=params, headers=HEADERS, timeout=30)
             resp.raise_for_status()
             data = resp.json()
 
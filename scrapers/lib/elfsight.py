@@ -27,17 +27,18 @@ import logging
 import re
 from datetime import datetime, timedelta
 from typing import Any, Optional
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
+
+import requests
 
 from .base import BaseScraper
+from .http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 ELFSIGHT_API_BASE = "https://core.service.elfsight.com/p/boot/"
 
 
-def fetch_elfsight_data(widget_id: str, source_page: str) -> Optional[dict]:
+def fetch_elfsight_data(widget_id: str, source_page: str, http=None) -> Optional[dict]:
     """
     Fetch event data from Elfsight API.
     
@@ -53,13 +54,14 @@ def fetch_elfsight_data(widget_id: str, source_page: str) -> Optional[dict]:
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
-    req = Request(url, headers=headers)
-    
+    http = http or get_http_client()
+
     try:
-        with urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode('utf-8'))
-            return data['data']['widgets'][widget_id]['data']['settings']
-    except (HTTPError, URLError) as e:
+        resp = http.get(url, headers=headers, timeout=30)
+        resp.raise_for_status()
+        data = json.loads(resp.content.decode('utf-8'))
+        return data['data']['widgets'][widget_id]['data']['settings']
+    except requests.RequestException as e:
         logger.error(f"HTTP error fetching Elfsight data: {e}")
         return None
     except (json.JSONDecodeError, KeyError) as e:
@@ -207,7 +209,7 @@ class ElfsightCalendarScraper(BaseScraper):
         """Fetch and cache the Elfsight widget settings."""
         if self._settings is None:
             self.logger.info(f"Fetching Elfsight data for widget {self.widget_id}")
-            self._settings = fetch_elfsight_data(self.widget_id, self.source_page)
+            self._settings = fetch_elfsight_data(self.widget_id, self.source_page, self.http)
             
             if self._settings:
                 # Build lookup maps
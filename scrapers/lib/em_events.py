@@ -27,7 +27,6 @@ from datetime import datetime, timedelta
 from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
-import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
@@ -155,7 +154,7 @@ class EmEventsScraper(BaseScraper):
 
     def _fetch_page(self, pno: int) -> list[dict[str, Any]]:
         """Fetch and parse a single page of events from the EM AJAX endpoint."""
-        response = requests.post(
+        response = self.http.post(
             self.ajax_url,
             headers=BROWSER_HEADERS,
             data={
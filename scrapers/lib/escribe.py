@@ -8,7 +8,6 @@ import re
 from datetime import datetime, timedelta
 from typing import Any, Optional
 from urllib.parse import urljoin
-from urllib.request import Request, urlopen
 from zoneinfo import ZoneInfo
 
 from .base import BaseScraper
@@ -40,14 +39,14 @@ class EScribeScraper(BaseScraper):
         }).encode()
 
     def fetch_records(self) -> list[dict[str, Any]]:
-        req = Request(
+        resp = self.http.post(
             self.endpoint_url,
             data=self.build_request_body(),
             headers=self.headers,
-            method="POST",
+            timeout=20,
         )
-        with urlopen(req, timeout=20) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
+        resp.raise_for_status()
+        payload = json.loads(resp.content.decode("utf-8"))
         return payload.get("d", [])
 
     def parse_datetime(self, value: str) -> Optional[datetime]:
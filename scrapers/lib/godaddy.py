@@ -63,7 +63,7 @@ class GoDaddyScraper(BaseScraper):
         self.logger.info(f"Fetching {url}")
 
         try:
-            resp = requests.get(url, headers=DEFAULT_HEADERS, timeout=30)
+            resp = self.http.get(url, headers=DEFAULT_HEADERS, timeout=30)
             resp.raise_for_status()
             data = resp.json()
         except (requests.RequestException, ValueError) as e:
@@ -0,0 +1,204 @@
+"""Shared HTTP client for scrapers.
+
+One requests.Session per process, so every library reuses pooled
+keep-alive connections (and gzip/deflate transfer encoding) instead of
+opening a new TLS connection per request. On top of the session:
+
+- retry with exponential backoff and jitter on connection errors, timeouts
+  and retryable statuses (429, 5xx), honouring Retry-After;
+- a per-host rate limit, so concurrent page fetches stay polite.
+
+Scrapers reach it through BaseScraper.http:
+
+    response = self.http.get(url, headers=HEADERS, timeout=30)
+    response.raise_for_status()
+
+Defaults can be tuned with SCRAPE_HTTP_RETRIES (attempts per request) and
+SCRAPE_HOST_RATE (requests per second per host, default 5; 0 disables the
+limit). A scraper can set its own limit for its hosts with host_rate_limits;
+BaseScraper.http applies those to that scraper's requests only, so they
+never leak into other scrapers sharing the process.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_TIMEOUT = 30
+POOL_SIZE = 16
+DEFAULT_HOST_RATE = 5.0
+# Longest Retry-After we are willing to sleep for
+MAX_RETRY_AFTER = 60.0
+
+
+class HostRateLimiter:
+    """Spaces requests to each host at least 1/rate seconds apart. Thread-safe."""
+
+    def __init__(self, rate: float = 0.0, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.host_rates: dict[str, float] = {}
+        self._next: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._sleep = sleep
+
+    def set_rate(self, host: str, rate: float):
+        """Override the rate (requests/second) for one host; 0 disables it."""
+        with self._lock:
+            self.host_rates[host] = rate
+
+    def wait(self, host: str, rate: Optional[float] = None):
+        """Block until a request to host is allowed, and reserve that slot.
+
+        rate, when given, overrides the configured rate for this request.
+        """
+        with self._lock:
+            if rate is None:
+                rate = self.host_rates.get(host, self.rate)
+            if not rate or rate <= 0:
+                return
+            now = self._clock()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + 1.0 / rate
+        if slot > now:
+            self._sleep(slot - now)
+
+
+class HttpClient:
+    """requests.Session wrapper with pooling, retry/backoff and per-host rate limits."""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        host_rate: float = 0.0,
+        pool_size: int = POOL_SIZE,
+        sleep=time.sleep,
+    ):
+        self.max_retries = max(1, max_retries)
+        self.base_delay = base_delay
+        self.limiter = HostRateLimiter(host_rate, sleep=sleep)
+        self._sleep = sleep
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        host_rates: Optional[dict[str, float]] = None,
+        **kwargs,
+    ) -> requests.Response:
+        """Send a request, retrying transient failures.
+
+        Returns the last response, even a failing one, so callers keep
+        their own status handling (raise_for_status() etc.); raises the
+        last exception when no response was received at all (reporting
+        it is left to the caller). host_rates overrides the per-host rate
+        limit for this request only.
+        """
+        attempts = max(1, retries if retries is not None else self.max_retries)
+        base_delay = self.base_delay if base_delay is None else base_delay
+        kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+
+        for attempt in range(attempts):
+            self.throttle(url, host_rates)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == attempts - 1:
+                    raise
+                reason, delay = str(e), None
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                    return response
+                reason, delay = f"HTTP {response.status_code}", _retry_after(response)
+                response.close()
+
+            if delay is None:
+                delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
+            logger.warning(f"{reason} for {url}, retrying in {delay:.1f}s (attempt {attempt + 1}/{attempts})")
+            self._sleep(delay)
+
+    def throttle(self, url: str, host_rates: Optional[dict[str, float]] = None):
+        """Wait for url's host under the rate limit, for requests made outside the session."""
+        host = urlsplit(url).netloc.lower()
+        self.limiter.wait(host, (host_rates or {}).get(host))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def scoped(self, host_rates: dict[str, float]) -> 'ScopedHttpClient':
+        """A view of this client that applies host_rates to its own requests."""
+        return ScopedHttpClient(self, host_rates)
+
+    def close(self):
+        self.session.close()
+
+
+class ScopedHttpClient:
+    """The shared HttpClient with one scraper's per-host rate overrides.
+
+    Shares the session, retry settings and per-host spacing with every
+    other user of the client; the overrides apply only to requests made
+    through this view.
+    """
+
+    def __init__(self, client: HttpClient, host_rates: dict[str, float]):
+        self.client = client
+        self.host_rates = dict(host_rates)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.client.request(method, url, host_rates=self.host_rates, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def throttle(self, url: str):
+        self.client.throttle(url, self.host_rates)
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds from a numeric Retry-After header, capped; None if absent."""
+    value = response.headers.get('Retry-After', '')
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except ValueError:
+        return None
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """The process-wide HttpClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                max_retries=int(os.environ.get('SCRAPE_HTTP_RETRIES', 3)),
+                host_rate=float(os.environ.get('SCRAPE_HOST_RATE', DEFAULT_HOST_RATE)),
+            )
+        return _client
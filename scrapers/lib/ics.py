@@ -4,7 +4,6 @@ import logging
 import re
 from typing import Any, Optional
 
-import requests
 from icalendar import Calendar
 
 from .base import BaseScraper
@@ -55,7 +54,7 @@ class IcsScraper(BaseScraper):
         for url in urls:
             self.logger.debug(f"Fetching ICS: {url}")
             try:
-                response = requests.get(url, headers=headers, timeout=self.request_timeout)
+                response = self.http.get(url, headers=headers, timeout=self.request_timeout)
                 response.raise_for_status()
                 events = self._parse_ics(response.text)
                 all_events.extend(events)
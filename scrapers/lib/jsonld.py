@@ -177,7 +177,14 @@ class JsonLdScraper(BaseScraper):
     }
 
     def fetch_html(self, url: str) -> Optional[str]:
-        """Fetch a URL and return HTML. Uses urllib to avoid WAF issues."""
+        """Fetch a URL and return HTML. Uses urllib to avoid WAF issues.
+
+        The shared requests session adds its own default headers
+        (Accept-Encoding: gzip, Connection: keep-alive, ...), which some
+        sites block on, so this bypasses it; the shared per-host rate
+        limit still applies.
+        """
+        self.http.throttle(url)
         req = Request(url, headers=self.headers)
         try:
             with urlopen(req, timeout=15) as resp:
@@ -0,0 +1,84 @@
+"""Concurrent, page-ordered fetching for paginated APIs.
+
+fetch_pages() fetches page 1, reads the page count from it when the API
+reports one, and fetches the remaining pages on a small thread pool while
+yielding (page, result) strictly in page order, so output is the same as
+a sequential loop. Callers keep their own stop conditions:
+
+    for page, data in fetch_pages(self._fetch_page,
+                                  page_count=lambda d: d.get('total_pages'),
+                                  max_pages=self.max_pages,
+                                  max_workers=self.page_concurrency):
+        if not data or not data.get('events'):
+            break
+        ...
+
+When the count is unknown, pages are fetched at most max_workers ahead of
+the one being consumed, and stopping early (break) cancels the rest. An
+exception from fetch_page is raised when its page is reached, as it
+would be sequentially. Requests go through the shared HTTP client, whose
+per-host rate limit still applies.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+DEFAULT_PAGE_CONCURRENCY = 4
+
+
+def fetch_pages(
+    fetch_page: Callable[[int], T],
+    *,
+    page_count: Optional[Callable[[T], Optional[int]]] = None,
+    first_page: int = 1,
+    max_pages: Optional[int] = None,
+    max_workers: int = DEFAULT_PAGE_CONCURRENCY,
+) -> Iterator[tuple[int, T]]:
+    """Yield (page, fetch_page(page)) in page order, fetching ahead concurrently.
+
+    page_count(first_result) returns the total number of pages, or None
+    when unknown. max_pages caps the pages fetched either way; with
+    neither, pages continue until the caller stops iterating.
+    """
+    first = fetch_page(first_page)
+    yield first_page, first
+
+    total = _safe_count(page_count, first)
+    if max_pages is not None:
+        total = max_pages if total is None else min(total, max_pages)
+    if total is None:
+        pages = count(first_page + 1)
+    else:
+        pages = iter(range(first_page + 1, first_page + total))
+
+    if max_workers <= 1:
+        for page in pages:
+            yield page, fetch_page(page)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = deque((page, pool.submit(fetch_page, page)) for page in islice(pages, max_workers))
+        try:
+            while pending:
+                page, future = pending.popleft()
+                result = future.result()
+                for next_page in islice(pages, 1):
+                    pending.append((next_page, pool.submit(fetch_page, next_page)))
+                yield page, result
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _safe_count(page_count: Optional[Callable[[Any], Optional[int]]], first: Any) -> Optional[int]:
+    if page_count is None:
+        return None
+    try:
+        n = page_count(first)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+    return None if n is None else max(int(n), 1)
@@ -22,7 +22,6 @@ from datetime import datetime, timedelta
 from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
-import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
@@ -54,8 +53,8 @@ class SeeTicketsScraper(BaseScraper):
     def fetch_events(self) -> list[dict[str, Any]]:
         """Fetch events from the SeeTickets widget on the page."""
         self.logger.info(f"Fetching {self.events_url}")
-        response = requests.get(self.events_url, headers=HEADERS,
-                                timeout=30, verify=self.verify_ssl)
+        response = self.http.get(self.events_url, headers=HEADERS,
+                                 timeout=30, verify=self.verify_ssl)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -18,11 +18,11 @@ import logging
 import re
 from datetime import datetime
 from typing import Any, Optional
-from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
 from zoneinfo import ZoneInfo
 
+import requests
+
 from .base import BaseScraper
 
 logger = logging.getLogger(__name__)
@@ -81,9 +81,9 @@ class SocialPinpointScraper(BaseScraper):
     }
 
     def fetch_html(self, url: str) -> str:
-        req = Request(url, headers=self.headers)
-        with urlopen(req, timeout=20) as resp:
-            return resp.read().decode("utf-8")
+        resp = self.http.get(url, headers=self.headers, timeout=20)
+        resp.raise_for_status()
+        return resp.content.decode("utf-8")
 
     def extract_block_sets(self, html: str) -> list[dict[str, Any]]:
         blocks: list[dict[str, Any]] = []
@@ -134,9 +134,9 @@ class SocialPinpointScraper(BaseScraper):
             "Referer": self.page_url,
             "X-Requested-With": "XMLHttpRequest",
         }
-        req = Request(events_url, data=data, headers=headers, method="POST")
-        with urlopen(req, timeout=20) as resp:
-            payload = json.loads(resp.read().decode("utf-8"))
+        resp = self.http.post(events_url, data=data, headers=headers, timeout=20)
+        resp.raise_for_status()
+        payload = json.loads(resp.content.decode("utf-8"))
         return payload.get("result", [])
 
     def _parse_datetime(self, value: str) -> Optional[datetime]:
@@ -209,7 +209,7 @@ class SocialPinpointScraper(BaseScraper):
 
             try:
                 records = self.fetch_api_records(events_url, params)
-            except (HTTPError, URLError, TimeoutError) as exc:
+            except requests.RequestException as exc:
                 self.logger.error("Failed to fetch %s: %s", events_url, exc)
                 continue
 
@@ -21,8 +21,8 @@ import json
 import re
 from datetime import datetime, timezone
 from typing import Any, Optional
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
+
+import requests
 
 from .base import BaseScraper
 
@@ -53,11 +53,11 @@ class SquarespaceScraper(BaseScraper):
             'User-Agent': 'Mozilla/5.0 (compatible; CommunityCalendar/1.0)',
             'Accept': 'application/json',
         }
-        req = Request(url, headers=headers)
         try:
-            with urlopen(req, timeout=15) as resp:
-                data = json.loads(resp.read().decode('utf-8'))
-        except (HTTPError, URLError, json.JSONDecodeError) as e:
+            resp = self.http.get(url, headers=headers, timeout=15)
+            resp.raise_for_status()
+            data = json.loads(resp.content.decode('utf-8'))
+        except (requests.RequestException, json.JSONDecodeError) as e:
             self.logger.error(f"Failed to fetch: {e}")
             return []
 
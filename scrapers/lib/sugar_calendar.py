@@ -22,7 +22,6 @@ from datetime import datetime, timedelta
 from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
-import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
@@ -54,7 +53,7 @@ class SugarCalendarScraper(BaseScraper):
     def fetch_events(self) -> list[dict[str, Any]]:
         """Fetch events from the Sugar Calendar list page."""
         self.logger.info(f"Fetching {self.events_url}")
-        response = requests.get(self.events_url, headers=BROWSER_HEADERS, timeout=30)
+        response = self.http.get(self.events_url, headers=BROWSER_HEADERS, timeout=30)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -162,7 +161,7 @@ class SugarCalendarScraper(BaseScraper):
     def _enrich_from_detail(self, event: dict):
         """Fetch the detail page to get location and description."""
         try:
-            resp = requests.get(event['url'], headers=BROWSER_HEADERS, timeout=15)
+            resp = self.http.get(event['url'], headers=BROWSER_HEADERS, timeout=15)
             resp.raise_for_status()
         except Exception as e:
             self.logger.debug(f"Could not fetch detail page {event['url']}: {e}")
@@ -22,10 +22,10 @@ from datetime import datetime
 from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
-import requests
 from bs4 import BeautifulSoup
 
 from .base import BaseScraper
+from .pagination import fetch_pages
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
@@ -58,16 +58,15 @@ class TribeEventsScraper(BaseScraper):
         all_events = []
         tz = ZoneInfo(self.timezone)
 
-        for page in range(1, self.max_pages + 1):
-            url = f"{self.api_url}?per_page={self.per_page}&page={page}"
-            self.logger.info(f"Fetching page {page}: {url}")
-
-            try:
-                response = requests.get(url, headers=HEADERS, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-            except Exception as e:
-                self.logger.warning(f"Error fetching page {page}: {e}")
+        # Page 1 reports total_pages; the rest are fetched concurrently
+        pages = fetch_pages(
+            self._fetch_page,
+            page_count=lambda data: data.get('total_pages', 1),
+            max_pages=self.max_pages,
+            max_workers=self.page_concurrency,
+        )
+        for page, data in pages:
+            if data is None:
                 break
 
             events = data.get('events', [])
@@ -79,13 +78,21 @@ class TribeEventsScraper(BaseScraper):
                 if parsed:
                     all_events.append(parsed)
 
-            total_pages = data.get('total_pages', 1)
-            if page >= total_pages:
-                break
-
         self.logger.info(f"Found {len(all_events)} events")
         return all_events
 
+    def _fetch_page(self, page: int) -> Optional[dict]:
+        """Fetch one API page; None on error."""
+        url = f"{self.api_url}?per_page={self.per_page}&page={page}"
+        self.logger.info(f"Fetching page {page}: {url}")
+        try:
+            response = self.http.get(url, headers=HEADERS, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            self.logger.warning(f"Error fetching page {page}: {e}")
+            return None
+
     def _parse_event(self, item: dict, tz: ZoneInfo) -> Optional[dict[str, Any]]:
         """Parse a single event from the Tribe Events API."""
         title = item.get('title', '')
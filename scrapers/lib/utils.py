@@ -2,14 +2,14 @@
 
 import hashlib
 import logging
-import random
 import re
-import time
 from datetime import datetime
 from typing import Optional
 
 import requests
 
+from .http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_HEADERS = {
@@ -31,22 +31,22 @@ def fetch_with_retry(
     timeout: int = 30,
     headers: Optional[dict] = None,
 ) -> str:
-    """Fetch URL with exponential backoff retry."""
+    """Fetch URL with exponential backoff retry, over the shared HTTP client.
+
+    Connection errors, timeouts and 429/5xx responses are retried; other
+    HTTP errors raise straight away.
+    """
     headers = headers or DEFAULT_HEADERS
-    
-    for attempt in range(max_retries):
-        try:
-            logger.info(f"Fetching: {url}")
-            response = requests.get(url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-            return response.text
-        except requests.exceptions.RequestException as e:
-            if attempt == max_retries - 1:
-                logger.error(f"Failed to fetch {url} after {max_retries} attempts: {e}")
-                raise
-            delay = base_delay * (2 ** attempt) + random.uniform(0, 1)
-            logger.warning(f"Request failed, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
-            time.sleep(delay)
+    logger.info(f"Fetching: {url}")
+    try:
+        response = get_http_client().get(
+            url, headers=headers, timeout=timeout, retries=max_retries, base_delay=base_delay,
+        )
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Failed to fetch {url} after {max_retries} attempts: {e}")
+        raise
+    return response.text
 
 
 def generate_uid(title: str, dtstart: datetime, domain: str) -> str:
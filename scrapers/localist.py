@@ -26,13 +26,14 @@ sys.path.insert(0, str(__file__).rsplit('/', 1)[0])
 import argparse
 import json
 import logging
+import math
 import re
 from datetime import datetime
 from typing import Any, Optional
 from urllib.parse import urlencode
-from urllib.request import urlopen, Request
 
 from lib.base import BaseScraper
+from lib.pagination import fetch_pages
 
 
 class LocalistScraper(BaseScraper):
@@ -64,9 +65,9 @@ class LocalistScraper(BaseScraper):
 
         url = f"{self.base_url}/api/2/events?{urlencode(params)}"
         self.logger.debug(f"Fetching {url}")
-        req = Request(url, headers={'User-Agent': 'Mozilla/5.0 CommunityCalendar/1.0'})
-        with urlopen(req, timeout=30) as resp:
-            return json.loads(resp.read())
+        resp = self.http.get(url, headers={'User-Agent': 'Mozilla/5.0 CommunityCalendar/1.0'}, timeout=30)
+        resp.raise_for_status()
+        return json.loads(resp.content)
 
     def _clean_html(self, html: str) -> str:
         """Strip HTML tags to plain text."""
@@ -78,10 +79,10 @@ class LocalistScraper(BaseScraper):
 
     def fetch_events(self) -> list[dict[str, Any]]:
         events = []
-        page = 1
 
-        while True:
-            data = self._fetch_api(page)
+        # Page 1 reports the total; the remaining pages are fetched concurrently
+        pages = fetch_pages(self._fetch_api, page_count=self._page_count, max_workers=self.page_concurrency)
+        for _, data in pages:
             raw_events = data.get('events', [])
             if not raw_events:
                 break
@@ -128,17 +129,15 @@ class LocalistScraper(BaseScraper):
                         'description': description,
                     })
 
-            # Check for more pages
-            page_info = data.get('page', {})
-            total = page_info.get('total', 0)
-            current = page_info.get('current', page)
-            size = page_info.get('size', 100)
-            if current * size >= total:
-                break
-            page += 1
-
         return events
 
+    @staticmethod
+    def _page_count(data: dict) -> int:
+        """Number of pages from the first response's page block."""
+        page_info = data.get('page', {})
+        size = page_info.get('size', 100) or 100
+        return math.ceil(page_info.get('total', 0) / size)
+
 
 def main():
     logging.basicConfig(level=logging.INFO,
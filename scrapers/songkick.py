@@ -21,8 +21,8 @@ import logging
 import re
 from datetime import datetime, timezone
 from typing import Any, Optional
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
+
+import requests
 
 from lib.base import BaseScraper
 
@@ -50,11 +50,11 @@ class SongkickScraper(BaseScraper):
 
     def fetch_events(self) -> list[dict[str, Any]]:
         """Fetch venue page and extract MusicEvent JSON-LD."""
-        req = Request(self.url, headers=HEADERS)
         try:
-            with urlopen(req, timeout=30) as resp:
-                html = resp.read().decode('utf-8')
-        except (HTTPError, URLError) as e:
+            resp = self.http.get(self.url, headers=HEADERS, timeout=30)
+            resp.raise_for_status()
+            html = resp.content.decode('utf-8')
+        except requests.RequestException as e:
             self.logger.warning(f"Failed to fetch {self.url}: {e}")
             return []
 
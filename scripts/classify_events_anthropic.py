@@ -6,6 +6,10 @@ Fetches unclassified events from Supabase, classifies via Claude in batches,
 and updates the category in Supabase. Curator overrides from the
 category_overrides table are used as few-shot examples and never overwritten.
 
+Events are deduplicated by title and sent in batches sized to a token
+budget, with the same prompt as classify_events_json.py (both come from
+classify_prompt.py).
+
 No external dependencies — uses urllib only (same as ollama_classify.py).
 
 Usage:
@@ -19,8 +23,18 @@ import os
 import sys
 import urllib.request
 import urllib.parse
+from collections import Counter
 from datetime import datetime, timezone
 
+from classify_prompt import (
+    build_prompt,
+    build_prompt_prefix,
+    group_by_title,
+    parse_reply,
+    plan_batches,
+    title_updates,
+)
+
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 if not SUPABASE_URL or not SUPABASE_KEY:
@@ -28,13 +42,6 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     sys.exit(1)
 ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages"
 
-CATEGORIES_FILE = os.path.join(os.path.dirname(__file__), '..', 'categories.json')
-with open(CATEGORIES_FILE) as f:
-    CATEGORIES = [c['name'] for c in json.load(f)]
-
-VALID_CATEGORIES = set(CATEGORIES)
-BATCH_SIZE = 20
-
 
 def supabase_get(path):
     """GET from Supabase REST API."""
@@ -99,14 +106,21 @@ def build_few_shot(overrides):
     return "\n".join(lines) if len(lines) > 1 else ""
 
 
-def anthropic_call(api_key, model, prompt):
-    """Call Anthropic Messages API via urllib."""
-    body = json.dumps({
+def anthropic_call(api_key, model, prompt, system=None):
+    """Call Anthropic Messages API via urllib.
+
+    The system prompt goes in a cache_control block, so the API can reuse
+    the prefix shared by every batch once it is long enough to cache.
+    """
+    request = {
         "model": model,
-        "max_tokens": 1024,
+        "max_tokens": 4096,
         "temperature": 0,
         "messages": [{"role": "user", "content": prompt}],
-    }).encode()
+    }
+    if system:
+        request["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    body = json.dumps(request).encode()
 
     req = urllib.request.Request(ANTHROPIC_API_URL, data=body, headers={
         "x-api-key": api_key,
@@ -120,66 +134,36 @@ def anthropic_call(api_key, model, prompt):
 
 def classify_batch(events, few_shot, api_key, model):
     """Classify a batch of events via Anthropic API. Returns list of (event, category)."""
-    event_lines = []
-    for i, event in enumerate(events):
-        title = event.get("title", "")
-        location = event.get("location", "")
-        description = (event.get("description") or "")[:300]
-        ics_cats = event.get("ics_categories")
-        ics_str = ""
-        if ics_cats:
-            if isinstance(ics_cats, list):
-                ics_str = ", ".join(ics_cats)
-            else:
-                ics_str = str(ics_cats)
-        event_lines.append(
-            f'{i+1}. Title: "{title}" Location: "{location}"'
-            + (f' ICS tags: "{ics_str}"' if ics_str else '')
-            + (f' Description: "{description}"' if description else '')
-        )
-
-    prompt = f"""Classify each event into exactly one category. Categories:
-{chr(10).join('- ' + c for c in CATEGORIES)}
-{few_shot}
-
-Events to classify:
-
-{chr(10).join(event_lines)}
-
-Respond with ONLY a JSON array. Each element must have "index" (1-based) and "category" (exact category name from the list, or null if none fit). Example: [{{"index": 1, "category": "Music & Concerts"}}, {{"index": 2, "category": null}}]"""
-
-    raw = anthropic_call(api_key, model, prompt)
-
-    # Extract JSON array from response
-    start = raw.find("[")
-    end = raw.rfind("]") + 1
-    if start < 0 or end <= 0:
-        print(f"  WARNING: no JSON array in response: {raw[:200]}", file=sys.stderr)
-        return [(e, None) for e in events]
+    raw = anthropic_call(api_key, model, build_prompt(events), system=build_prompt_prefix(few_shot))
+    result_map = parse_reply(raw) or {}
+    return [(event, result_map.get(i + 1)) for i, event in enumerate(events)]
 
-    try:
-        items = json.loads(raw[start:end])
-    except json.JSONDecodeError as exc:
-        print(f"  WARNING: JSON parse error: {exc}", file=sys.stderr)
-        return [(e, None) for e in events]
-
-    # Map results back to events
-    result_map = {}
-    for item in items:
-        idx = item.get("index")
-        cat = item.get("category")
-        if cat and cat in VALID_CATEGORIES:
-            result_map[idx] = cat
-        elif cat:
-            for valid_cat in CATEGORIES:
-                if valid_cat.lower() in str(cat).lower():
-                    result_map[idx] = valid_cat
-                    break
+
+def classify_events(events, few_shot, api_key, model):
+    """Classify events, one per title, in token-budgeted batches.
+
+    Returns (results, updates): (representative event, category) pairs in
+    input order, and (event id, category) for every event sharing a
+    classified title.
+    """
+    # Group by title to avoid re-classifying recurring event instances
+    title_groups = group_by_title(events)
+    representative_events = [group[0] for group in title_groups.values()]
+    if len(representative_events) < len(events):
+        print(f"  {len(representative_events)} unique titles (deduplicated from {len(events)} events)")
 
     results = []
-    for i, event in enumerate(events):
-        results.append((event, result_map.get(i + 1)))
-    return results
+    batches = plan_batches(representative_events)
+    for batch_num, batch in enumerate(batches, 1):
+        print(f"  Batch {batch_num}/{len(batches)} ({len(batch)} events)...", flush=True)
+
+        for event, category in classify_batch(batch, few_shot, api_key, model):
+            title = event.get("title", "")[:60]
+            print(f"    {title} → {category or '(none)'}")
+            results.append((event, category))
+
+    # Fan out classifications to all events sharing each title
+    return results, title_updates(results, title_groups)
 
 
 def main():
@@ -220,39 +204,7 @@ def main():
         print("Nothing to classify.")
         return
 
-    # Group by title to avoid re-classifying recurring event instances
-    from collections import defaultdict, Counter
-    title_groups = defaultdict(list)
-    for event in events:
-        title_key = (event.get("title") or "").strip().lower()
-        title_groups[title_key].append(event)
-
-    # Pick one representative per title group
-    representative_events = [group[0] for group in title_groups.values()]
-    if len(representative_events) < len(events):
-        print(f"  {len(representative_events)} unique titles (deduplicated from {len(events)} events)")
-
-    # Classify in batches (using representatives only)
-    all_results = []
-    for batch_start in range(0, len(representative_events), BATCH_SIZE):
-        batch = representative_events[batch_start:batch_start + BATCH_SIZE]
-        batch_num = batch_start // BATCH_SIZE + 1
-        total_batches = (len(representative_events) + BATCH_SIZE - 1) // BATCH_SIZE
-        print(f"  Batch {batch_num}/{total_batches} ({len(batch)} events)...", flush=True)
-
-        results = classify_batch(batch, few_shot, api_key, args.model)
-        for event, category in results:
-            title = event.get("title", "")[:60]
-            print(f"    {title} → {category or '(none)'}")
-            all_results.append((event, category))
-
-    # Fan out classifications to all events sharing each title
-    all_updates = []
-    for event, category in all_results:
-        if category:
-            title_key = (event.get("title") or "").strip().lower()
-            for grouped_event in title_groups[title_key]:
-                all_updates.append((grouped_event["id"], category))
+    all_results, all_updates = classify_events(events, few_shot, api_key, args.model)
 
     # Batch update DB unless dry-run
     if not args.dry_run and all_updates:
@@ -262,7 +214,7 @@ def main():
 
     # Summary
     print("\n--- Summary ---")
-    print(f"  {len(representative_events)} unique titles classified → {len(all_updates)} total events to update")
+    print(f"  {len(all_results)} unique titles classified → {len(all_updates)} total events to update")
     cats = Counter(cat for _, cat in all_results)
     for cat, count in cats.most_common():
         print(f"  {count:4d}  {cat or '(none)'}")
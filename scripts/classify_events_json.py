@@ -7,23 +7,71 @@ categories added. Designed to run during the build pipeline before publishing.
 
 Curator overrides from Supabase are used as few-shot examples when available.
 
+Results are kept in a persistent cache (.classification_cache.json at the
+repo root) shared by every city and carried between nightly runs, keyed by
+a fingerprint of the event's normalized title, source, location and ICS
+categories. Recurring series are classified once rather than every time
+their source_uid changes. The cache is dropped when categories.json, the
+model or the curator override set changes.
+
+Batches from every file on the command line share one pool of workers
+(--workers, default 4) and one token-bucket rate limiter. Each batch
+reserves its estimated tokens before it is sent; the anthropic-ratelimit-*
+response headers keep the limiter's budget in step with the API's.
+Set ANTHROPIC_API_URL to send requests somewhere other than the API.
+
+Before the cache and the API, events are run through the local rules in
+classification_rules.json (see preclassify.py); only what they leave
+unresolved is sent, and a hit-rate report is printed at the end.
+
+Batches are sized to BATCH_TOKEN_BUDGET from each event's own prompt line,
+and the prompt's fixed part (categories, few-shot examples, reply format)
+is a cache_control system block built once per few-shot set; both come
+from classify_prompt.py, shared with classify_events_anthropic.py.
+
 Usage:
     python3 scripts/classify_events_json.py cities/toronto/events.json
     python3 scripts/classify_events_json.py cities/*/events.json
     python3 scripts/classify_events_json.py cities/toronto/events.json --dry-run
+    python3 scripts/classify_events_json.py cities/*/events.json --no-cache
+    python3 scripts/classify_events_json.py cities/*/events.json --workers 8
+    python3 scripts/classify_events_json.py cities/*/events.json --no-rules
 """
 
 import argparse
+import hashlib
 import json
 import os
 import sys
+import threading
 import time
+import unicodedata
 import urllib.error
 import urllib.request
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
 
-ANTHROPIC_API_URL = "https://api.anthropic.com/v1/messages"
+from classify_prompt import (
+    BATCH_TOKEN_BUDGET,
+    CATEGORIES,
+    MAX_BATCH_SIZE,
+    VALID_CATEGORIES,
+    build_prompt,
+    build_prompt_prefix,
+    estimate_tokens,
+    parse_reply,
+    plan_batches,
+    title_key,
+)
+from ics_to_json import iter_events, read_events_meta, write_events, write_events_meta
+from preclassify import PreClassifier
+
+# Overridable so the classifier can be pointed at a local stub server
+ANTHROPIC_API_URL = os.environ.get(
+    "ANTHROPIC_API_URL", "https://api.anthropic.com/v1/messages"
+)
 _SUPABASE_URL = os.environ.get("SUPABASE_URL")
 _SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 if not _SUPABASE_URL or not _SUPABASE_KEY:
@@ -34,135 +82,157 @@ if not _SUPABASE_URL or not _SUPABASE_KEY:
 SUPABASE_URL: str = _SUPABASE_URL
 SUPABASE_KEY: str = _SUPABASE_KEY
 
-CATEGORIES_FILE = Path(__file__).parent.parent / "categories.json"
-with CATEGORIES_FILE.open() as f:
-    CATEGORIES = [c["name"] for c in json.load(f)]
-
-VALID_CATEGORIES = set(CATEGORIES)
-BATCH_SIZE = 50
-RATE_LIMIT_TPM = 10000  # Tokens per minute limit
+RATE_LIMIT_TPM = 10000  # Tokens per minute, until the API's headers say otherwise
+RATE_LIMIT_RPM = 50  # Requests per minute, likewise
 RATE_LIMIT_WINDOW = 60  # Rate limit window in seconds
-FALLBACK_DELAY = 15  # Fallback delay in seconds between batches
+DEFAULT_WORKERS = 4  # Batches in flight at once, across all files
 MAX_RETRIES = 3  # Maximum retry attempts for rate limit errors
 RETRY_BASE_DELAY = 30  # Base delay for exponential backoff (seconds)
 HTTP_RATE_LIMIT = 429  # HTTP status code for rate limiting
 HTTP_SERVER_ERROR_MIN = 500  # Start of 5xx range
 HTTP_SERVER_ERROR_MAX = 600  # End of 5xx range
 
+CACHE_FILE = Path(__file__).parent.parent / ".classification_cache.json"
+CACHE_VERSION = 1
+CACHE_MAX_AGE_DAYS = 90  # Drop entries no event has matched for this long
 
-class RateLimitTracker:
-    """Track API rate limits and calculate smart delays."""
 
-    def __init__(self, tokens_per_minute=RATE_LIMIT_TPM):
-        self.tokens_per_minute = tokens_per_minute
-        self.last_request_time: float | None = None
-        self.tokens_used_in_window = 0
-        self.window_start: float | None = None
+class TokenBucket:
+    """A budget of `capacity` units that refills continuously over `window` seconds.
 
-    def parse_headers(self, headers):
-        """Parse rate limit info from API response headers."""
-        try:
-            tokens_limit = int(headers.get("anthropic-ratelimit-tokens-limit", 0))
-            tokens_remaining = int(
-                headers.get("anthropic-ratelimit-tokens-remaining", 0)
-            )
-            reset_time = headers.get("anthropic-ratelimit-tokens-reset", "")
-
-            if tokens_limit > 0:
-                # Update tokens_per_minute from API if limit differs
-                if tokens_limit != self.tokens_per_minute:
-                    self.tokens_per_minute = tokens_limit
-                tokens_used = tokens_limit - tokens_remaining
-                return {
-                    "tokens_used": tokens_used,
-                    "tokens_remaining": tokens_remaining,
-                    "tokens_limit": tokens_limit,
-                    "reset_time": reset_time,
-                }
-        except (ValueError, TypeError):
-            pass
-        return None
+    Not thread-safe on its own; RateLimiter holds the lock.
+    """
+
+    def __init__(self, capacity, window=RATE_LIMIT_WINDOW, clock=time.monotonic):
+        self.capacity = capacity
+        self.window = window
+        self.clock = clock
+        self.level = float(capacity)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        rate = self.capacity / self.window
+        self.level = min(self.capacity, self.level + (now - self.updated) * rate)
+        self.updated = now
+
+    def available(self):
+        self._refill()
+        return self.level
+
+    def wait_time(self, amount):
+        """Seconds until `amount` (capped at capacity) is available."""
+        self._refill()
+        shortfall = min(amount, self.capacity) - self.level
+        return max(0.0, shortfall * self.window / self.capacity)
+
+    def take(self, amount):
+        """Spend `amount`; the level may go negative, delaying later takers."""
+        self._refill()
+        self.level -= amount
+
+    def observe(self, limit, remaining):
+        """Adopt the server's limit, and never believe more is left than it reports."""
+        self._refill()
+        if limit > 0:
+            self.capacity = limit
+        self.level = min(self.level, remaining, self.capacity)
+
+
+class RateLimiter:
+    """Token-bucket rate limiter shared by concurrent classification batches.
+
+    Requests and tokens each have a bucket. A batch acquires one request and
+    its estimated tokens before it is sent, waiting while either bucket is
+    short. The anthropic-ratelimit-* headers on every response set the
+    buckets' limits and cap their levels at what the API says remains, so
+    concurrent batches stay inside the per-minute budget.
+    """
 
-    def calculate_delay(self, estimated_next_tokens=2000):
-        """Calculate how long to wait before next request."""
-        now = time.time()
-
-        # If this is the first request, no delay needed
-        if self.last_request_time is None:
-            self.last_request_time = now
-            self.window_start = now
-            return 0
-
-        # Check if we're in a new rate limit window
-        # Type-safe: window_start is guaranteed to be float here
-        assert self.window_start is not None
-        time_since_window_start = now - self.window_start
-        if time_since_window_start >= RATE_LIMIT_WINDOW:
-            # Reset the window
-            self.tokens_used_in_window = 0
-            self.window_start = now
-            self.last_request_time = now
-            return 0
-
-        # Calculate if we have budget for the next request
-        tokens_available = self.tokens_per_minute - self.tokens_used_in_window
-
-        if tokens_available < estimated_next_tokens:
-            # Need to wait until the window resets
-            delay = RATE_LIMIT_WINDOW - time_since_window_start + 1
-            return max(0, delay)
-
-        # We have budget, but add a small delay to be conservative
-        conservative_delay = (RATE_LIMIT_WINDOW - time_since_window_start) / 10
-        return min(5, conservative_delay)
-
-    def record_request(self, tokens_used):
-        """
-        Record that a request was made.
-
-        Note: tokens_used from API headers is cumulative (total used in window),
-        not incremental. Store it directly rather than adding.
-        """
-        now = time.time()
-        self.last_request_time = now
-
-        # Initialize window if needed
-        if self.window_start is None:
-            self.window_start = now
-
-        # Check if we're in a new window
-        # Type-safe: window_start is guaranteed to be float here
-        assert self.window_start is not None
-        if now - self.window_start >= RATE_LIMIT_WINDOW:
-            self.tokens_used_in_window = tokens_used
-            self.window_start = now
-        else:
-            # tokens_used is cumulative from API, replace (don't add)
-            self.tokens_used_in_window = tokens_used
+    def __init__(
+        self,
+        tokens_per_minute=RATE_LIMIT_TPM,
+        requests_per_minute=RATE_LIMIT_RPM,
+        window=RATE_LIMIT_WINDOW,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self.tokens = TokenBucket(tokens_per_minute, window, clock)
+        self.requests = TokenBucket(requests_per_minute, window, clock)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens):
+        """Block until a request with `tokens` fits the budget; returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if delay <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return waited
+            self._sleep(delay)
+            waited += delay
+
+    def update(self, headers):
+        """Feed response headers to the buckets; token info dict, or None if absent."""
+        if headers is None:
+            return None
+        seen = {}
+        for kind in ("tokens", "input-tokens", "requests"):
+            limit = _header_int(headers, f"anthropic-ratelimit-{kind}-limit")
+            remaining = _header_int(headers, f"anthropic-ratelimit-{kind}-remaining")
+            if limit and remaining is not None:
+                seen[kind] = (limit, remaining)
+        # tokens-* is the most restrictive limit; older tiers only send input-tokens-*
+        tokens = seen.get("tokens") or seen.get("input-tokens")
+        with self._lock:
+            if tokens:
+                self.tokens.observe(*tokens)
+            if "requests" in seen:
+                self.requests.observe(*seen["requests"])
+        if not tokens:
+            return None
+        return {"tokens_limit": tokens[0], "tokens_remaining": tokens[1]}
+
+    def exhaust(self):
+        """Empty the token bucket, e.g. after a 429 without rate limit headers."""
+        with self._lock:
+            self.tokens.observe(self.tokens.capacity, 0)
 
     def get_status(self):
-        """Get current rate limit status for logging."""
-        if self.window_start is None:
-            return "No requests yet"
+        """Current budget for logging."""
+        with self._lock:
+            level, capacity = max(0, int(self.tokens.available())), self.tokens.capacity
+        return f"{level}/{capacity} tokens available"
 
-        tokens_remaining = max(0, self.tokens_per_minute - self.tokens_used_in_window)
 
-        return (
-            f"{self.tokens_used_in_window}/{self.tokens_per_minute} tokens "
-            f"used in window, {tokens_remaining} remaining"
-        )
+def _header_int(headers, name):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
 
 
-def anthropic_call(api_key, model, prompt, retry_count=0):
-    """Call Anthropic Messages API with retry logic for rate limits."""
-    body = json.dumps(
-        {
-            "model": model,
-            "max_tokens": 4096,
-            "temperature": 0,
-            "messages": [{"role": "user", "content": prompt}],
-        }
-    ).encode()
+def anthropic_call(api_key, model, prompt, retry_count=0, system=None):
+    """Call Anthropic Messages API with retry logic for rate limits.
+
+    A system prompt is sent as a cache_control block, so a prefix shared by
+    many calls is cached by the API (once it reaches the model's minimum
+    cacheable length) rather than billed in full every time.
+    """
+    request = {
+        "model": model,
+        "max_tokens": 4096,
+        "temperature": 0,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    if system:
+        request["system"] = [
+            {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+        ]
+    body = json.dumps(request).encode()
 
     req = urllib.request.Request(
         ANTHROPIC_API_URL,
@@ -201,7 +271,7 @@ def anthropic_call(api_key, model, prompt, retry_count=0):
             )
             print(msg, file=sys.stderr, flush=True)
             time.sleep(retry_delay)
-            return anthropic_call(api_key, model, prompt, retry_count + 1)
+            return anthropic_call(api_key, model, prompt, retry_count + 1, system)
 
         # Handle server errors (5xx) with retry
         is_server_error = HTTP_SERVER_ERROR_MIN <= e.code < HTTP_SERVER_ERROR_MAX
@@ -213,7 +283,7 @@ def anthropic_call(api_key, model, prompt, retry_count=0):
             )
             print(msg, file=sys.stderr, flush=True)
             time.sleep(retry_delay)
-            return anthropic_call(api_key, model, prompt, retry_count + 1)
+            return anthropic_call(api_key, model, prompt, retry_count + 1, system)
 
         # For other errors or exhausted retries, fail
         print(f"API error {e.code}: {error_body}", file=sys.stderr)
@@ -227,7 +297,8 @@ def fetch_overrides():
     snapshot columns (event_title/event_location/event_city), so
     overrides whose event was deleted (event_id NULL) still teach;
     the events(...) embed is kept as a fallback for rows written
-    before the snapshot-columns migration.
+    before the snapshot-columns migration. Returns None if the fetch
+    fails, so callers can tell that apart from an empty override set.
     """
     path = (
         "category_overrides"
@@ -247,7 +318,78 @@ def fetch_overrides():
         with urllib.request.urlopen(req, timeout=10) as resp:
             return json.loads(resp.read())
     except Exception:
-        return []
+        return None
+
+
+def normalize_text(value):
+    """Casefolded, NFKC-normalized text with whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", value or "").casefold().split())
+
+
+def event_fingerprint(event):
+    """Cache key for an event: its normalized title, source, location and ICS categories."""
+    ics_cats = event.get("ics_categories") or []
+    if not isinstance(ics_cats, list):
+        ics_cats = [ics_cats]
+    parts = [
+        normalize_text(event.get("title")),
+        normalize_text(event.get("source")),
+        normalize_text(event.get("location")),
+        sorted({normalize_text(str(c)) for c in ics_cats} - {""}),
+    ]
+    blob = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:32]
+
+
+def cache_config_key(model, overrides):
+    """Hash of everything that changes what the classifier answers.
+
+    categories.json, the model and the curator override set (the few-shot
+    pool); cached results from any other configuration are discarded.
+    """
+    override_set = sorted(
+        (
+            o.get("event_title") or (o.get("events") or {}).get("title") or "",
+            o.get("event_location") or (o.get("events") or {}).get("location") or "",
+            o.get("event_city") or "",
+            o.get("category") or "",
+        )
+        for o in overrides
+    )
+    blob = json.dumps(
+        {"categories": CATEGORIES, "model": model, "overrides": override_set},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def load_classification_cache(cache_path, config_key):
+    """Load {fingerprint: {"category", "seen"}}, or an empty cache if missing/stale."""
+    try:
+        cache = json.loads(Path(cache_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("config") != config_key:
+        return {}
+    return cache.get("entries", {})
+
+
+def save_classification_cache(cache_path, config_key, entries):
+    """Write the cache atomically, dropping entries unseen for CACHE_MAX_AGE_DAYS."""
+    cutoff = (date.today() - timedelta(days=CACHE_MAX_AGE_DAYS)).isoformat()
+    kept = {k: v for k, v in entries.items() if v.get("seen", "") >= cutoff}
+    tmp = Path(f"{cache_path}.tmp")
+    tmp.write_text(
+        json.dumps(
+            {"version": CACHE_VERSION, "config": config_key, "entries": kept},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ),
+        encoding="utf-8",
+    )
+    os.replace(tmp, cache_path)
+    return len(kept)
 
 
 FEW_SHOT_CAP = 20
@@ -290,271 +432,260 @@ def classify_batch(events, few_shot, api_key, model):
 
     Returns (dict mapping index to category, response headers).
     """
-    event_lines = []
-    for i, event in enumerate(events):
-        title = event.get("title", "")
-        location = event.get("location", "")
-        description = (event.get("description") or "")[:300]
-        ics_cats = event.get("ics_categories")
-        ics_str = ""
-        if ics_cats:
-            if isinstance(ics_cats, list):
-                ics_str = ", ".join(ics_cats)
-            else:
-                ics_str = str(ics_cats)
-        event_lines.append(
-            f'{i + 1}. Title: "{title}" Location: "{location}"'
-            + (f' ICS tags: "{ics_str}"' if ics_str else "")
-            + (f' Description: "{description}"' if description else "")
-        )
-
-    example_json = (
-        '[{"index": 1, "category": "Music / Concerts"}, {"index": 2, "category": null}]'
+    raw, headers = anthropic_call(
+        api_key, model, build_prompt(events), system=build_prompt_prefix(few_shot)
     )
+    return parse_reply(raw) or {}, headers
 
-    prompt = f"""Classify each event into exactly one category. Categories:
-{chr(10).join("- " + c for c in CATEGORIES)}
-{few_shot}
 
-Events to classify:
+_print_lock = threading.Lock()
 
-{chr(10).join(event_lines)}
 
-Respond with ONLY a JSON array. Each element must have "index" (1-based) and \
-"category" (exact category name from the list, or null if none fit). \
-Example: {example_json}"""
+def _log(message, file=None):
+    """print() that keeps output from concurrent batches on whole lines."""
+    with _print_lock:
+        print(message, file=file or sys.stdout, flush=True)
 
-    raw, headers = anthropic_call(api_key, model, prompt)
 
-    start = raw.find("[")
-    end = raw.rfind("]") + 1
-    if start < 0 or end <= 0:
-        print(f"  WARNING: no JSON array in response: {raw[:200]}", file=sys.stderr)
-        return {}, headers
+class FileJob:
+    """One events.json file: its events and the titles still to classify."""
 
-    try:
-        items = json.loads(raw[start:end])
-    except json.JSONDecodeError as exc:
-        print(f"  WARNING: JSON parse error: {exc}", file=sys.stderr)
-        return {}, headers
-
-    result_map = {}
-    for item in items:
-        idx = item.get("index")
-        cat = item.get("category")
-        if cat and cat in VALID_CATEGORIES:
-            result_map[idx] = cat
-        elif cat:
-            for valid_cat in CATEGORIES:
-                if valid_cat.lower() in str(cat).lower():
-                    result_map[idx] = valid_cat
-                    break
-
-    return result_map, headers
-
-
-def process_file(  # noqa: PLR0915, PLR0912
-    filepath, config, few_shot, dry_run=False, rate_limiter=None
-):
-    """Classify events in a single events.json file.
+    def __init__(self, path, events, to_classify, few_shot):
+        self.path = path
+        self.city = path.parent.name
+        self.events = events
+        self.to_classify = to_classify
+        self.few_shot = few_shot
+        self.classified = 0
+        self.cats = Counter()
+        self.title_groups = defaultdict(list)
+        self.rep_results = {}  # maps normalized title_key to category
 
-    Args:
-        filepath: Path to events.json file
-        config: Dict with 'api_key' and 'model' keys
-        few_shot: Few-shot examples string
-        dry_run: If True, don't write changes
-        rate_limiter: Optional RateLimitTracker instance
-    """
-    api_key = config["api_key"]
-    model = config["model"]
+    def batches(self):
+        """Batches of representative events, one per title group."""
+        reps = [group[0][1] for group in self.title_groups.values()]
+        return plan_batches(reps, BATCH_TOKEN_BUDGET, MAX_BATCH_SIZE)
+
+
+def prepare_file(filepath, few_shot, cache=None, preclassifier=None):
+    """Read a file and resolve what rules and the cache can; a FileJob, or None if no work."""
     path = Path(filepath)
     if not path.exists():
         print(f"  Skipping {filepath}: not found")
-        return
+        return None
 
-    with path.open() as f:
-        events = json.load(f)
+    events = list(iter_events(path))
 
     # Find events needing classification
     to_classify = [(i, e) for i, e in enumerate(events) if not e.get("category")]
     already = len(events) - len(to_classify)
 
-    city = path.parent.name
+    job = FileJob(path, events, to_classify, few_shot)
     msg = (
-        f"{city}: {len(events)} events, {already} already classified, "
+        f"{job.city}: {len(events)} events, {already} already classified, "
         f"{len(to_classify)} to classify"
     )
     print(msg)
 
     if not to_classify:
-        return
+        return None
 
-    # Initialize rate limiter (shared across files or create new for testing)
-    if rate_limiter is None:
-        rate_limiter = RateLimitTracker()
+    # Events the local rules can place never reach the cache or the API
+    pending = to_classify
+    if preclassifier is not None:
+        pending = []
+        for idx, event in to_classify:
+            category, _rule = preclassifier.classify(event)
+            if category:
+                events[idx]["category"] = category
+                job.classified += 1
+                job.cats[category] += 1
+            else:
+                pending.append((idx, event))
+        if job.classified:
+            print(f"  {job.classified} events resolved by rules, {len(pending)} left")
+
+    # Events seen before (in any city, any earlier run) come from the cache
+    if cache is not None:
+        today = date.today().isoformat()
+        from_rules = job.classified
+        unresolved, pending = pending, []
+        for idx, event in unresolved:
+            entry = cache.get(event_fingerprint(event))
+            if entry and entry.get("category") in VALID_CATEGORIES:
+                entry["seen"] = today
+                events[idx]["category"] = entry["category"]
+                job.classified += 1
+                job.cats[entry["category"]] += 1
+            else:
+                pending.append((idx, event))
+        if job.classified > from_rules:
+            msg = (
+                f"  {job.classified - from_rules} events from classification cache, "
+                f"{len(pending)} to send"
+            )
+            print(msg)
 
     # Group by title to avoid re-classifying recurring event instances
-    title_groups = defaultdict(list)
-    for idx, event in to_classify:
-        title_key = (event.get("title") or "").strip().lower()
-        title_groups[title_key].append((idx, event))
-
-    # Pick one representative per title group
-    representative_items = [
-        (group[0][0], group[0][1]) for group in title_groups.values()
-    ]
-    if len(representative_items) < len(to_classify):
+    for idx, event in pending:
+        job.title_groups[title_key(event)].append((idx, event))
+
+    if len(job.title_groups) < len(pending):
         msg = (
-            f"  {len(representative_items)} unique titles "
-            f"(deduplicated from {len(to_classify)} events)"
+            f"  {len(job.title_groups)} unique titles "
+            f"(deduplicated from {len(pending)} events)"
         )
         print(msg)
+    return job
 
-    # Classify in batches (using representatives only)
-    classified = 0
-    cats = Counter()
-    rep_results = {}  # maps normalized title_key to category
-    total_batches = (len(representative_items) + BATCH_SIZE - 1) // BATCH_SIZE
-    batch_start_time = time.time()
 
-    for batch_start in range(0, len(representative_items), BATCH_SIZE):
-        batch_items = representative_items[batch_start : batch_start + BATCH_SIZE]
-        batch_events = [e for _, e in batch_items]
-        batch_num = batch_start // BATCH_SIZE + 1
+def classify_job_batch(job, batch_num, total_batches, batch_events, config, rate_limiter):
+    """Classify one batch of a file's representatives into job.rep_results.
 
-        # Calculate delay before this batch
-        estimated_tokens = len(batch_events) * 50  # Rough estimate
-        delay = rate_limiter.calculate_delay(estimated_tokens)
+    Runs on a worker thread; errors are reported and the batch skipped.
+    """
+    label = f"{job.city} batch {batch_num}/{total_batches}"
+    estimated_tokens = estimate_tokens(batch_events, job.few_shot)
+    waited = rate_limiter.acquire(estimated_tokens)
+    wait_str = f", after {waited:.1f}s rate limit wait" if waited >= 0.1 else ""
+    _log(f"  {label} ({len(batch_events)} events{wait_str})...")
 
-        if delay > 0:
-            msg = (
-                f"  Rate limit: waiting {delay:.1f}s before batch "
-                f"{batch_num}/{total_batches}..."
-            )
-            print(msg, flush=True)
-            time.sleep(delay)
-
-        # Progress with time estimate
-        elapsed = time.time() - batch_start_time
-        if batch_num > 1:
-            avg_batch_time = elapsed / (batch_num - 1)
-            remaining_batches = total_batches - batch_num + 1
-            eta_seconds = avg_batch_time * remaining_batches
-            eta_str = f", ETA {int(eta_seconds)}s"
-        else:
-            eta_str = ""
+    try:
+        result_map, headers = classify_batch(
+            batch_events, job.few_shot, config["api_key"], config["model"]
+        )
+    except urllib.error.HTTPError as e:
+        _log(f"  ERROR in {label}: {e}", file=sys.stderr)
+        # Let the failure's headers slow every worker, not just this one
+        if rate_limiter.update(e.headers) is None and e.code == HTTP_RATE_LIMIT:
+            rate_limiter.exhaust()
+        return
+    except Exception as e:
+        _log(f"  ERROR in {label}: {e}", file=sys.stderr)
+        return
 
+    rate_info = rate_limiter.update(headers)
+    if rate_info:
         msg = (
-            f"  Batch {batch_num}/{total_batches} "
-            f"({len(batch_events)} events){eta_str}..."
+            f"    {label}: {rate_info['tokens_remaining']}/{rate_info['tokens_limit']} "
+            f"tokens remaining ({rate_limiter.get_status()})"
         )
-        print(msg, flush=True)
+    else:
+        msg = (
+            f"    {label}: rate limit headers unavailable, "
+            f"counted estimated {estimated_tokens} tokens"
+        )
+    _log(msg)
+
+    for j, event in enumerate(batch_events):
+        cat = result_map.get(j + 1)
+        if cat:
+            job.rep_results[title_key(event)] = cat
 
-        try:
-            result_map, headers = classify_batch(batch_events, few_shot, api_key, model)
-
-            # Parse and record rate limit info
-            rate_info = rate_limiter.parse_headers(headers)
-            if rate_info:
-                tokens_used = rate_info["tokens_used"]
-                rate_limiter.record_request(tokens_used)
-                msg = (
-                    f"    Tokens: {tokens_used} used, "
-                    f"{rate_info['tokens_remaining']} remaining "
-                    f"({rate_limiter.get_status()})"
-                )
-                print(msg, flush=True)
-            else:
-                # Fallback: estimate tokens and accumulate for current window
-                # record_request() treats its argument as cumulative, so add
-                # to existing window total rather than passing incremental value
-                cumulative_estimated = (
-                    rate_limiter.tokens_used_in_window + estimated_tokens
-                )
-                rate_limiter.record_request(cumulative_estimated)
-                msg = (
-                    f"    Rate limit headers unavailable, "
-                    f"using estimated {estimated_tokens} tokens "
-                    f"(cumulative {cumulative_estimated} this window), "
-                    f"fixed {FALLBACK_DELAY}s delay"
-                )
-                print(msg, flush=True)
-                # Apply fallback delay to avoid overwhelming API
-                time.sleep(FALLBACK_DELAY)
-
-            for j, (_orig_idx, event) in enumerate(batch_items):
-                cat = result_map.get(j + 1)
-                if cat:
-                    title_key = (event.get("title") or "").strip().lower()
-                    rep_results[title_key] = cat
-
-        except urllib.error.HTTPError as e:
-            print(f"  ERROR in batch {batch_num}: {e}", file=sys.stderr)
-
-            # Parse rate limit headers from failed request if available
-            # to update tracker and avoid immediate retry hammering
-            try:
-                error_headers = e.headers
-                rate_info = rate_limiter.parse_headers(error_headers)
-                if rate_info:
-                    tokens_used = rate_info["tokens_used"]
-                    rate_limiter.record_request(tokens_used)
-                    msg = (
-                        f"    Updated rate limiter from error headers: "
-                        f"{tokens_used} tokens used, "
-                        f"{rate_info['tokens_remaining']} remaining"
-                    )
-                    print(msg, file=sys.stderr, flush=True)
-
-                    # Calculate smart delay based on current state
-                    cooldown = rate_limiter.calculate_delay(estimated_tokens)
-                    if cooldown > 0:
-                        msg = f"    Cooling down {cooldown:.1f}s before next batch..."
-                        print(msg, file=sys.stderr, flush=True)
-                        time.sleep(cooldown)
-            except Exception as header_err:
-                # If header parsing fails, use conservative fallback
-                msg = f"    Could not parse error headers: {header_err}"
-                print(msg, file=sys.stderr, flush=True)
-                msg = f"    Applying conservative {FALLBACK_DELAY}s cooldown..."
-                print(msg, file=sys.stderr, flush=True)
-                time.sleep(FALLBACK_DELAY)
-
-            # Continue with remaining batches even if one fails
-            continue
-        except Exception as e:
-            print(f"  ERROR in batch {batch_num}: {e}", file=sys.stderr)
-            # Apply conservative cooldown for non-HTTP errors
-            msg = f"    Applying conservative {FALLBACK_DELAY}s cooldown..."
-            print(msg, file=sys.stderr, flush=True)
-            time.sleep(FALLBACK_DELAY)
-            # Continue with remaining batches even if one fails
-            continue
 
-    # Fan out classifications to all events sharing each title
-    for title_key, group in title_groups.items():
-        cat = rep_results.get(title_key)
+def finish_file(job, dry_run=False, cache=None):
+    """Fan classifications out to every event in a title group, report, and write."""
+    today = date.today().isoformat()
+    lines = []
+    for title_key, group in job.title_groups.items():
+        cat = job.rep_results.get(title_key)
         if cat:
             for orig_idx, event in group:
-                events[orig_idx]["category"] = cat
-                classified += 1
-                cats[cat] += 1
+                job.events[orig_idx]["category"] = cat
+                job.classified += 1
+                job.cats[cat] += 1
                 uid = event.get("source_uid", "")
                 title = event.get("title", "")
-                print(f'  + {uid} "{title}" → {cat}')
+                lines.append(f'  + {uid} "{title}" → {cat}')
+                if cache is not None:
+                    cache[event_fingerprint(event)] = {"category": cat, "seen": today}
 
-    msg = (
-        f"  Classified {classified}/{len(to_classify)} events "
-        f"({len(representative_items)} unique titles)"
+    lines.append(
+        f"  {job.city}: classified {job.classified}/{len(job.to_classify)} events "
+        f"({len(job.title_groups)} unique titles)"
     )
-    print(msg)
-    for cat, count in cats.most_common():
-        print(f"    {count:4d}  {cat}")
+    for cat, count in job.cats.most_common():
+        lines.append(f"    {count:4d}  {cat}")
 
     if not dry_run:
-        with path.open("w") as f:
-            json.dump(events, f, ensure_ascii=False)
-        print(f"  Wrote {filepath}")
+        # Keep the file's format and its events.meta.json sidecar in step
+        meta = read_events_meta(job.path)
+        output_format = meta.get("format", "compact") if meta else "compact"
+        digest = write_events(job.events, job.path, output_format)
+        if meta:
+            write_events_meta(job.path, job.events, digest, output_format)
+        lines.append(f"  Wrote {job.path}")
+    _log("\n".join(lines))
+
+
+def process_files(
+    files,
+    config,
+    dry_run=False,
+    rate_limiter=None,
+    cache=None,
+    workers=DEFAULT_WORKERS,
+    on_file_done=None,
+    preclassifier=None,
+):
+    """Classify several events.json files with one shared pool of batch workers.
+
+    Args:
+        files: (filepath, few_shot) pairs
+        config: Dict with 'api_key' and 'model' keys
+        dry_run: If True, don't write changes
+        rate_limiter: Optional RateLimiter shared by all batches
+        cache: Optional classification cache entries (see
+            load_classification_cache), read and updated in place
+        workers: Maximum batches in flight at once
+        on_file_done: Optional callback(path) after each file is written,
+            called in file order
+        preclassifier: Optional PreClassifier; events it resolves are not
+            sent to the API
+    """
+    if rate_limiter is None:
+        rate_limiter = RateLimiter()
+
+    jobs = [
+        job
+        for job in (prepare_file(fp, fs, cache, preclassifier) for fp, fs in files)
+        if job
+    ]
+    work = []
+    for job in jobs:
+        batches = job.batches()
+        for n, batch_events in enumerate(batches, 1):
+            work.append((job, n, len(batches), batch_events))
+    if work:
+        titles = sum(len(batch_events) for _, _, _, batch_events in work)
+        msg = (
+            f"Classifying {titles} unique titles from {len(jobs)} files "
+            f"in {len(work)} batches, up to {workers} at a time"
+        )
+        print(msg, flush=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        # Submitted in file order, so earlier files finish (and are written) first
+        futures = defaultdict(list)
+        for job, n, total, batch_events in work:
+            futures[job].append(
+                pool.submit(classify_job_batch, job, n, total, batch_events, config, rate_limiter)
+            )
+        for job in jobs:
+            for future in futures[job]:
+                future.result()
+            finish_file(job, dry_run, cache)
+            if on_file_done:
+                on_file_done(job.path)
+
+
+def process_file(
+    filepath, config, few_shot, dry_run=False, rate_limiter=None, cache=None, preclassifier=None
+):
+    """Classify events in a single events.json file (see process_files)."""
+    process_files(
+        [(filepath, few_shot)], config, dry_run, rate_limiter, cache, preclassifier=preclassifier
+    )
 
 
 def main():
@@ -573,6 +704,25 @@ def main():
         action="store_true",
         help="Classify without curator-override examples (for A/B comparison)",
     )
+    parser.add_argument(
+        "--cache",
+        default=str(CACHE_FILE),
+        help=f"Classification cache file (default: {CACHE_FILE.name} at the repo root)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Neither read nor update the cache"
+    )
+    parser.add_argument(
+        "--no-rules",
+        action="store_true",
+        help="Send every event to the API, skipping classification_rules.json",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Batches in flight at once, across all files (default: {DEFAULT_WORKERS})",
+    )
     args = parser.parse_args()
 
     api_key = os.environ.get("ANTHROPIC_API_KEY")
@@ -581,22 +731,53 @@ def main():
         sys.exit(1)
 
     overrides = [] if args.no_few_shot else fetch_overrides()
+    use_cache = not args.no_cache and not args.no_few_shot
     if args.no_few_shot:
-        print("Few-shot examples disabled (--no-few-shot)")
+        print("Few-shot examples disabled (--no-few-shot), cache not used")
+    elif overrides is None:
+        # Without the override set the cache's config can't be checked
+        print("Could not fetch curator overrides; classifying without few-shot examples or cache")
+        overrides = []
+        use_cache = False
     elif overrides:
         print(f"Fetched {len(overrides)} curator overrides for few-shot examples")
 
-    # Create shared rate limiter for all files in this run
-    rate_limiter = RateLimitTracker()
+    cache = None
+    if use_cache:
+        config_key = cache_config_key(args.model, overrides)
+        cache = load_classification_cache(args.cache, config_key)
+        print(f"Classification cache: {len(cache)} entries ({args.cache})")
 
-    config = {"api_key": api_key, "model": args.model}
+    # Curator overrides double as exact title+location rules
+    preclassifier = None if args.no_rules else PreClassifier.load(overrides)
+
+    files = []
     for filepath in args.files:
         # Same-city examples first, so local corrections win the prompt cap
         city = Path(filepath).parent.name
         few_shot = build_few_shot(overrides, city)
         if few_shot:
             print(f"{city}: few-shot examples in prompt:{few_shot}")
-        process_file(filepath, config, few_shot, args.dry_run, rate_limiter)
+        files.append((filepath, few_shot))
+
+    def save_cache(_path):
+        # Saved after every file so an interrupted run keeps what it paid for
+        kept = save_classification_cache(args.cache, config_key, cache)
+        _log(f"  Classification cache: {kept} entries saved")
+
+    config = {"api_key": api_key, "model": args.model}
+    process_files(
+        files,
+        config,
+        args.dry_run,
+        RateLimiter(),
+        cache,
+        workers=args.workers,
+        on_file_done=save_cache if cache is not None and not args.dry_run else None,
+        preclassifier=preclassifier,
+    )
+    if preclassifier is not None:
+        print("\n".join(preclassifier.report()))
 
 
 if __name__ == "__main__":
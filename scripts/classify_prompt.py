@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Prompt building, batching and title grouping shared by the classifiers.
+
+classify_events_json.py (events.json files, used by CI),
+classify_events_anthropic.py and ollama_classify.py (Supabase) describe
+events to the model the same way and classify one representative per
+title. This module holds those pieces so the scripts can't drift apart.
+
+Batches are sized to BATCH_TOKEN_BUDGET from each event's own prompt line
+and its expected reply, so short events pack many to a request and long
+descriptions fewer.
+"""
+
+import functools
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+CATEGORIES_FILE = Path(__file__).parent.parent / "categories.json"
+with CATEGORIES_FILE.open() as f:
+    CATEGORIES = [c["name"] for c in json.load(f)]
+
+VALID_CATEGORIES = set(CATEGORIES)
+BATCH_TOKEN_BUDGET = 6000  # Estimated event and reply tokens per request
+MAX_BATCH_SIZE = 150  # Replies must fit max_tokens at OUTPUT_TOKENS_PER_EVENT each
+CHARS_PER_TOKEN = 3  # Deliberately low, so batch estimates err high
+OUTPUT_TOKENS_PER_EVENT = 20  # One {"index", "category"} object in the reply
+
+
+def format_event_line(index, event):
+    """One numbered event line of the prompt."""
+    title = event.get("title", "")
+    location = event.get("location", "")
+    description = (event.get("description") or "")[:300]
+    ics_cats = event.get("ics_categories")
+    ics_str = ""
+    if ics_cats:
+        if isinstance(ics_cats, list):
+            ics_str = ", ".join(ics_cats)
+        else:
+            ics_str = str(ics_cats)
+    return (
+        f'{index}. Title: "{title}" Location: "{location}"'
+        + (f' ICS tags: "{ics_str}"' if ics_str else "")
+        + (f' Description: "{description}"' if description else "")
+    )
+
+
+def format_event_lines(events):
+    """The numbered event lines for a batch, starting at 1."""
+    return "\n".join(format_event_line(i + 1, event) for i, event in enumerate(events))
+
+
+def category_list():
+    """The categories as a bulleted prompt list."""
+    return "\n".join("- " + c for c in CATEGORIES)
+
+
+@functools.lru_cache(maxsize=None)
+def build_prompt_prefix(few_shot):
+    """The static part of every prompt: categories, few-shot examples, reply format.
+
+    Built once per few-shot block and sent as a cache_control system block,
+    so the API can reuse it across batches once it is long enough to cache.
+    """
+    example_json = (
+        '[{"index": 1, "category": "Music / Concerts"}, {"index": 2, "category": null}]'
+    )
+
+    return f"""Classify each event into exactly one category. Categories:
+{category_list()}
+{few_shot}
+
+You will be given a numbered list of events. Respond with ONLY a JSON array. \
+Each element must have "index" (1-based) and "category" (exact category name \
+from the list, or null if none fit). Example: {example_json}"""
+
+
+def build_prompt(events):
+    """The per-batch part of the prompt: the numbered events."""
+    return f"""Events to classify:
+
+{format_event_lines(events)}
+
+Respond with ONLY the JSON array."""
+
+
+def parse_reply(raw):
+    """{index: category} from a JSON-array reply, or None if there is no usable array.
+
+    Category names are matched exactly, then by containment; anything else
+    is left out.
+    """
+    start = raw.find("[")
+    end = raw.rfind("]") + 1
+    if start < 0 or end <= 0:
+        print(f"  WARNING: no JSON array in response: {raw[:200]}", file=sys.stderr)
+        return None
+
+    try:
+        items = json.loads(raw[start:end])
+    except json.JSONDecodeError as exc:
+        print(f"  WARNING: JSON parse error: {exc}", file=sys.stderr)
+        return None
+
+    result_map = {}
+    for item in items:
+        idx = item.get("index")
+        cat = item.get("category")
+        if cat and cat in VALID_CATEGORIES:
+            result_map[idx] = cat
+        elif cat:
+            for valid_cat in CATEGORIES:
+                if valid_cat.lower() in str(cat).lower():
+                    result_map[idx] = valid_cat
+                    break
+    return result_map
+
+
+def event_tokens(event):
+    """Estimated tokens an event adds to a request: its prompt line plus its reply."""
+    return len(format_event_line(0, event)) // CHARS_PER_TOKEN + OUTPUT_TOKENS_PER_EVENT
+
+
+def estimate_tokens(events, few_shot):
+    """Tokens to reserve for a batch: prefix, events and reply, erring high."""
+    prefix_tokens = len(build_prompt_prefix(few_shot)) // CHARS_PER_TOKEN
+    return prefix_tokens + sum(event_tokens(e) for e in events)
+
+
+def plan_batches(events, token_budget=BATCH_TOKEN_BUDGET, max_size=MAX_BATCH_SIZE):
+    """Split events into batches of at most token_budget estimated tokens.
+
+    Every batch holds at least one event and at most max_size, in input
+    order.
+    """
+    batches, batch, used = [], [], 0
+    for event in events:
+        cost = event_tokens(event)
+        if batch and (used + cost > token_budget or len(batch) >= max_size):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(event)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def title_key(event):
+    """What recurring instances of an event share: its title, stripped and lowercased."""
+    return (event.get("title") or "").strip().lower()
+
+
+def group_by_title(events):
+    """{title_key: [events]} in first-seen order; each group's first event represents it."""
+    groups = defaultdict(list)
+    for event in events:
+        groups[title_key(event)].append(event)
+    return groups
+
+
+def title_updates(results, title_groups):
+    """(event id, category) for every event sharing a classified representative's title."""
+    updates = []
+    for event, category in results:
+        if category:
+            for grouped_event in title_groups[title_key(event)]:
+                updates.append((grouped_event["id"], category))
+    return updates
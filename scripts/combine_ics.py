@@ -5,14 +5,22 @@ Filters to only include events from today forward.
 """
 
 import argparse
+import bisect
+import contextlib
+import hashlib
+import io
 import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 
 import icalendar
 import recurring_ical_events
 
+from ics_event import IcsEvent, write_records
+
 
 # Fallback URLs for sources whose ICS events lack a URL property.
 # Only needed for scraped sources where per-event URLs aren't available.
@@ -425,7 +433,11 @@ def _serialize_vevent(event, original_had_rrule):
     return content
 
 
-def expand_rrules(ics_content, window_days=90):
+# Days forward to expand RRULEs (part of the parse cache key).
+RRULE_WINDOW_DAYS = 90
+
+
+def expand_rrules(ics_content, window_days=RRULE_WINDOW_DAYS):
     """Expand recurring events in ICS content into individual instances.
 
     Returns a list of ICS VEVENT content strings (one per occurrence).
@@ -489,26 +501,10 @@ def normalize_title(title):
     return ''.join(c.lower() for c in title if c.isalnum())[:40]
 
 
-def extract_field(event_content, field_name):
-    """Extract a field value from VEVENT content, handling line folding."""
-    # Match field, handling continuation lines (start with space/tab)
-    # Use (?:;[^:]*)?  to allow ICS parameters (e.g. DTSTART;TZID=...:value)
-    # but prevent matching longer field names (e.g. X-SOURCE-ID when searching for X-SOURCE)
-    pattern = rf'^{field_name}(?:;[^:]*)?:([^\r\n]+(?:[\r\n]+[ \t][^\r\n]+)*)'
-    match = re.search(pattern, event_content, re.MULTILINE | re.IGNORECASE)
-    if match:
-        # Unfold: remove newline+space/tab
-        value = re.sub(r'[\r\n]+[ \t]', '', match.group(1))
-        # Unescape ICS escapes
-        value = value.replace('\\n', ' ').replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
-        return value.strip()
-    return None
-
-
 def get_dedup_key(event):
     """Generate dedup key from event: (date, normalized_title)."""
-    date_str = event['dtstart'].strftime('%Y-%m-%d')
-    title = extract_field(event['content'], 'SUMMARY') or ''
+    date_str = event.dtstart.strftime('%Y-%m-%d')
+    title = event.field('SUMMARY') or ''
     return (date_str, normalize_title(title))
 
 
@@ -529,16 +525,15 @@ def is_aggregator(source_name):
 _URL_DATE_RE = re.compile(r'/(\d{4})/(\d{2})/')
 
 
-def _url_predates_window(event_content, now):
+def _url_predates_window(event, now):
     """Return True if the event URL contains a /YYYY/MM/ path before the current month.
 
     Scrapers that infer year from month+day can project old WordPress posts
     into the future. The URL's embedded date catches these false futures.
     """
-    url_match = re.search(r'^URL:([^\r\n]+)', event_content, re.MULTILINE)
-    if not url_match:
+    url = event.raw('URL')
+    if not url:
         return False
-    url = url_match.group(1)
     m = _URL_DATE_RE.search(url)
     if not m:
         return False
@@ -548,6 +543,15 @@ def _url_predates_window(event_content, now):
     return (url_year, url_month) < (now.year, now.month)
 
 
+def _group_has_aggregator(group):
+    """True if any event in group lists an aggregator in its X-SOURCE."""
+    for e in group:
+        src = e.field('X-SOURCE') or ''
+        if any(is_aggregator(s.strip()) for s in src.split(',')):
+            return True
+    return False
+
+
 def dedupe_cross_source(events, input_dir):
     """Deduplicate events across sources using title+date matching.
 
@@ -579,34 +583,42 @@ def dedupe_cross_source(events, input_dir):
     for date_str, keys in date_keys.items():
         if len(keys) < 2:
             continue
-        # Sort by title length so shorter titles come first
+        # Sort by title length so shorter titles come first; rank breaks ties
+        # among a title's prefix candidates in the same order.
         keys.sort(key=lambda k: len(k[1]))
-        for i in range(len(keys)):
-            if keys[i] in merged_into:
+        rank = {key: n for n, key in enumerate(keys)}
+        # Titles sharing a prefix are contiguous in lexicographic order, so each
+        # short title only visits its true prefix candidates.
+        by_title = sorted(keys, key=lambda k: k[1])
+        titles = [k[1] for k in by_title]
+        # Only merge if at least one group contains an aggregator event.
+        # This avoids merging unrelated events that happen to share a prefix
+        # (e.g. "After School Club" vs "After School Club Robotics" at different libraries).
+        has_aggregator = {key: _group_has_aggregator(groups[key]) for key in keys}
+        for short_key in keys:
+            if short_key in merged_into:
                 continue
-            short_title = keys[i][1]
+            short_title = short_key[1]
             if len(short_title) < 12:
                 continue
-            for j in range(i + 1, len(keys)):
-                if keys[j] in merged_into:
+            candidates = []
+            for n in range(bisect.bisect_right(titles, short_title), len(titles)):
+                long_title = titles[n]
+                if not long_title.startswith(short_title):
+                    break
+                if len(short_title) / len(long_title) <= 0.75:
+                    candidates.append(by_title[n])
+            candidates.sort(key=rank.__getitem__)
+            for long_key in candidates:
+                if long_key in merged_into:
                     continue
-                long_title = keys[j][1]
-                if long_title.startswith(short_title) and len(short_title) / len(long_title) <= 0.75:
-                    # Only merge if at least one group contains an aggregator event.
-                    # This avoids merging unrelated events that happen to share a prefix
-                    # (e.g. "After School Club" vs "After School Club Robotics" at different libraries).
-                    has_aggregator = False
-                    for e in groups[keys[i]] + groups[keys[j]]:
-                        src = extract_field(e['content'], 'X-SOURCE') or ''
-                        if any(is_aggregator(s.strip()) for s in src.split(',')):
-                            has_aggregator = True
-                            break
-                    if not has_aggregator:
-                        continue
-                    # Merge longer-title group into shorter-title group
-                    groups[keys[i]].extend(groups[keys[j]])
-                    merged_into[keys[j]] = keys[i]
-                    print(f"  Prefix dedup: merged '{keys[j][1][:50]}' into '{keys[i][1][:50]}' on {date_str}")
+                if not (has_aggregator[short_key] or has_aggregator[long_key]):
+                    continue
+                # Merge longer-title group into shorter-title group
+                groups[short_key].extend(groups[long_key])
+                has_aggregator[short_key] = has_aggregator[short_key] or has_aggregator[long_key]
+                merged_into[long_key] = short_key
+                print(f"  Prefix dedup: merged '{long_key[1][:50]}' into '{short_title[:50]}' on {date_str}")
 
     # Remove merged groups
     for key in merged_into:
@@ -622,15 +634,15 @@ def dedupe_cross_source(events, input_dir):
         else:
             # Multiple events with same title+date
             # Sort: primary sources first, aggregators last
-            group.sort(key=lambda e: (1 if is_aggregator(extract_field(e['content'], 'X-SOURCE') or '') else 0))
+            group.sort(key=lambda e: (1 if is_aggregator(e.field('X-SOURCE') or '') else 0))
             
             # Merge sources from all duplicates into the kept event
             kept = group[0]
             all_sources = []
             source_urls = {}
             for e in group:
-                src = extract_field(e['content'], 'X-SOURCE')
-                evt_url = extract_field(e['content'], 'URL')
+                src = e.field('X-SOURCE')
+                evt_url = e.field('URL')
                 if src:
                     for s in src.split(','):
                         s = s.strip()
@@ -644,16 +656,11 @@ def dedupe_cross_source(events, input_dir):
                 primary = sorted(s for s in all_sources if not is_aggregator(s))
                 agg = sorted(s for s in all_sources if is_aggregator(s))
                 merged_source = ', '.join(primary + agg)
-                kept['content'] = re.sub(
-                    r'^X-SOURCE:[^\r\n]+',
-                    f'X-SOURCE:{merged_source}',
-                    kept['content'],
-                    flags=re.MULTILINE
-                )
+                kept.set_source(merged_source)
 
             # Store per-source URLs for aggregator attribution
             if source_urls:
-                kept['content'] = f'X-SOURCE-URLS:{json.dumps(source_urls)}\r\n{kept["content"]}'
+                kept.prepend_property('X-SOURCE-URLS', json.dumps(source_urls))
 
             unique_events.append(kept)
             cross_source_deduped += len(group) - 1
@@ -662,17 +669,84 @@ def dedupe_cross_source(events, input_dir):
         print(f"  Cross-source dedup: removed {cross_source_deduped} duplicate events")
     
     # Re-sort by start time
-    unique_events.sort(key=lambda x: x['dtstart'].replace(tzinfo=timezone.utc) if x['dtstart'].tzinfo is None else x['dtstart'])
+    unique_events.sort(key=lambda x: x.dtstart.replace(tzinfo=timezone.utc) if x.dtstart.tzinfo is None else x.dtstart)
     
     return unique_events
 
 
+FUZZY_DEDUP_MODEL = "claude-3-5-haiku-20241022"
+# Bump when the cached clusters' shape changes.
+FUZZY_CACHE_VERSION = 1
+
+
+def load_fuzzy_cache(cache_path):
+    """Load the per-date fuzzy dedup cache, or an empty one if missing/stale."""
+    try:
+        cache = json.loads(Path(cache_path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != FUZZY_CACHE_VERSION:
+        return {}
+    return cache.get('dates', {})
+
+
+def save_fuzzy_cache(cache_path, dates):
+    Path(cache_path).write_text(
+        json.dumps({'version': FUZZY_CACHE_VERSION, 'dates': dates}, separators=(',', ':')),
+        encoding='utf-8',
+    )
+
+
+def _fuzzy_prompt(date_str, day_events):
+    """Build the clustering prompt for one date's events."""
+    event_lines = []
+    for i, e in enumerate(day_events):
+        title = e.field('SUMMARY') or '(no title)'
+        source = e.field('X-SOURCE') or 'Unknown'
+        location = e.field('LOCATION') or ''
+        time_str = e.dtstart.strftime('%H:%M')
+        loc_part = f", {location}" if location else ""
+        event_lines.append(f"{i+1}. {title} ({source}, {time_str}{loc_part})")
+
+    return f"""Events on {date_str}. Group any that are the SAME event (same actual gathering, possibly with different titles).
+
+{chr(10).join(event_lines)}
+
+Respond with ONLY a JSON array of arrays grouping indices of same events.
+Example: [[1,2], [3], [4,5,6]] means 1&2 are same event, 3 is unique, 4&5&6 are same event.
+If all events are unique, respond: [[1], [2], [3], ...]
+
+JSON:"""
+
+
+def _fuzzy_request(client, prompt):
+    """Send one date's prompt. Returns (text, input_tokens, output_tokens) or the exception."""
+    try:
+        response = client.messages.create(
+            model=FUZZY_DEDUP_MODEL,
+            max_tokens=1024,
+            messages=[{"role": "user", "content": prompt}]
+        )
+    except Exception as e:
+        return e
+    usage = getattr(response, 'usage', None)
+    return (response.content[0].text.strip(),
+            usage.input_tokens if usage else 0,
+            usage.output_tokens if usage else 0)
+
+
 def dedupe_fuzzy(events, input_dir):
     """Use LLM to find duplicates with different titles.
     
     Groups events by date, asks Claude to cluster same-events,
     then keeps highest-priority source from each cluster.
     Logs matches to {input_dir}/fuzzy_dedup.log for analysis.
+
+    Requests for different dates run concurrently (FUZZY_DEDUP_JOBS
+    workers, default 4); the client retries rate-limited requests with
+    backoff. Clusters are cached in {input_dir}/.fuzzy_dedup_cache.json
+    keyed by a hash of each date's prompt, so dates whose events are
+    unchanged since the last run cost no API call.
     """
     import os
     from datetime import datetime
@@ -688,7 +762,9 @@ def dedupe_fuzzy(events, input_dir):
         print("  Fuzzy dedup: anthropic package not installed, skipping")
         return events
     
-    client = anthropic.Anthropic(api_key=api_key)
+    jobs = max(1, int(os.environ.get('FUZZY_DEDUP_JOBS') or 4))
+    # The SDK honors retry-after on 429s; give concurrent workers more attempts
+    client = anthropic.Anthropic(api_key=api_key, max_retries=5)
     
     # Open log file
     log_path = Path(input_dir) / 'fuzzy_dedup.log'
@@ -696,103 +772,104 @@ def dedupe_fuzzy(events, input_dir):
     log_file.write(f"Fuzzy dedup run: {datetime.now().isoformat()}\n")
     log_file.write(f"Total events: {len(events)}\n\n")
     
-    # Group by date
+    # Group by date, remembering each event's position in the original list
     by_date = {}
-    for event in events:
-        date_str = event['dtstart'].strftime('%Y-%m-%d')
+    for pos, event in enumerate(events):
+        date_str = event.dtstart.strftime('%Y-%m-%d')
         if date_str not in by_date:
             by_date[date_str] = []
-        by_date[date_str].append(event)
+        by_date[date_str].append((pos, event))
     
-    # Track which events to remove (by index in original list)
-    events_to_remove = set()
+    # Track which events to remove (by position in original list)
+    removed = [False] * len(events)
     fuzzy_deduped = 0
     api_calls = 0
     total_input_tokens = 0
     total_output_tokens = 0
-    dates_with_multiple = 0
 
-    
-    for date_str, day_events in by_date.items():
-        if len(day_events) < 2:
+    # Build every prompt up front (clusters only touch their own date's events),
+    # look them up in the cache, and send the misses concurrently.
+    cache_path = Path(input_dir) / '.fuzzy_dedup_cache.json'
+    cache = load_fuzzy_cache(cache_path)
+    new_cache = {}
+    prompts = {}
+    for date_str, day_entries in by_date.items():
+        if len(day_entries) >= 2:
+            prompts[date_str] = _fuzzy_prompt(date_str, [e for _, e in day_entries])
+    keys = {
+        date_str: hashlib.sha256(f'{FUZZY_DEDUP_MODEL}\n{prompt}'.encode('utf-8')).hexdigest()
+        for date_str, prompt in prompts.items()
+    }
+    misses = [d for d in prompts if cache.get(d, {}).get('key') != keys[d]]
+    dates_with_multiple = len(prompts)
+    cache_hits = dates_with_multiple - len(misses)
+
+    replies = {}
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(misses))) as executor:
+            for date_str, reply in zip(misses, executor.map(lambda d: _fuzzy_request(client, prompts[d]), misses)):
+                replies[date_str] = reply
+
+    for date_str, day_entries in by_date.items():
+        if date_str not in prompts:
             continue
+        day_events = [e for _, e in day_entries]
         
-        dates_with_multiple += 1
-        
-        # Build prompt with event summaries
-        event_lines = []
-        for i, e in enumerate(day_events):
-            title = extract_field(e['content'], 'SUMMARY') or '(no title)'
-            source = extract_field(e['content'], 'X-SOURCE') or 'Unknown'
-            location = extract_field(e['content'], 'LOCATION') or ''
-            time_str = e['dtstart'].strftime('%H:%M')
-            loc_part = f", {location}" if location else ""
-            event_lines.append(f"{i+1}. {title} ({source}, {time_str}{loc_part})")
-        
-        log_file.write(f"CHECKING: {date_str} ({len(event_lines)} events)\n")
-        
-        prompt = f"""Events on {date_str}. Group any that are the SAME event (same actual gathering, possibly with different titles).
-
-{chr(10).join(event_lines)}
-
-Respond with ONLY a JSON array of arrays grouping indices of same events.
-Example: [[1,2], [3], [4,5,6]] means 1&2 are same event, 3 is unique, 4&5&6 are same event.
-If all events are unique, respond: [[1], [2], [3], ...]
-
-JSON:"""
+        hit = date_str not in replies
+        log_file.write(f"CHECKING: {date_str} ({len(day_events)} events){' [cached]' if hit else ''}\n")
         
+        text = None
         try:
-            response = client.messages.create(
-                model="claude-3-5-haiku-20241022",
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            # Track API usage
-            api_calls += 1
-            if hasattr(response, 'usage'):
-                total_input_tokens += response.usage.input_tokens
-                total_output_tokens += response.usage.output_tokens
-            
-            # Parse response
-            import json
-            text = response.content[0].text.strip()
-            # Handle markdown code blocks
-            if text.startswith('```'):
-                text = text.split('\n', 1)[1].rsplit('\n', 1)[0]
-            clusters = json.loads(text)
+            if hit:
+                clusters = cache[date_str]['clusters']
+            else:
+                reply = replies[date_str]
+                if isinstance(reply, Exception):
+                    raise reply
+
+                # Track API usage
+                text, input_tokens, output_tokens = reply
+                api_calls += 1
+                total_input_tokens += input_tokens
+                total_output_tokens += output_tokens
+                
+                # Parse response
+                # Handle markdown code blocks
+                if text.startswith('```'):
+                    text = text.split('\n', 1)[1].rsplit('\n', 1)[0]
+                clusters = json.loads(text)
             
             # Process clusters - keep highest priority from each
             for cluster in clusters:
                 if len(cluster) <= 1:
                     continue
                 
-                # Get events in this cluster (convert 1-indexed to 0-indexed)
-                cluster_events = [(idx-1, day_events[idx-1]) for idx in cluster if 0 < idx <= len(day_events)]
+                # Get (original position, event) pairs in this cluster (1-indexed)
+                cluster_events = [day_entries[idx-1] for idx in cluster if 0 < idx <= len(day_entries)]
                 if len(cluster_events) <= 1:
                     continue
                 
                 # Sort by priority (non-aggregators first)
-                cluster_events.sort(key=lambda x: (1 if is_aggregator(extract_field(x[1]['content'], 'X-SOURCE') or '') else 0))
+                cluster_events.sort(key=lambda x: (1 if is_aggregator(x[1].field('X-SOURCE') or '') else 0))
                 
                 # Keep first, merge sources from rest, then mark rest for removal
-                kept_idx, kept_event = cluster_events[0]
-                kept_title = extract_field(kept_event['content'], 'SUMMARY') or '(no title)'
-                kept_source = extract_field(kept_event['content'], 'X-SOURCE') or 'Unknown'
+                _, kept_event = cluster_events[0]
+                kept_title = kept_event.field('SUMMARY') or '(no title)'
+                kept_source = kept_event.field('X-SOURCE') or 'Unknown'
                 
                 # Collect all sources and their URLs for merging
                 all_sources = []
                 source_urls = {}
                 if kept_source != 'Unknown':
                     all_sources.extend(s.strip() for s in kept_source.split(','))
-                kept_url = extract_field(kept_event['content'], 'URL')
+                kept_url = kept_event.field('URL')
                 if kept_source != 'Unknown' and kept_url:
                     source_urls[kept_source] = kept_url
 
-                for idx, removed_event in cluster_events[1:]:
-                    removed_title = extract_field(removed_event['content'], 'SUMMARY') or '(no title)'
-                    removed_source = extract_field(removed_event['content'], 'X-SOURCE') or 'Unknown'
-                    removed_url = extract_field(removed_event['content'], 'URL')
+                for pos, removed_event in cluster_events[1:]:
+                    removed_title = removed_event.field('SUMMARY') or '(no title)'
+                    removed_source = removed_event.field('X-SOURCE') or 'Unknown'
+                    removed_url = removed_event.field('URL')
 
                     if removed_source != 'Unknown':
                         for s in removed_source.split(','):
@@ -806,9 +883,7 @@ JSON:"""
                     print(f"    Fuzzy match: {match_line}")
                     log_file.write(f"MATCH: {match_line}\n")
 
-                    # Find this event in the original list
-                    orig_idx = events.index(day_events[idx])
-                    events_to_remove.add(orig_idx)
+                    removed[pos] = True
                     fuzzy_deduped += 1
 
                 # Merge sources into kept event (primary sources first, then aggregators)
@@ -816,38 +891,38 @@ JSON:"""
                     primary = sorted(s for s in all_sources if not is_aggregator(s))
                     agg = sorted(s for s in all_sources if is_aggregator(s))
                     merged_source = ', '.join(primary + agg)
-                    kept_event['content'] = re.sub(
-                        r'^X-SOURCE:[^\r\n]+',
-                        f'X-SOURCE:{merged_source}',
-                        kept_event['content'],
-                        flags=re.MULTILINE
-                    )
+                    kept_event.set_source(merged_source)
                     log_file.write(f"  -> Merged sources: {merged_source}\n")
 
                 # Store per-source URLs for aggregator attribution
                 if source_urls:
-                    kept_event['content'] = f'X-SOURCE-URLS:{json.dumps(source_urls)}\r\n{kept_event["content"]}'
+                    kept_event.prepend_property('X-SOURCE-URLS', json.dumps(source_urls))
+
+            new_cache[date_str] = {'key': keys[date_str], 'clusters': clusters}
                     
         except Exception as e:
             error_msg = f"ERROR [{date_str}]: {e}"
             print(f"  Fuzzy dedup: {error_msg}")
             log_file.write(f"{error_msg}\n")
             # Log the raw response if available for debugging
-            if 'text' in dir():
+            if text is not None:
                 log_file.write(f"  Raw response: {text[:500]}\n")
             continue
     
     # Write summary and close log file
     log_file.write(f"\n--- Summary ---\n")
     log_file.write(f"Dates with 2+ events: {dates_with_multiple}\n")
+    log_file.write(f"Cache hits: {cache_hits}\n")
+    log_file.write(f"Cache misses: {len(misses)}\n")
 
     log_file.write(f"API calls made: {api_calls}\n")
     log_file.write(f"Total input tokens: {total_input_tokens}\n")
     log_file.write(f"Total output tokens: {total_output_tokens}\n")
     log_file.write(f"Fuzzy matches found: {fuzzy_deduped}\n")
     log_file.close()
+    save_fuzzy_cache(cache_path, new_cache)
     
-    print(f"  Fuzzy dedup: {api_calls} API calls, {total_input_tokens}+{total_output_tokens} tokens")
+    print(f"  Fuzzy dedup: {cache_hits}/{dates_with_multiple} dates cached, {api_calls} API calls, {total_input_tokens}+{total_output_tokens} tokens")
     
     if fuzzy_deduped > 0:
         print(f"  Fuzzy dedup: removed {fuzzy_deduped} duplicate events (see fuzzy_dedup.log)")
@@ -855,7 +930,7 @@ JSON:"""
         print(f"  Fuzzy dedup: no additional duplicates found")
     
     # Return events with duplicates removed
-    return [e for i, e in enumerate(events) if i not in events_to_remove]
+    return [e for e, drop in zip(events, removed) if not drop]
 
 
 def extract_events(ics_content, source_name=None, source_id=None, fallback_url=None):
@@ -865,7 +940,7 @@ def extract_events(ics_content, source_name=None, source_id=None, fallback_url=N
     # Try RRULE expansion first; returns None if no RRULEs or parsing fails
     expanded_blocks = None
     try:
-        expanded_blocks = expand_rrules(ics_content)
+        expanded_blocks = expand_rrules(ics_content, RRULE_WINDOW_DAYS)
     except Exception as e:
         print(f"  RRULE expansion error ({e}), falling back to regex")
 
@@ -877,136 +952,275 @@ def extract_events(ics_content, source_name=None, source_id=None, fallback_url=N
         matches = re.findall(pattern, ics_content, re.DOTALL)
 
     for event_content in matches:
-        dtstart_match = re.search(r'DTSTART[^:]*:([^\r\n]+)', event_content)
-        if dtstart_match:
-            dt = parse_ics_datetime(dtstart_match.group(1))
+        event = IcsEvent(None, event_content)
+        dtstart_raw = event.raw('DTSTART')
+        if dtstart_raw:
+            dt = parse_ics_datetime(dtstart_raw)
             if dt:
+                event.dtstart = dt
                 # Add fallback URL if no URL exists
                 if fallback_url and 'URL:' not in event_content:
-                    event_content = f'URL:{fallback_url}\r\n{event_content}'
+                    event.prepend_property('URL', fallback_url)
 
                 # Add X-SOURCE, X-SOURCE-ID, and X-SOURCE-URLS headers
                 # (source attribution is rendered by the app from X-SOURCE)
                 if source_name:
                     if 'X-SOURCE' not in event_content:
-                        event_content = f'X-SOURCE:{source_name}\r\n{event_content}'
+                        event.prepend_property('X-SOURCE', source_name)
                     if source_id and 'X-SOURCE-ID' not in event_content:
-                        event_content = f'X-SOURCE-ID:{source_id}\r\n{event_content}'
+                        event.prepend_property('X-SOURCE-ID', source_id)
                     # Build initial source_urls mapping so every event has one,
                     # not just events that go through dedup merging
-                    evt_url = extract_field(event_content, 'URL')
+                    evt_url = event.field('URL')
                     if evt_url and 'X-SOURCE-URLS' not in event_content:
-                        event_content = f'X-SOURCE-URLS:{json.dumps({source_name: evt_url})}\r\n{event_content}'
-                
-                events.append({
-                    'dtstart': dt,
-                    'content': event_content
-                })
-    
+                        event.prepend_property('X-SOURCE-URLS', json.dumps({source_name: evt_url}))
+
+                events.append(event)
+
     return events
 
 
-def combine_ics_files(input_dir, output_file, calendar_name="Combined Calendar", exclude_sources=None, geo_report=None):
-    """Combine all ICS files in a directory into one.
-    
-    Args:
-        exclude_sources: Set of source filenames (without .ics) to skip
+# Bump when extract_events output changes shape or content for the same input.
+PARSE_CACHE_VERSION = 1
+
+
+def load_parse_cache(cache_path):
+    """Load the per-source parse cache, or an empty one if missing/stale."""
+    try:
+        cache = json.loads(Path(cache_path).read_text())
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != PARSE_CACHE_VERSION:
+        return {}
+    return cache.get('sources', {})
+
+
+def save_parse_cache(cache_path, sources):
+    Path(cache_path).write_text(
+        json.dumps({'version': PARSE_CACHE_VERSION, 'sources': sources}, separators=(',', ':')),
+        encoding='utf-8',
+    )
+
+
+def _parse_cache_key(content, source_name, source_id, fallback_url):
+    """Cache key for one source file's extract_events result.
+
+    The file hash plus everything extract_events folds into the events.
+    Only RRULE expansion depends on the date, so today's date and the
+    expansion window join the key just for files that contain RRULEs;
+    other feeds stay cached across nightly runs.
     """
-    all_events = []
-    geo_filtered_count = 0
-    geo_filtered_details = []  # Track what got filtered for curator visibility
-    exclude_sources = exclude_sources or set()
-    load_feeds_txt_names(input_dir)
-    # Use 24 hours ago to avoid filtering out same-day events due to timezone differences
-    from datetime import timedelta
-    now = datetime.now(timezone.utc) - timedelta(hours=24)
-    
-    # Load allowed cities for geo filtering
-    allowed_cities, excluded_cities = load_allowed_cities(input_dir)
-    if allowed_cities:
-        print(f"  Geo filter active: {len(allowed_cities)} allowed cities")
-    if excluded_cities:
-        print(f"  Excluded cities: {len(excluded_cities)}")
-    
-    ics_dir = Path(input_dir)
-    for ics_file in sorted(ics_dir.glob('*.ics')):
-        # Skip output files (combined.ics or the specified output)
-        if ics_file.name == Path(output_file).name or ics_file.stem == 'combined':
-            continue
-        
-        # Skip excluded sources
-        if ics_file.stem in exclude_sources:
-            print(f"  SKIP {ics_file.name} (excluded)")
-            continue
-            
+    h = hashlib.sha256(content.encode('utf-8', errors='replace'))
+    for part in (source_name, source_id, fallback_url):
+        h.update(b'\0' + (part or '').encode('utf-8'))
+    if 'RRULE' in content:
+        h.update(f'\0{date.today().isoformat()}\0{RRULE_WINDOW_DAYS}'.encode())
+    return h.hexdigest()
+
+
+def extract_events_cached(content, source_name, source_id, fallback_url, entry):
+    """extract_events() with a per-source cache.
+
+    entry is this source's entry from the loaded parse cache (or None).
+    Returns (events, entry, hit) where entry is the one to store for the
+    source in the saved cache, so sources that disappeared are pruned.
+    """
+    key = _parse_cache_key(content, source_name, source_id, fallback_url)
+    if entry and entry.get('key') == key:
+        events = [IcsEvent(datetime.fromisoformat(dt), c) for dt, c in entry['events']]
+        return events, entry, True
+    events = extract_events(content, source_name, source_id, fallback_url)
+    entry = {
+        'key': key,
+        'events': [[e.dtstart.isoformat(), e.content] for e in events],
+    }
+    return events, entry, False
+
+
+def process_source(ics_file, source_name, fallback_url, now, allowed_cities, excluded_cities, cache_entry):
+    """Parse one source file and apply the per-source filters.
+
+    Runs extract_events (via the parse cache) and the future-date, URL-date
+    and geo filters. Everything it would print is captured and returned so
+    that combine_ics_files can emit it in file order when sources run in a
+    process pool. Module-level and argument-only so it pickles.
+
+    Returns a dict with events, geo_filtered (details), cache_entry, hit
+    and output.
+    """
+    result = {'events': [], 'geo_filtered': [], 'cache_entry': None, 'hit': False}
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
         try:
             content = ics_file.read_text(encoding='utf-8', errors='ignore')
-            source_name = get_source_name(ics_file.name)
             source_id = ics_file.stem  # filename without .ics
-            fallback_url = get_fallback_url(ics_file.name)
-            events = extract_events(content, source_name, source_id, fallback_url)
-            
+            events, result['cache_entry'], result['hit'] = extract_events_cached(
+                content, source_name, source_id, fallback_url, cache_entry)
+
             # Filter to future events only
-            future_events = [e for e in events if e['dtstart'].replace(tzinfo=timezone.utc) >= now]
+            future_events = [e for e in events if e.dtstart.replace(tzinfo=timezone.utc) >= now]
 
             # Filter out events whose URL contains a /YYYY/MM/ path predating the build window.
             # Scrapers that infer year from month/day can project old posts into the future;
             # the URL's embedded date is a reliable signal that the event is stale.
             before_filter = len(future_events)
-            future_events = [e for e in future_events if not _url_predates_window(e['content'], now)]
+            future_events = [e for e in future_events if not _url_predates_window(e, now)]
             url_date_filtered = before_filter - len(future_events)
             if url_date_filtered:
                 print(f"    Filtered {url_date_filtered} events with stale URL dates from {ics_file.name}")
 
             # Apply geo filter if configured
+            geo_filtered = []
             if allowed_cities:
                 filtered_events = []
                 for e in future_events:
-                    # Handle ICS line folding (continuation lines start with space/tab)
-                    # Use ^LOCATION to avoid matching X-LIC-LOCATION
-                    location_match = re.search(r'^LOCATION:([^\n]+(?:\n[ \t][^\n]+)*)', e['content'], re.MULTILINE)
-                    if location_match:
-                        # Unfold: remove newline+space/tab
-                        location = re.sub(r'\n[ \t]', '', location_match.group(1))
-                    else:
-                        location = ''
+                    # Raw (still escaped) value, unfolded by the tokenizer
+                    location = e.raw('LOCATION') or ''
                     if location_matches_allowed_cities(location, allowed_cities, excluded_cities):
                         filtered_events.append(e)
                     else:
-                        geo_filtered_count += 1
-                        title_match = re.search(r'SUMMARY:([^\r\n]+)', e['content'])
-                        title = title_match.group(1) if title_match else '(no title)'
-                        geo_filtered_details.append({
+                        title = e.raw('SUMMARY') or '(no title)'
+                        geo_filtered.append({
                             'source': source_name,
                             'source_id': source_id,
                             'title': title,
                             'location': location.replace('\\,', ','),
                         })
                 future_events = filtered_events
-            
-            all_events.extend(future_events)
-            
+
+            result['events'] = future_events
+            result['geo_filtered'] = geo_filtered
+
             if future_events:
                 # Use actual X-SOURCE from first event if available (may differ from get_source_name for live feeds)
-                actual_source = extract_field(future_events[0]['content'], 'X-SOURCE') or source_name
+                actual_source = future_events[0].field('X-SOURCE') or source_name
                 print(f"  {len(future_events):4d} future events from {ics_file.name} ({actual_source})")
         except Exception as e:
             print(f"  Error processing {ics_file.name}: {e}")
+    result['output'] = buf.getvalue()
+    return result
+
+
+def write_combined_ics(output_file, calendar_name, events):
+    """Stream the combined calendar to output_file.
+
+    Events are written one at a time to a temp file next to output_file,
+    which is then renamed into place, so readers never see a partial file
+    and the whole calendar is never held in memory as one string.
+    """
+    output_path = Path(output_file)
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    header = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Community Calendar//Combined Feed//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{calendar_name}',
+        'REFRESH-INTERVAL;VALUE=DURATION:PT1H',
+        'X-PUBLISHED-TTL:PT1H',
+    ]
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+            f.write('\r\n'.join(header))
+            for event in events:
+                f.write('\r\nBEGIN:VEVENT\r\n')
+                f.write(event.content)
+                f.write('\r\nEND:VEVENT')
+            f.write('\r\nEND:VCALENDAR')
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def combine_ics_files(input_dir, output_file, calendar_name="Combined Calendar", exclude_sources=None, geo_report=None,
+                      parse_cache=None, records_file=None, jobs=1):
+    """Combine all ICS files in a directory into one.
+    
+    Args:
+        exclude_sources: Set of source filenames (without .ics) to skip
+        parse_cache: Path of the per-source parse cache (see
+            extract_events_cached), or None to parse every file
+        records_file: Also write the final events as an ics_event records
+            sidecar that ics_to_json.py can read instead of the .ics
+        jobs: Process source files in a pool of this many worker
+            processes (see process_source); output is the same as jobs=1
+    """
+    all_events = []
+    geo_filtered_count = 0
+    geo_filtered_details = []  # Track what got filtered for curator visibility
+    exclude_sources = exclude_sources or set()
+    load_feeds_txt_names(input_dir)
+    # Use 24 hours ago to avoid filtering out same-day events due to timezone differences
+    from datetime import timedelta
+    now = datetime.now(timezone.utc) - timedelta(hours=24)
+    
+    # Load allowed cities for geo filtering
+    allowed_cities, excluded_cities = load_allowed_cities(input_dir)
+    if allowed_cities:
+        print(f"  Geo filter active: {len(allowed_cities)} allowed cities")
+    if excluded_cities:
+        print(f"  Excluded cities: {len(excluded_cities)}")
     
+    cache = load_parse_cache(parse_cache) if parse_cache else {}
+    new_cache = {}
+    cache_hits = 0
+
+    ics_dir = Path(input_dir)
+    tasks = []
+    for ics_file in sorted(ics_dir.glob('*.ics')):
+        # Skip output files (combined.ics or the specified output)
+        if ics_file.name == Path(output_file).name or ics_file.stem == 'combined':
+            continue
+        
+        # Skip excluded sources
+        if ics_file.stem in exclude_sources:
+            print(f"  SKIP {ics_file.name} (excluded)")
+            continue
+
+        # Names are resolved here: feeds.txt is loaded into this process only
+        tasks.append((ics_file, get_source_name(ics_file.name), get_fallback_url(ics_file.name),
+                      now, allowed_cities, excluded_cities, cache.get(ics_file.stem)))
+
+    # Results are consumed in task (sorted filename) order either way, so
+    # the combined output does not depend on --jobs.
+    executor = None
+    if jobs > 1 and len(tasks) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(tasks)))
+        results = executor.map(process_source, *zip(*tasks))
+    else:
+        results = (process_source(*task) for task in tasks)
+    try:
+        for task, result in zip(tasks, results):
+            print(result['output'], end='')
+            all_events.extend(result['events'])
+            geo_filtered_details.extend(result['geo_filtered'])
+            if result['cache_entry'] is not None:
+                new_cache[task[0].stem] = result['cache_entry']
+            cache_hits += result['hit']
+    finally:
+        if executor:
+            executor.shutdown()
+    geo_filtered_count = len(geo_filtered_details)
+
+    if parse_cache:
+        save_parse_cache(parse_cache, new_cache)
+        print(f"  Parse cache: {cache_hits}/{len(new_cache)} sources unchanged")
+
     # Sort by start time
     def normalize_dt(dt):
         if dt.tzinfo is None:
             return dt.replace(tzinfo=timezone.utc)
         return dt
-    all_events.sort(key=lambda x: normalize_dt(x['dtstart']))
+    all_events.sort(key=lambda x: normalize_dt(x.dtstart))
     
     # Remove duplicates based on UID (same-source duplicates)
     seen_uids = set()
     uid_deduped = []
     for event in all_events:
-        uid_match = re.search(r'UID:([^\r\n]+)', event['content'])
-        if uid_match:
-            uid = uid_match.group(1)
+        uid = event.raw('UID')
+        if uid:
             if uid not in seen_uids:
                 seen_uids.add(uid)
                 uid_deduped.append(event)
@@ -1022,26 +1236,9 @@ def combine_ics_files(input_dir, output_file, calendar_name="Combined Calendar",
     if os.environ.get('ENABLE_FUZZY_DEDUP'):
         unique_events = dedupe_fuzzy(unique_events, input_dir)
     
-    # Build combined ICS
-    output = [
-        'BEGIN:VCALENDAR',
-        'VERSION:2.0',
-        'PRODID:-//Community Calendar//Combined Feed//EN',
-        'CALSCALE:GREGORIAN',
-        'METHOD:PUBLISH',
-        f'X-WR-CALNAME:{calendar_name}',
-        'REFRESH-INTERVAL;VALUE=DURATION:PT1H',
-        'X-PUBLISHED-TTL:PT1H',
-    ]
-    
-    for event in unique_events:
-        output.append('BEGIN:VEVENT')
-        output.append(event['content'])
-        output.append('END:VEVENT')
-    
-    output.append('END:VCALENDAR')
-    
-    Path(output_file).write_text('\r\n'.join(output), encoding='utf-8')
+    write_combined_ics(output_file, calendar_name, unique_events)
+    if records_file:
+        write_records(records_file, unique_events)
     
     if geo_filtered_count > 0:
         print(f"  (Geo-filtered {geo_filtered_count} events outside allowed cities)")
@@ -1074,11 +1271,19 @@ if __name__ == '__main__':
     parser.add_argument('--name', '-n', default='Community Calendar', help='Calendar name')
     parser.add_argument('--exclude', '-x', default='', help='Comma-separated source filenames to exclude (without .ics)')
     parser.add_argument('--geo-report', default='', help='Where to write the geo_filtered.json sidecar (default: next to the output file)')
-    
+    parser.add_argument('--parse-cache', default='', help='Per-source parse cache file (default: .combine_cache.json next to the output file)')
+    parser.add_argument('--no-parse-cache', action='store_true', help='Re-parse every source file')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Parse source files in N worker processes (default: 1)')
+    parser.add_argument('--records', default='', help='Also write the events as a JSON Lines records sidecar for ics_to_json.py')
+
     args = parser.parse_args()
     exclude_sources = set(s.strip() for s in args.exclude.split(',') if s.strip())
     
     print(f"Combining ICS files from {args.input_dir}...")
     if exclude_sources:
         print(f"  Excluding sources: {', '.join(sorted(exclude_sources))}")
-    combine_ics_files(args.input_dir, args.output, args.name, exclude_sources, geo_report=args.geo_report or None)
+    parse_cache = None
+    if not args.no_parse_cache:
+        parse_cache = args.parse_cache or str(Path(args.output).parent / '.combine_cache.json')
+    combine_ics_files(args.input_dir, args.output, args.name, exclude_sources, geo_report=args.geo_report or None,
+                      parse_cache=parse_cache, records_file=args.records or None, jobs=args.jobs)
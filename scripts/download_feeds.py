@@ -1,25 +1,54 @@
 #!/usr/bin/env python3
 """Download all live ICS feeds for a city.
 
-Usage: python scripts/download_feeds.py <city>
+Usage: python scripts/download_feeds.py <city> [--jobs N] [--per-host N]
 
 Queries the feeds table in Supabase for active ics_url/curator feeds,
 downloads each to an auto-named .ics file in cities/<city>/, and injects
 X-SOURCE headers. Falls back to feeds.txt if SUPABASE_URL is not set.
+
+Feeds are fetched concurrently through one pooled HTTP session: --jobs caps
+the total number of in-flight downloads, --per-host caps connections to any
+single host (Meetup and Google Calendar throttle bursts). --jobs 1 downloads
+one feed at a time.
+
+Per-URL ETag / Last-Modified / content hash are kept in
+cities/<city>/.feed_cache.json. Requests are conditional, and a 304 reuses
+the .ics already on disk (if its hash still matches and the feed's source
+name/URL haven't changed). Each entry records whether the content changed
+this run, so later stages can skip unchanged feeds. --no-cache forces full
+downloads.
 """
 
+import argparse
+import hashlib
 import json
 import os
 import re
-import subprocess
 import sys
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from feed_slug import slugify
 
+USER_AGENT = "Mozilla/5.0 (compatible; CommunityCalendar/1.0)"
+
+# Global cap on in-flight downloads, and cap on open connections per host.
+DEFAULT_JOBS = 8
+DEFAULT_PER_HOST = 2
+
+# (connect, read) seconds. curl had no timeout, so one hung host could
+# stall the whole step.
+FETCH_TIMEOUT = (15, 120)
+
+FEED_CACHE_FILE = ".feed_cache.json"
+
 
 def parse_feeds_txt(feeds_file: str):
     """Parse feeds.txt, yielding (url, friendly_name, fallback_url) tuples.
@@ -190,7 +219,191 @@ def fix_mec_timezone(filepath: str) -> None:
         f.write(fixed)
 
 
-def download_feeds(city: str) -> None:
+def make_session(jobs: int = DEFAULT_JOBS, per_host: int = DEFAULT_PER_HOST) -> requests.Session:
+    """Build the shared HTTP session used for every feed in a run.
+
+    The adapter keeps one connection pool per host with at most ``per_host``
+    connections; ``pool_block`` makes extra requests to that host wait for a
+    free connection instead of opening another one, which is what enforces
+    the per-host limit. Connections are reused (keep-alive) across feeds.
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(
+        pool_connections=max(jobs, 10),
+        pool_maxsize=max(per_host, 1),
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def file_sha256(path: str) -> str | None:
+    """sha256 hex digest of a file's bytes, or None if it can't be read."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_feed_cache(output_dir: str) -> dict:
+    """Load the per-URL conditional GET metadata for a city directory.
+
+    Maps feed URL -> {file, etag, last_modified, sha256, source, source_url,
+    changed, checked_at}. ``sha256`` is the hash of the post-processed .ics
+    on disk (what combine reads); ``source``/``source_url`` are the X-SOURCE
+    values injected into it; ``changed`` is False when the last run left
+    that file identical.
+    """
+    path = os.path.join(output_dir, FEED_CACHE_FILE)
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_feed_cache(output_dir: str, cache: dict) -> None:
+    path = os.path.join(output_dir, FEED_CACHE_FILE)
+    with open(path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def conditional_headers(entry: dict | None, outfile: str, friendly_name: str | None = None,
+                        fallback_url: str | None = None) -> dict:
+    """If-None-Match / If-Modified-Since headers for a cached feed.
+
+    Only sent when the cached file is still on disk and unmodified, and was
+    tagged with the same X-SOURCE name and URL, since a 304 means "reuse
+    what you have". A renamed source needs a fresh body to inject into.
+    """
+    if not entry or file_sha256(outfile) != entry.get("sha256"):
+        return {}
+    if (entry.get("source"), entry.get("source_url")) != (friendly_name, fallback_url):
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def fetch_feed(session: requests.Session, url: str, outfile: str,
+               headers: dict | None = None) -> requests.Response | None:
+    """Download one feed to outfile, following redirects like ``curl -sL``.
+
+    Only a non-empty 2xx body is written. A 304 keeps the existing file
+    and returns the response. Network errors, other statuses and empty
+    bodies leave outfile untouched and return None, so a file left over
+    from the last run is never mistaken for a fresh download.
+    """
+    try:
+        resp = session.get(url, headers=headers, timeout=FETCH_TIMEOUT, allow_redirects=True)
+    except requests.RequestException as e:
+        print(f"  ⚠️  {url}: {e}", file=sys.stderr)
+        return None
+    if resp.status_code == 304:
+        return resp
+    if not 200 <= resp.status_code < 300:
+        print(f"  ⚠️  {url}: HTTP {resp.status_code}", file=sys.stderr)
+        return None
+    if not resp.content:
+        print(f"  ⚠️  {url}: empty response", file=sys.stderr)
+        return None
+    with open(outfile, "wb") as f:
+        f.write(resp.content)
+    return resp
+
+
+def _count_events(path: str) -> int:
+    try:
+        with open(path) as ics:
+            return ics.read().count("BEGIN:VEVENT")
+    except Exception:
+        return 0
+
+
+def download_one(session: requests.Session, output_dir: str, url: str,
+                 friendly_name: str | None, fallback_url: str | None,
+                 cache_entry: dict | None = None) -> tuple[list[str], dict | None]:
+    """Fetch and post-process one feed.
+
+    Returns (report lines, new cache entry). Lines are returned rather than
+    printed so concurrent downloads can be reported in feeds.txt order
+    without interleaving. The entry is None when nothing was fetched.
+    """
+    filename = slugify(url) + ".ics"
+    outfile = os.path.join(output_dir, filename)
+    lines = []
+
+    headers = conditional_headers(cache_entry, outfile, friendly_name, fallback_url)
+    resp = fetch_feed(session, url, outfile, headers)
+    not_modified = resp is not None and resp.status_code == 304
+
+    # Report result
+    if resp is None:
+        # Nothing usable fetched: anything on disk is left over from an
+        # earlier run and was already post-processed, so leave it alone.
+        events = _count_events(outfile)
+        lines.append(f"  ❌ {filename}: fetch failed"
+                     f"{f', keeping {events} events from last run [stale]' if events else ''}")
+    elif os.path.exists(outfile) and os.path.getsize(outfile) > 0:
+        events = _count_events(outfile)
+
+        # A 304 reuses the file from the previous run, which was already
+        # post-processed (and the MEC fix is not idempotent).
+        if not not_modified:
+            # Inject source headers from feeds.txt metadata
+            if friendly_name:
+                inject_source_headers(outfile, friendly_name, fallback_url)
+
+            # Fix MEC timezone bug for known-affected feeds
+            if _needs_mec_tz_fix(url):
+                fix_mec_timezone(outfile)
+                lines.append(f"  🔧 Applied MEC timezone fix to {filename}")
+
+        lines.append(f"  ✅ {filename}: {events} events"
+                     f"{' (source: ' + friendly_name + ')' if friendly_name else ''}"
+                     f"{' [not modified]' if not_modified else ''}")
+    else:
+        lines.append(f"  ❌ {filename}: empty or failed")
+
+    sha = file_sha256(outfile)
+    if sha is None:
+        return lines, None
+    if resp is None:
+        # Fetch failed; whatever was on disk from the last run stays, and
+        # so do its validators. Recording a failed response's ETag would
+        # let later runs 304 onto a file this run never downloaded.
+        if not cache_entry:
+            return lines, None
+        return lines, dict(cache_entry, changed=cache_entry.get("sha256") != sha)
+
+    if not_modified:
+        etag = resp.headers.get("ETag") or cache_entry.get("etag")
+        last_modified = resp.headers.get("Last-Modified") or cache_entry.get("last_modified")
+    else:
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+    entry = {
+        "file": filename,
+        "etag": etag,
+        "last_modified": last_modified,
+        "sha256": sha,
+        "source": friendly_name,
+        "source_url": fallback_url,
+        "changed": not cache_entry or cache_entry.get("sha256") != sha,
+        "checked_at": datetime.now(ZoneInfo("UTC")).isoformat(timespec="seconds"),
+    }
+    return lines, entry
+
+
+def download_feeds(city: str, jobs: int = DEFAULT_JOBS, per_host: int = DEFAULT_PER_HOST,
+                   use_cache: bool = True) -> None:
     output_dir = os.path.join("cities", city)
     os.makedirs(output_dir, exist_ok=True)
 
@@ -209,42 +422,29 @@ def download_feeds(city: str) -> None:
         pending_feeds = []
         print(f"  Using feeds.txt ({len(feed_list)} feeds)")
 
-    count = 0
-    for url, friendly_name, fallback_url in feed_list:
-        filename = slugify(url) + ".ics"
-        outfile = os.path.join(output_dir, filename)
-
-        cmd = ["curl", "-sL",
-               "-A", "Mozilla/5.0 (compatible; CommunityCalendar/1.0)",
-               url, "-o", outfile]
-
-        subprocess.run(cmd)
-
-        # Report result
-        if os.path.exists(outfile) and os.path.getsize(outfile) > 0:
-            try:
-                with open(outfile) as ics:
-                    events = ics.read().count("BEGIN:VEVENT")
-            except Exception:
-                events = 0
-
-            # Inject source headers from feeds.txt metadata
-            if friendly_name:
-                inject_source_headers(outfile, friendly_name, fallback_url)
+    old_cache = load_feed_cache(output_dir) if use_cache else {}
+    new_cache = {}
 
-            # Fix MEC timezone bug for known-affected feeds
-            if _needs_mec_tz_fix(url):
-                fix_mec_timezone(outfile)
-                print(f"  🔧 Applied MEC timezone fix to {filename}")
-
-            print(f"  ✅ {filename}: {events} events"
-                  f"{' (source: ' + friendly_name + ')' if friendly_name else ''}")
-        else:
-            print(f"  ❌ {filename}: empty or failed")
-
-        count += 1
-
-    print(f"Downloaded {count} feeds for {city}")
+    jobs = max(jobs, 1)
+    count = 0
+    with make_session(jobs, per_host) as session, ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = executor.map(
+            lambda feed: download_one(session, output_dir, *feed, old_cache.get(feed[0])),
+            feed_list,
+        )
+        # map() yields in submission order, so the report reads the same
+        # as a serial run regardless of which download finishes first.
+        for (url, _, _), (lines, entry) in zip(feed_list, results):
+            for line in lines:
+                print(line)
+            if entry is not None:
+                new_cache[url] = entry
+            count += 1
+
+    # Feeds no longer in the list drop out of the cache.
+    save_feed_cache(output_dir, new_cache)
+    unchanged = sum(1 for e in new_cache.values() if not e.get("changed"))
+    print(f"Downloaded {count} feeds for {city} ({unchanged} unchanged)")
 
     # Mark pending feeds as active
     if pending_feeds:
@@ -252,7 +452,13 @@ def download_feeds(city: str) -> None:
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python scripts/download_feeds.py <city>", file=sys.stderr)
-        sys.exit(1)
-    download_feeds(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Download live ICS feeds for a city")
+    parser.add_argument("city", help="City directory name (e.g. santarosa)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS,
+                        help=f"Max concurrent downloads (default: {DEFAULT_JOBS})")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                        help=f"Max concurrent connections per host (default: {DEFAULT_PER_HOST})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore ETag/Last-Modified metadata and download every feed in full")
+    args = parser.parse_args()
+    download_feeds(args.city, jobs=args.jobs, per_host=args.per_host, use_cache=not args.no_cache)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Build the load-events upload payload for one city, as a delta when possible.
+
+Compares this build's events.json with the previous build's (the copy on the
+archive branch, i.e. what was last uploaded) by source_uid and row content
+hash. Only inserted and updated rows are sent; the full list of current
+source_uids goes along so load-events can delete the stale rows with
+delete_stale_events, as a full upload does. With no previous snapshot (or
+--full) the payload is the full event list.
+
+Duplicate source_uids are collapsed first-wins, as load-events does.
+
+Usage:
+    python scripts/events_delta.py --city toronto --current cities/toronto/events.json \\
+        --prev /tmp/events.prev.json -o /tmp/payload_toronto.json
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from ics_to_json import event_hash, iter_events
+
+
+def unique_by_uid(events):
+    """{source_uid: event} keeping the first event per uid; rows without one are dropped."""
+    unique = {}
+    for e in events:
+        uid = e.get('source_uid')
+        if uid and uid not in unique:
+            unique[uid] = e
+    return unique
+
+
+def row_hash(event, city):
+    """Content hash of the row load-events would write for event."""
+    return event_hash({**event, 'city': event.get('city') or city})
+
+
+def compute_delta(prev_file, current_file, city):
+    """Diff two events files by source_uid and row hash.
+
+    Returns {'inserts': [...], 'updates': [...], 'deletes': [uids],
+    'unchanged': n, 'source_uids': [every current uid]}.
+    """
+    prev_hashes = {uid: row_hash(e, city) for uid, e in unique_by_uid(iter_events(prev_file)).items()}
+    current = unique_by_uid(iter_events(current_file))
+
+    inserts, updates = [], []
+    unchanged = 0
+    for uid, e in current.items():
+        prev = prev_hashes.get(uid)
+        if prev is None:
+            inserts.append(e)
+        elif prev != row_hash(e, city):
+            updates.append(e)
+        else:
+            unchanged += 1
+    return {
+        'inserts': inserts,
+        'updates': updates,
+        'deletes': [uid for uid in prev_hashes if uid not in current],
+        'unchanged': unchanged,
+        'source_uids': list(current),
+    }
+
+
+def build_payload(city, current_file, prev_file=None):
+    """load-events request body: delta mode against prev_file, or full."""
+    if prev_file is None:
+        events = list(iter_events(current_file))
+        return {'city': city, 'events': events}, f"full upload of {len(events)} events"
+    delta = compute_delta(prev_file, current_file, city)
+    payload = {
+        'city': city,
+        'mode': 'delta',
+        'events': delta['inserts'] + delta['updates'],
+        'source_uids': delta['source_uids'],
+    }
+    summary = (f"delta upload: {len(delta['inserts'])} inserted, {len(delta['updates'])} updated, "
+               f"{len(delta['deletes'])} deleted, {delta['unchanged']} unchanged")
+    return payload, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a load-events payload, as a delta against the previous build')
+    parser.add_argument('--city', required=True)
+    parser.add_argument('--current', required=True, help="This build's events.json")
+    parser.add_argument('--prev', help="Previous build's events.json (omit for a full upload)")
+    parser.add_argument('--full', action='store_true', help='Ignore --prev and send every event')
+    parser.add_argument('-o', '--output', required=True, help='Where to write the request body')
+    args = parser.parse_args()
+
+    prev = args.prev if args.prev and not args.full and Path(args.prev).is_file() else None
+    payload, summary = build_payload(args.city, args.current, prev)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"{args.city}: {summary}")
+
+
+if __name__ == '__main__':
+    main()
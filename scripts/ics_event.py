@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Compact event record shared by combine_ics.py and ics_to_json.py.
+
+An IcsEvent holds one VEVENT's inner content (without the BEGIN/END
+wrappers), its parse_properties() index, and, in the combine stage, its
+parsed DTSTART. Content is only changed through the methods below so the
+index never goes stale.
+
+combine_ics.py --records writes the final events' property indexes as a
+JSON Lines sidecar (write_records); ics_to_json.py reads it back
+(read_records) instead of re-reading and re-tokenizing combined.ics.
+"""
+
+import json
+import re
+
+from ics_props import parse_properties, prop_raw, prop_text
+
+# Bump when the sidecar line format changes.
+RECORDS_VERSION = 1
+
+
+class IcsEvent:
+    __slots__ = ('dtstart', 'content', 'props')
+
+    def __init__(self, dtstart, content, props=None):
+        self.dtstart = dtstart
+        self.content = content
+        self.props = parse_properties(content) if props is None else props
+
+    def field(self, name):
+        """Unescaped text value of a property (line folding handled)."""
+        return prop_text(self.props, name)
+
+    def raw(self, name):
+        """Raw (still escaped) value of a property."""
+        return prop_raw(self.props, name)
+
+    def prepend_property(self, name, value):
+        """Insert ``NAME:value`` as the first content line."""
+        self.content = f'{name}:{value}\r\n{self.content}'
+        self.props.setdefault(name, []).insert(0, ('', value))
+
+    def set_source(self, merged_source):
+        """Rewrite the X-SOURCE line(s) to merged_source."""
+        self.content = re.sub(
+            r'^X-SOURCE:[^\r\n]+',
+            f'X-SOURCE:{merged_source}',
+            self.content,
+            flags=re.MULTILINE
+        )
+        self.props = parse_properties(self.content)
+
+
+def write_records(path, events):
+    """Write events' property indexes as JSON Lines, in output order.
+
+    The first line is a header ({"version": N}); each following line is
+    one event's {NAME: [[params, value], ...]} index.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'version': RECORDS_VERSION}) + '\n')
+        for event in events:
+            f.write(json.dumps(event.props, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def read_records(path):
+    """Yield property indexes from a write_records() sidecar."""
+    with open(path, encoding='utf-8') as f:
+        header = json.loads(f.readline() or '{}')
+        if header.get('version') != RECORDS_VERSION:
+            raise ValueError(f"{path}: unsupported records version {header.get('version')!r}")
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
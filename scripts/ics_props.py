@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Single-pass tokenizer for ICS component content.
+
+parse_properties() walks VEVENT content once, unfolding continuation lines,
+and indexes every property by upper-cased name. Each entry keeps the raw
+parameter string and the raw (unfolded, still escaped) value, so callers
+read fields from the index instead of running one regex per field, while
+the original content string is left untouched and can be written back
+byte-for-byte.
+
+    props = parse_properties(content)
+    prop_text(props, 'SUMMARY')     # unescaped, stripped text value
+    prop_raw(props, 'DTSTART')      # raw value, e.g. "20250115T190000"
+    prop_params(props, 'DTSTART')   # raw params, e.g. "TZID=America/New_York"
+"""
+
+import re
+
+_LINE_RE = re.compile(r'\r\n|\r|\n')
+
+
+def _split_line(line):
+    """Split an unfolded content line into (NAME, params, value), or None.
+
+    The name ends at the first ';' or ':'; the value starts at the first ':'
+    outside a double-quoted parameter value (RFC 5545 allows ':' inside
+    quotes, e.g. ALTREP="https://...").
+    """
+    colon = line.find(':')
+    if colon <= 0:
+        return None
+    semi = line.find(';', 0, colon)
+    if semi < 0:
+        return line[:colon].upper(), '', line[colon + 1:]
+    if semi == 0:
+        return None
+    if '"' in line[semi:colon]:
+        in_quote = False
+        for i in range(semi, len(line)):
+            ch = line[i]
+            if ch == '"':
+                in_quote = not in_quote
+            elif ch == ':' and not in_quote:
+                colon = i
+                break
+        else:
+            return None
+    return line[:semi].upper(), line[semi + 1:colon], line[colon + 1:]
+
+
+def parse_properties(content):
+    """Tokenize component content into {NAME: [(params, raw_value), ...]}.
+
+    Entries for a name are in document order. Continuation lines (leading
+    space or tab) are unfolded into the preceding property; lines that are
+    not ``NAME[;params]:value`` are skipped.
+    """
+    props = {}
+    current = None  # [name, params, [value parts]]
+    for line in _LINE_RE.split(content):
+        if line[:1] in (' ', '\t'):
+            if current is not None:
+                current[2].append(line[1:])
+            continue
+        if current is not None:
+            props.setdefault(current[0], []).append((current[1], ''.join(current[2])))
+            current = None
+        if not line:
+            continue
+        split = _split_line(line)
+        if split is not None:
+            current = [split[0], split[1], [split[2]]]
+    if current is not None:
+        props.setdefault(current[0], []).append((current[1], ''.join(current[2])))
+    return props
+
+
+def unescape_text(value, newline=' '):
+    """Undo ICS TEXT escaping. ``\\n`` becomes ``newline``."""
+    return value.replace('\\n', newline).replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
+
+
+def prop_raw(props, name):
+    """Raw value of the first ``name`` property with a non-empty value, or None."""
+    for _params, value in props.get(name, ()):
+        if value:
+            return value
+    return None
+
+
+def prop_params(props, name):
+    """Raw parameter string of the first ``name`` property, or None."""
+    for params, value in props.get(name, ()):
+        if value:
+            return params
+    return None
+
+
+def prop_text(props, name, newline=' '):
+    """Unescaped, stripped text of the first ``name`` property, or None."""
+    value = prop_raw(props, name)
+    if value is None:
+        return None
+    return unescape_text(value, newline).strip()
@@ -4,14 +4,20 @@ Convert ICS calendar files to JSON format for Supabase ingestion.
 """
 
 import argparse
+import hashlib
 import json
 import re
 import sys
+from collections import defaultdict
 from datetime import datetime, timezone
 from html import unescape as html_unescape
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+from ics_event import read_records
+from ics_props import parse_properties, unescape_text
+from title_similarity import TitleSimilarity
+
 
 def strip_html_tags(text):
     """Remove HTML tags from text, preserving the text content."""
@@ -94,114 +100,104 @@ def is_all_day_event(raw_dt_str):
     return 'T' not in value and len(value) == 8 and value.isdigit()
 
 
-def unfold_ics_lines(content):
-    """Unfold ICS continuation lines (lines starting with space or tab)."""
-    # ICS spec: long lines are folded by inserting CRLF + space/tab
-    content = re.sub(r'\r?\n[ \t]', '', content)
-    return content
+_VEVENT_RE = re.compile(r'BEGIN:VEVENT\r?\n(.*?)\r?\nEND:VEVENT', re.DOTALL)
 
 
-def extract_field(event_content, field_name):
-    """Extract a field value from VEVENT content."""
-    # Match field with optional parameters: FIELD;PARAM=VALUE:content or FIELD:content
-    # Use word boundary or end-of-field-name to avoid X-SOURCE matching X-SOURCE-ID
-    pattern = rf'^{field_name}(?:;[^:]*)?:([^\r\n]*)'
-    match = re.search(pattern, event_content, re.IGNORECASE | re.MULTILINE)
-    if match:
-        value = match.group(1)
-        # Unescape ICS escapes
-        value = value.replace('\\n', '\n').replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
-        return value.strip()
-    return None
+def _first_prop(props, name):
+    """(params, raw value) of the first ``name`` property, or None."""
+    entries = props.get(name)
+    return entries[0] if entries else None
 
 
-def extract_raw_datetime(event_content, field_name):
-    """Extract a raw datetime property line including any TZID parameter.
+def props_field(props, field_name):
+    """Unescaped, stripped value of the first ``field_name`` property, or None.
 
-    Returns the full match (e.g. "DTSTART;TZID=America/New_York:20250115T190000")
-    so parse_ics_datetime can extract and use the TZID.
-    For bare properties (no params), returns just the value (e.g. "20250115T190000").
+    The first occurrence wins even if empty, and escaped newlines become
+    real ones.
     """
-    pattern = rf'^({field_name}(?:;[^:]*)?):([^\r\n]*)'
-    match = re.search(pattern, event_content, re.IGNORECASE | re.MULTILINE)
-    if match:
-        params = match.group(1)  # e.g. "DTSTART;TZID=America/New_York" or "DTSTART"
-        value = match.group(2).strip()
-        if ';' in params:
-            # Has parameters — return full line so parse_ics_datetime can extract TZID
-            return params + ':' + value
-        return value
+    entry = _first_prop(props, field_name)
+    if entry is None:
+        return None
+    return unescape_text(entry[1], newline='\n').strip()
+
+
+def props_raw_datetime(props, field_name):
+    """Raw datetime of the first ``field_name`` property, or None.
+
+    Returns the bare value (e.g. "20250115T190000"), or ``NAME;params:value``
+    when it has parameters so parse_ics_datetime can use the TZID.
+    """
+    entry = _first_prop(props, field_name)
+    if entry is None:
+        return None
+    params, value = entry
+    if params:
+        return f'{field_name};{params}:{value.strip()}'
+    return value.strip()
+
+
+def _bare_prop(props, name):
+    """First value of a parameterless ``name`` property (the ``^NAME:(.+)`` lines)."""
+    for params, value in props.get(name, ()):
+        if not params and value:
+            return value
     return None
 
 
-def extract_image_url(event_content):
-    """Extract first image URL from ATTACH or vendor image fields."""
-    # Match ATTACH with image FMTTYPE
-    pattern = r'^ATTACH;[^:]*FMTTYPE=image/[^:]*:(.+)'
-    match = re.search(pattern, event_content, re.IGNORECASE | re.MULTILINE)
-    if match:
-        return match.group(1).strip()
-    # Match Tockify featured image
-    pattern = r'^X-TKF-FEATURED-IMAGE:(.+)'
-    match = re.search(pattern, event_content, re.IGNORECASE | re.MULTILINE)
-    if match:
-        return match.group(1).strip()
-    # Match LiveWhale image (IU events) - unescape \, and request a larger size
-    pattern = r'^X-LIVEWHALE-IMAGE:(.+)'
-    match = re.search(pattern, event_content, re.IGNORECASE | re.MULTILINE)
-    if match:
-        url = match.group(1).strip().replace('\\,', ',')
-        # Replace thumbnail dimensions with a larger display size
-        url = re.sub(r'/width/\d+/height/\d+/', '/width/400/height/300/', url)
-        return url
-    # Match RFC 7986 IMAGE field (e.g. Skedda/Aqus events)
-    # Prefer FULLSIZE, accept any display type
-    for display in ('fullsize', 'badge', 'thumbnail', ''):
-        pat = rf'^IMAGE;[^:]*DISPLAY={display}[^:]*:(https?://.+)' if display else r'^IMAGE;[^:]*:(https?://.+)'
-        match = re.search(pat, event_content, re.IGNORECASE | re.MULTILINE)
-        if match:
-            return match.group(1).strip()
-    # Match WordPress X-WP-IMAGES-URL (format: size\;url\;w\;h\,...,size\;url\;...)
-    pattern = r'^X-WP-IMAGES-URL:(.+)'
-    match = re.search(pattern, event_content, re.IGNORECASE | re.MULTILINE)
-    if match:
-        raw = match.group(1).strip()
-        # Parse comma-separated entries: size\;url\;w\;h
-        for size in ('large', 'full', 'medium'):
-            m = re.search(rf'(?:^|,){size}\\;(https?://[^\\,]+)', raw, re.IGNORECASE)
+_HTTP_RE = re.compile(r'https?://.', re.IGNORECASE)
+_LIVEWHALE_SIZE_RE = re.compile(r'/width/\d+/height/\d+/')
+_WP_IMAGE_RES = [
+    re.compile(rf'(?:^|,){size}\\;(https?://[^\\,]+)', re.IGNORECASE)
+    for size in ('large', 'full', 'medium')
+]
+
+
+def props_image_url(props):
+    """First image URL from ATTACH or vendor image properties.
+
+    Precedence: ATTACH with an image FMTTYPE, Tockify featured image,
+    LiveWhale (IU; unescaped, resized to 400x300), RFC 7986 IMAGE
+    (fullsize > badge > thumbnail > any), WordPress X-WP-IMAGES-URL
+    (large > full > medium), Bedework (Duke; relative to calendar.duke.edu).
+    """
+    for params, value in props.get('ATTACH', ()):
+        if value and ':' not in params and 'FMTTYPE=IMAGE/' in params.upper():
+            return value.strip()
+    value = _bare_prop(props, 'X-TKF-FEATURED-IMAGE')
+    if value:
+        return value.strip()
+    value = _bare_prop(props, 'X-LIVEWHALE-IMAGE')
+    if value:
+        url = value.strip().replace('\\,', ',')
+        return _LIVEWHALE_SIZE_RE.sub('/width/400/height/300/', url)
+    images = [(params.upper(), value) for params, value in props.get('IMAGE', ())
+              if params and ':' not in params and _HTTP_RE.match(value)]
+    for display in ('DISPLAY=FULLSIZE', 'DISPLAY=BADGE', 'DISPLAY=THUMBNAIL', ''):
+        for params, value in images:
+            if display in params:
+                return value.strip()
+    value = _bare_prop(props, 'X-WP-IMAGES-URL')
+    if value:
+        raw = value.strip()
+        for size_re in _WP_IMAGE_RES:
+            m = size_re.search(raw)
             if m:
                 return m.group(1)
-    # Match Bedework image (Duke) - relative URL, base is calendar.duke.edu
-    pattern = r'^X-BEDEWORK-IMAGE:(/public/Images/.+)'
-    match = re.search(pattern, event_content, re.IGNORECASE | re.MULTILINE)
-    if match:
-        return 'https://calendar.duke.edu' + match.group(1).strip()
+    value = _bare_prop(props, 'X-BEDEWORK-IMAGE')
+    if value and len(value) > 15 and value[:15].lower() == '/public/images/':
+        return 'https://calendar.duke.edu' + value.strip()
     return None
 
 
+# Shared by every call in this process so titles are profiled once
+_title_similarity = TitleSimilarity()
+
+
 def token_set_similarity(a, b):
     """Compare word sets, ignore order. Returns 0-1.
     'Family Storytime' vs 'Bilingual Family Storytime' scores high because
-    the shared words dominate. Uses overlap/min-size ratio."""
-    from difflib import SequenceMatcher as SM
-    words_a = set(a.lower().split())
-    words_b = set(b.lower().split())
-    if not words_a and not words_b:
-        return 1.0
-    if not words_a or not words_b:
-        return 0.0
-    intersection = words_a & words_b
-    sorted_inter = ' '.join(sorted(intersection))
-    remaining_a = ' '.join(sorted(words_a - intersection))
-    remaining_b = ' '.join(sorted(words_b - intersection))
-    combined_a = (sorted_inter + ' ' + remaining_a).strip()
-    combined_b = (sorted_inter + ' ' + remaining_b).strip()
-    ratios = [
-        SM(None, sorted_inter, combined_a).ratio() if combined_a else 1.0,
-        SM(None, sorted_inter, combined_b).ratio() if combined_b else 1.0,
-        SM(None, combined_a, combined_b).ratio(),
-    ]
-    return max(ratios)
+    the shared words dominate. See title_similarity.TitleSimilarity."""
+    return _title_similarity.score(a, b)
 
 
 def cluster_by_title_similarity(events, threshold=0.85):
@@ -225,8 +221,6 @@ def cluster_by_title_similarity(events, threshold=0.85):
 
     Threshold of 0.85 cleanly separates the two groups.
     """
-    from collections import defaultdict
-
     # Group by timeslot
     slots = defaultdict(list)
     slot_order = []
@@ -253,18 +247,25 @@ def cluster_by_title_similarity(events, threshold=0.85):
         def union(a, b):
             parent[find(a)] = find(b)
 
-        for i in range(len(group)):
-            for j in range(i + 1, len(group)):
-                ta = group[i].get('title', '')
-                tb = group[j].get('title', '')
-                if not ta or not tb or token_set_similarity(ta, tb) < threshold:
+        # Only candidate pairs whose upper bound reaches the threshold get an
+        # exact score; the clusters are the connected components, so pairs
+        # can be checked in any order.
+        titles = [e.get('title', '') for e in group]
+        candidates = defaultdict(list)
+        for i, j in _title_similarity.candidate_pairs(titles, threshold):
+            # Don't cluster events at different locations
+            la = group[i].get('location', '') or ''
+            lb = group[j].get('location', '') or ''
+            if la and lb and la != lb:
+                continue
+            candidates[i].append(j)
+        for i, js in candidates.items():
+            bounds = _title_similarity.bounds(titles[i], [titles[j] for j in js])
+            for j, bound in zip(js, bounds):
+                if bound < threshold or find(i) == find(j):
                     continue
-                # Don't cluster events at different locations
-                la = group[i].get('location', '') or ''
-                lb = group[j].get('location', '') or ''
-                if la and lb and la != lb:
-                    continue
-                union(i, j)
+                if token_set_similarity(titles[i], titles[j]) >= threshold:
+                    union(i, j)
 
         clusters = defaultdict(list)
         for i in range(len(group)):
@@ -287,112 +288,267 @@ def cluster_by_title_similarity(events, threshold=0.85):
     return result
 
 
-def ics_to_json(ics_file, output_file=None, future_only=True, city=None):
-    """Convert an ICS file to JSON format for Supabase."""
-    local_tz = load_city_timezone(city)
-    content = Path(ics_file).read_text(encoding='utf-8', errors='ignore')
+# Per-event raw fields read by build_event(), from either input.
+def props_fields(props):
+    """Raw fields from one event's parse_properties() index."""
+    return {
+        'summary': props_field(props, 'SUMMARY'),
+        'dtstart': props_raw_datetime(props, 'DTSTART'),
+        'dtend': props_raw_datetime(props, 'DTEND'),
+        'location': props_field(props, 'LOCATION'),
+        'description': props_field(props, 'DESCRIPTION'),
+        'url': props_field(props, 'URL') or props_field(props, 'X-SOURCE-URL'),
+        'source': props_field(props, 'X-SOURCE'),
+        'source_id': props_field(props, 'X-SOURCE-ID'),
+        'source_urls': props_field(props, 'X-SOURCE-URLS'),
+        'uid': props_field(props, 'UID'),
+        'image_url': props_image_url(props),
+        'categories': props_field(props, 'CATEGORIES'),
+    }
+
+
+def build_event(fields, local_tz, city, now=None):
+    """Build one events.json row from raw fields, or None to skip it.
+
+    Events without a title or parseable start are skipped, as are events
+    starting before ``now`` when it is given.
+    """
+    title = strip_html_tags(html_unescape(fields['summary'] or ''))
+    raw_dtstart = fields['dtstart']
+    start_time = parse_ics_datetime(raw_dtstart, local_tz)
+    end_time = parse_ics_datetime(fields['dtend'], local_tz)
+    all_day = is_all_day_event(raw_dtstart)
+    location = strip_html_tags(html_unescape(fields['location'] or ''))
+    description = strip_html_tags(html_unescape(fields['description'] or ''))
+
+    # Extract ICS CATEGORIES (raw tags for LLM classification)
+    ics_cats_raw = fields['categories']
+    ics_categories = [c.strip() for c in ics_cats_raw.split(',')] if ics_cats_raw else []
+
+    # Skip if no title or start time
+    if not title or not start_time:
+        return None
 
-    # Unfold continuation lines
-    content = unfold_ics_lines(content)
+    # Filter to future events if requested
+    if now is not None and start_time:
+        try:
+            event_dt = datetime.fromisoformat(start_time)
+            if event_dt.tzinfo is None:
+                event_dt = event_dt.replace(tzinfo=timezone.utc)
+            if event_dt < now:
+                return None
+        except ValueError:
+            pass
+
+    source_urls = {}
+    if fields['source_urls']:
+        try:
+            source_urls = json.loads(fields['source_urls'])
+        except json.JSONDecodeError:
+            pass
+
+    return {
+        'title': title,
+        'start_time': start_time,
+        'end_time': end_time,
+        'location': location or '',
+        'description': description or '',
+        'url': fields['url'] or '',
+        'city': city or '',
+        'source': fields['source'] or '',
+        'source_id': fields['source_id'] or '',
+        'source_uid': fields['uid'] or '',
+        'source_urls': source_urls if source_urls else None,
+        'cluster_id': None,
+        'ics_categories': ics_categories if ics_categories else None,
+        'image_url': fields['image_url'],
+        'all_day': all_day
+    }
+
+
+OUTPUT_FORMATS = ('pretty', 'compact', 'ndjson')
+
+
+def _dumps_events(events, output_format):
+    if output_format == 'compact':
+        return json.dumps(events, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(events, indent=2, ensure_ascii=False)
+
+
+class _HashingWriter:
+    """File wrapper that hashes the UTF-8 bytes written through it."""
+
+    def __init__(self, f):
+        self.f = f
+        self.sha256 = hashlib.sha256()
+
+    def write(self, text):
+        self.f.write(text)
+        self.sha256.update(text.encode('utf-8'))
+
+
+def write_events(events, output_file, output_format='pretty'):
+    """Write events to output_file and return the sha256 of the bytes written.
+
+    pretty (the default) and compact are a JSON array, streamed to the file
+    by json.dump rather than built as one string; ndjson is one event object
+    per line.
+    """
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        out = _HashingWriter(f)
+        if output_format == 'ndjson':
+            for event in events:
+                out.write(json.dumps(event, ensure_ascii=False) + '\n')
+        elif output_format == 'compact':
+            json.dump(events, out, ensure_ascii=False, separators=(',', ':'))
+        else:
+            json.dump(events, out, indent=2, ensure_ascii=False)
+    return out.sha256.hexdigest()
+
+
+def _skip_space(f, buf, pos, chunk_size):
+    """Advance past whitespace, reading more of f as needed. Returns (buf, pos)."""
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n':
+            pos += 1
+        if pos < len(buf):
+            return buf, pos
+        more = f.read(chunk_size)
+        if not more:
+            return buf, pos
+        buf, pos = more, 0
+
+
+def iter_events(events_file, chunk_size=1 << 16):
+    """Yield events from an events file without loading the whole document.
+
+    Reads any write_events() format: a JSON array (pretty or compact) is
+    decoded one element at a time from buffered chunks; anything else is
+    read as NDJSON.
+    """
+    decoder = json.JSONDecoder()
+    with open(events_file, encoding='utf-8') as f:
+        buf, pos = _skip_space(f, f.read(chunk_size), 0, chunk_size)
+        if buf[pos:pos + 1] != '[':
+            f.seek(0)
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        pos += 1
+        while True:
+            buf, pos = _skip_space(f, buf, pos, chunk_size)
+            if pos >= len(buf):
+                raise ValueError(f'{events_file}: unterminated JSON array')
+            if buf[pos] == ']':
+                return
+            while True:
+                try:
+                    event, pos = decoder.raw_decode(buf, pos)
+                    break
+                except json.JSONDecodeError:
+                    # Element runs past the buffer: keep the tail and read more
+                    more = f.read(chunk_size)
+                    if not more:
+                        raise
+                    buf, pos = buf[pos:] + more, 0
+            yield event
+            buf, pos = _skip_space(f, buf, pos, chunk_size)
+            if buf[pos:pos + 1] == ',':
+                pos += 1
+
+
+def event_hash(event, exclude=()):
+    """Stable content hash of an event, ignoring the fields in exclude."""
+    fields = {k: v for k, v in event.items() if k not in exclude}
+    text = json.dumps(fields, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def read_events_meta(events_file):
+    """The events.meta.json sidecar for events_file, or None if missing."""
+    try:
+        return json.loads(events_meta_path(events_file).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def events_meta_path(events_file):
+    """Sidecar path for an events file: events.json -> events.meta.json."""
+    path = Path(events_file)
+    return path.with_name(path.stem + '.meta.json')
+
+
+def write_events_meta(events_file, events, digest, output_format='pretty'):
+    """Write event counts and the content hash next to events_file.
+
+    Later steps can read counts from here instead of loading the whole
+    document; a sha256 that no longer matches the file means the sidecar
+    is stale.
+    """
+    meta = {
+        'count': len(events),
+        'clusters': len({e['cluster_id'] for e in events if e.get('cluster_id') is not None}),
+        'format': output_format,
+        'sha256': digest,
+    }
+    events_meta_path(events_file).write_text(json.dumps(meta, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+
+
+def ics_to_json(ics_file, output_file=None, future_only=True, city=None, output_format='pretty'):
+    """Convert an ICS file to JSON format for Supabase.
+
+    ics_file may also be a combine_ics.py --records sidecar (.jsonl), which
+    is read directly instead of re-parsing the calendar text. With an
+    output_file, an events.meta.json sidecar (see write_events_meta) is
+    written next to it.
+    """
+    local_tz = load_city_timezone(city)
 
-    events = []
     # Use 24 hours ago to avoid filtering out same-day events due to timezone differences
     from datetime import timedelta
-    now = datetime.now(timezone.utc) - timedelta(hours=24)
-
-    # Extract all VEVENT blocks
-    pattern = r'BEGIN:VEVENT\r?\n(.*?)\r?\nEND:VEVENT'
-    matches = re.findall(pattern, content, re.DOTALL)
-
-    for event_content in matches:
-        # Extract fields
-        title = strip_html_tags(html_unescape(extract_field(event_content, 'SUMMARY') or ''))
-        raw_dtstart = extract_raw_datetime(event_content, 'DTSTART')
-        start_time = parse_ics_datetime(raw_dtstart, local_tz)
-        end_time = parse_ics_datetime(extract_raw_datetime(event_content, 'DTEND'), local_tz)
-        all_day = is_all_day_event(raw_dtstart)
-        location = strip_html_tags(html_unescape(extract_field(event_content, 'LOCATION') or ''))
-        description = strip_html_tags(html_unescape(extract_field(event_content, 'DESCRIPTION') or ''))
-        url = extract_field(event_content, 'URL')
-        if not url:
-            url = extract_field(event_content, 'X-SOURCE-URL')
-        source = extract_field(event_content, 'X-SOURCE')
-        source_id = extract_field(event_content, 'X-SOURCE-ID')
-        source_urls_raw = extract_field(event_content, 'X-SOURCE-URLS')
-        uid = extract_field(event_content, 'UID')
-
-        # Extract image URL from ATTACH or X-TKF-FEATURED-IMAGE
-        image_url = extract_image_url(event_content)
-
-        # Extract ICS CATEGORIES (raw tags for LLM classification)
-        ics_cats_raw = extract_field(event_content, 'CATEGORIES')
-        ics_categories = [c.strip() for c in ics_cats_raw.split(',')] if ics_cats_raw else []
-
-        # Skip if no title or start time
-        if not title or not start_time:
-            continue
-
-        # Filter to future events if requested
-        if future_only and start_time:
-            try:
-                event_dt = datetime.fromisoformat(start_time)
-                if event_dt.tzinfo is None:
-                    event_dt = event_dt.replace(tzinfo=timezone.utc)
-                if event_dt < now:
-                    continue
-            except ValueError:
-                pass
+    now = datetime.now(timezone.utc) - timedelta(hours=24) if future_only else None
 
+    if Path(ics_file).suffix == '.jsonl':
+        all_props = read_records(ics_file)
+    else:
+        content = Path(ics_file).read_text(encoding='utf-8', errors='ignore')
+        # One tokenizer pass per VEVENT block; it also unfolds continuation lines
+        all_props = (parse_properties(m) for m in _VEVENT_RE.findall(content))
 
-        source_urls = {}
-        if source_urls_raw:
-            try:
-                source_urls = json.loads(source_urls_raw)
-            except json.JSONDecodeError:
-                pass
-
-        event = {
-            'title': title,
-            'start_time': start_time,
-            'end_time': end_time,
-            'location': location or '',
-            'description': description or '',
-            'url': url or '',
-            'city': city or '',
-            'source': source or '',
-            'source_id': source_id or '',
-            'source_uid': uid or '',
-            'source_urls': source_urls if source_urls else None,
-            'cluster_id': None,
-            'ics_categories': ics_categories if ics_categories else None,
-            'image_url': image_url,
-            'all_day': all_day
-        }
-        events.append(event)
+    events = []
+    for props in all_props:
+        event = build_event(props_fields(props), local_tz, city, now)
+        if event is not None:
+            events.append(event)
 
     # Sort by start time, then cluster similar titles within each timeslot
     events.sort(key=lambda x: x['start_time'] or '')
     events = cluster_by_title_similarity(events)
 
     # Output
-    json_output = json.dumps(events, indent=2, ensure_ascii=False)
-
     if output_file:
-        Path(output_file).write_text(json_output, encoding='utf-8')
+        digest = write_events(events, output_file, output_format)
+        write_events_meta(output_file, events, digest, output_format)
         print(f"Converted {len(events)} events to {output_file}")
+    elif output_format == 'ndjson':
+        for event in events:
+            print(json.dumps(event, ensure_ascii=False))
     else:
-        print(json_output)
+        print(_dumps_events(events, output_format))
 
     return events
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description='Convert ICS to JSON for Supabase')
-    parser.add_argument('input', help='Input ICS file')
+    parser.add_argument('input', help='Input ICS file, or a combine_ics.py --records sidecar (.jsonl)')
     parser.add_argument('-o', '--output', help='Output JSON file (stdout if not specified)')
     parser.add_argument('--city', help='City name (e.g., santarosa, sebastopol)')
     parser.add_argument('--all', action='store_true', help='Include past events (default: future only)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='pretty',
+                        help='pretty (indented JSON array, default), compact (JSON array), or ndjson (one event per line)')
 
     args = parser.parse_args()
 
-    ics_to_json(args.input, args.output, future_only=not args.all, city=args.city)
+    ics_to_json(args.input, args.output, future_only=not args.all, city=args.city, output_format=args.format)
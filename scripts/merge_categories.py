@@ -5,49 +5,108 @@ Carry forward categories from a previous events.json into a freshly generated on
 Matches events by source_uid. Only copies the category field — all other fields
 come from the fresh file (which has the latest event data from ICS).
 
+The previous file is streamed into a source_uid -> (category, content hash)
+index rather than loaded whole. The current file is only rewritten (in its
+own format, refreshing events.meta.json) when a category was carried.
+Comparing content hashes also tells which events are new, changed or
+removed since the previous build; --delta writes that as JSON.
+
 Usage:
     python scripts/merge_categories.py cities/toronto/events.prev.json cities/toronto/events.json
+    python scripts/merge_categories.py prev.json events.json --delta cities/toronto/events.delta.json
 """
 
+import argparse
 import json
-import sys
-
 
-def main():
-    if len(sys.argv) != 3:
-        print("Usage: merge_categories.py <prev.json> <current.json>", file=sys.stderr)
-        sys.exit(1)
+from ics_to_json import event_hash, iter_events, read_events_meta, write_events, write_events_meta
 
-    prev_path, current_path = sys.argv[1], sys.argv[2]
+# category is carried forward, not part of an event's content
+HASH_EXCLUDE = ('category',)
 
-    with open(prev_path) as f:
-        prev_events = json.load(f)
 
-    with open(current_path) as f:
-        current_events = json.load(f)
+def index_events(events_file):
+    """Stream an events file into {source_uid: (category, content hash)}.
 
-    # Build lookup from previous categories
-    prev_categories = {}
-    for e in prev_events:
+    For a repeated source_uid the last event's hash wins, and the last
+    non-empty category.
+    """
+    index = {}
+    for e in iter_events(events_file):
         uid = e.get("source_uid")
-        cat = e.get("category")
-        if uid and cat:
-            prev_categories[uid] = cat
+        if not uid:
+            continue
+        cat = e.get("category") or (index[uid][0] if uid in index else None)
+        index[uid] = (cat, event_hash(e, HASH_EXCLUDE))
+    return index
+
+
+def merge_categories(prev_path, current_path):
+    """Carry categories from prev_path into current_path.
+
+    Returns (carried, delta) where delta lists source_uids that are new,
+    changed or removed relative to the previous file.
+    """
+    prev_index = index_events(prev_path)
+
+    current_events = list(iter_events(current_path))
 
     # Apply to current events
     carried = 0
+    new, changed, seen = [], [], set()
+    unchanged = without_uid = 0
     for e in current_events:
         uid = e.get("source_uid")
-        if uid and uid in prev_categories and not e.get("category"):
-            e["category"] = prev_categories[uid]
+        if not uid:
+            without_uid += 1
+            continue
+        prev = prev_index.get(uid)
+        if prev and prev[0] and not e.get("category"):
+            e["category"] = prev[0]
             carried += 1
+        if uid in seen:
+            continue
+        seen.add(uid)
+        if prev is None:
+            new.append(uid)
+        elif prev[1] != event_hash(e, HASH_EXCLUDE):
+            changed.append(uid)
+        else:
+            unchanged += 1
 
-    with open(current_path, 'w') as f:
-        json.dump(current_events, f, ensure_ascii=False)
+    if carried:
+        meta = read_events_meta(current_path) or {}
+        output_format = meta.get('format', 'compact')
+        digest = write_events(current_events, current_path, output_format)
+        write_events_meta(current_path, current_events, digest, output_format)
 
+    delta = {
+        'new': new,
+        'changed': changed,
+        'removed': [uid for uid in prev_index if uid not in seen],
+        'unchanged': unchanged,
+        'without_uid': without_uid,
+    }
     total = len(current_events)
     uncategorized = sum(1 for e in current_events if not e.get("category"))
     print(f"  Merged categories: {carried} carried forward, {uncategorized} new (of {total} total)")
+    return carried, delta
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Carry forward categories from a previous events.json')
+    parser.add_argument('prev', help='Previous events.json (e.g. from the archive branch)')
+    parser.add_argument('current', help='Freshly generated events.json, updated in place')
+    parser.add_argument('--delta', help='Write new/changed/removed source_uids to this JSON file')
+    args = parser.parse_args()
+
+    carried, delta = merge_categories(args.prev, args.current)
+    print(f"  Delta vs previous: {len(delta['new'])} new, {len(delta['changed'])} changed, "
+          f"{len(delta['removed'])} removed, {delta['unchanged']} unchanged"
+          + ("" if carried else " (events.json unchanged, not rewritten)"))
+    if args.delta:
+        with open(args.delta, 'w', encoding='utf-8') as f:
+            json.dump(delta, f, indent=2, ensure_ascii=False)
 
 
 if __name__ == "__main__":
@@ -6,17 +6,41 @@ Fetches unclassified events from Supabase, classifies via local Ollama,
 and updates the category in Supabase. Curator overrides from the
 category_overrides table are used as few-shot examples and never overwritten.
 
+Events are deduplicated by title (recurring instances are classified once)
+and sent --batch-size at a time, as one numbered prompt answered with a
+JSON object. Up to --parallel batches are in flight at once. Requests go
+over a shared pool of idle HTTP/1.1 keep-alive connections to Ollama (at
+most one per concurrent request), and ask Ollama to keep the model loaded
+between them. Ollama serves OLLAMA_NUM_PARALLEL requests per model at
+once; more queue on the server. --batch-size 1 uses the original one-event
+prompt. Event lines and title grouping come from classify_prompt.py, shared
+with the Anthropic classifiers.
+
 Usage:
     python3 scripts/ollama_classify.py --limit 100 --city santarosa
     python3 scripts/ollama_classify.py --limit 50 --city santarosa --model llama3.2:3b
+    python3 scripts/ollama_classify.py --limit 2000 --city toronto --batch-size 25 --parallel 4
 """
 
 import argparse
+import http.client
 import json
 import os
 import sys
+import threading
 import urllib.request
 import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from classify_prompt import (
+    CATEGORIES,
+    VALID_CATEGORIES,
+    category_list,
+    format_event_lines,
+    group_by_title,
+    title_updates,
+)
 
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
@@ -25,11 +49,10 @@ if not SUPABASE_URL or not SUPABASE_KEY:
     sys.exit(1)
 OLLAMA_URL = "http://localhost:11434"
 
-CATEGORIES_FILE = os.path.join(os.path.dirname(__file__), '..', 'categories.json')
-with open(CATEGORIES_FILE) as f:
-    CATEGORIES = [c['name'] for c in json.load(f)]
-
-VALID_CATEGORIES = set(CATEGORIES)
+BATCH_SIZE = 20  # Events per prompt; small models lose track in longer lists
+PARALLEL = 2  # Batches in flight at once
+KEEP_ALIVE = "10m"  # How long Ollama keeps the model loaded after a request
+REQUEST_TIMEOUT = 300  # A batch takes far longer than one event
 
 
 def supabase_get(path):
@@ -112,7 +135,89 @@ def build_few_shot(overrides):
     return "\n".join(lines) if len(lines) > 1 else ""
 
 
-def classify_one(event, few_shot, model):
+class OllamaClient:
+    """A pool of persistent HTTP/1.1 connections to the Ollama server.
+
+    Each request borrows an idle connection (or opens one) and returns it
+    afterwards, so the pool holds as many connections as there were
+    concurrent requests and later requests reuse them. A connection the server has dropped while
+    idle is replaced with a fresh one and the request sent again.
+    """
+
+    def __init__(self, base_url=OLLAMA_URL, timeout=REQUEST_TIMEOUT):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._idle = []
+
+    def _connect(self):
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def request(self, method, path, payload=None):
+        """Send a request and return the decoded JSON response."""
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+        with self._lock:
+            conn = self._idle.pop() if self._idle else self._connect()
+        for attempt in range(2):
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+                break
+            except TimeoutError:
+                conn.close()
+                raise
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if attempt:
+                    raise
+                conn = self._connect()
+        with self._lock:
+            self._idle.append(conn)
+        if resp.status != 200:
+            raise RuntimeError(f"Ollama returned HTTP {resp.status}: {data[:200]!r}")
+        return json.loads(data)
+
+    def generate(self, model, prompt, json_format=False):
+        """The model's response text for a prompt, via /api/generate."""
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": KEEP_ALIVE,
+            "options": {"temperature": 0.1},
+        }
+        if json_format:
+            payload["format"] = "json"
+        return self.request("POST", "/api/generate", payload).get("response", "")
+
+    def close(self):
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle = []
+
+
+def match_category(raw):
+    """The category a model answer names, or None (warning on unexpected answers)."""
+    # Clean up: model may add quotes, periods, etc.
+    cleaned = str(raw).strip('"\'.\n ')
+    if cleaned in VALID_CATEGORIES:
+        return cleaned
+    # Try partial match
+    for cat in CATEGORIES:
+        if cat.lower() in cleaned.lower():
+            return cat
+    if cleaned.lower() in ("null", "none", ""):
+        return None
+    print(f"  WARNING: unexpected response '{raw}', skipping", file=sys.stderr)
+    return None
+
+
+def classify_one(event, few_shot, model, client):
     """Classify a single event via Ollama."""
     title = event.get("title", "")
     location = event.get("location", "")
@@ -127,7 +232,7 @@ def classify_one(event, few_shot, model):
             ics_line = f"\nThe event's ICS feed tagged it as: {ics_cats}\nWeigh the ICS tags heavily but use your judgment — they can be wrong."
 
     prompt = f"""Classify this event into exactly one category. Categories:
-{chr(10).join('- ' + c for c in CATEGORIES)}
+{category_list()}
 {few_shot}
 {ics_line}
 
@@ -137,34 +242,89 @@ Description: {description}
 
 Respond with ONLY the category name, nothing else. If none fit, respond with "null"."""
 
-    body = json.dumps({
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-        "options": {"temperature": 0.1},
-    }).encode()
-
-    req = urllib.request.Request(
-        OLLAMA_URL + "/api/generate",
-        data=body,
-        headers={"Content-Type": "application/json"},
-    )
-    with urllib.request.urlopen(req, timeout=60) as resp:
-        result = json.loads(resp.read())
+    return match_category(client.generate(model, prompt).strip())
 
-    raw = result.get("response", "").strip()
-    # Clean up: model may add quotes, periods, etc.
-    cleaned = raw.strip('"\'.\n ')
-    if cleaned in VALID_CATEGORIES:
-        return cleaned
-    # Try partial match
-    for cat in CATEGORIES:
-        if cat.lower() in cleaned.lower():
-            return cat
-    if cleaned.lower() == "null" or cleaned.lower() == "none":
-        return None
-    print(f"  WARNING: unexpected response '{raw}', skipping", file=sys.stderr)
-    return None
+
+def classify_batch(events, few_shot, model, client):
+    """Classify a batch of events in one prompt. Returns list of (event, category)."""
+    prompt = f"""Classify each event into exactly one category. Categories:
+{category_list()}
+{few_shot}
+
+Events to classify:
+
+{format_event_lines(events)}
+
+ICS tags come from the event's own feed: weigh them heavily but use your judgment — they can be wrong.
+
+Respond with ONLY a JSON object mapping each event number to its exact category name, or null if none fit. Example: {{"1": "Music / Concerts", "2": null}}"""
+
+    raw = client.generate(model, prompt, json_format=True)
+    try:
+        answer = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        print(f"  WARNING: JSON parse error: {exc}", file=sys.stderr)
+        return [(e, None) for e in events]
+
+    # Small models sometimes wrap the answer: {"results": [{"index": 1, "category": ...}]}
+    if isinstance(answer, dict) and len(answer) == 1 and isinstance(next(iter(answer.values())), list):
+        answer = next(iter(answer.values()))
+    if isinstance(answer, list):
+        answer = {str(item.get("index")): item.get("category") for item in answer if isinstance(item, dict)}
+    if not isinstance(answer, dict):
+        print(f"  WARNING: no JSON object in response: {raw[:200]}", file=sys.stderr)
+        return [(e, None) for e in events]
+
+    results = []
+    for i, event in enumerate(events):
+        cat = answer.get(str(i + 1))
+        results.append((event, match_category(cat) if cat else None))
+    return results
+
+
+def classify_events(events, few_shot, model, client, batch_size=BATCH_SIZE, parallel=PARALLEL):
+    """Classify events, one per title, in parallel batches.
+
+    Returns (results, updates): (representative event, category) pairs in
+    input order, and (event id, category) for every event sharing a
+    classified title.
+    """
+    # Group by title to avoid re-classifying recurring event instances
+    title_groups = group_by_title(events)
+    representative_events = [group[0] for group in title_groups.values()]
+    if len(representative_events) < len(events):
+        print(f"  {len(representative_events)} unique titles (deduplicated from {len(events)} events)")
+
+    batch_size = max(1, batch_size)
+    batches = [
+        representative_events[i:i + batch_size]
+        for i in range(0, len(representative_events), batch_size)
+    ]
+
+    def run(numbered):
+        batch_num, batch = numbered
+        try:
+            if batch_size == 1:
+                results = [(batch[0], classify_one(batch[0], few_shot, model, client))]
+            else:
+                results = classify_batch(batch, few_shot, model, client)
+        except Exception as e:
+            print(f"  ERROR in batch {batch_num}: {e}", file=sys.stderr)
+            results = [(event, None) for event in batch]
+        return results
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, parallel)) as pool:
+        # map() yields in batch order, so output reads as a sequential run would
+        for batch_num, batch_results in enumerate(pool.map(run, enumerate(batches, 1)), 1):
+            print(f"  Batch {batch_num}/{len(batches)} ({len(batch_results)} events)")
+            for event, category in batch_results:
+                print(f"    {event.get('title', '')[:60]} → {category or '(none)'}")
+            sys.stdout.flush()
+            results.extend(batch_results)
+
+    # Fan out classifications to all events sharing each title
+    return results, title_updates(results, title_groups)
 
 
 def main():
@@ -173,13 +333,17 @@ def main():
     parser.add_argument("--city", default="santarosa", help="City to classify")
     parser.add_argument("--model", default="llama3.2:3b", help="Ollama model to use")
     parser.add_argument("--dry-run", action="store_true", help="Print results without updating DB")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help=f"Events per prompt; 1 for one prompt per event (default: {BATCH_SIZE})")
+    parser.add_argument("--parallel", type=int, default=PARALLEL,
+                        help=f"Batches in flight at once (default: {PARALLEL})")
     args = parser.parse_args()
 
+    client = OllamaClient()
+
     # Check Ollama is running
     try:
-        req = urllib.request.Request(OLLAMA_URL + "/api/tags")
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            pass
+        client.request("GET", "/api/tags")
     except Exception as e:
         print(f"ERROR: Cannot connect to Ollama at {OLLAMA_URL}: {e}", file=sys.stderr)
         print("Start it with: ollama serve", file=sys.stderr)
@@ -206,25 +370,21 @@ def main():
         print("Nothing to classify.")
         return
 
-    # Classify each event
-    results = []
-    updates = []
-    for i, event in enumerate(events):
-        title = event.get("title", "")[:60]
-        print(f"  [{i+1}/{len(events)}] {title}...", end=" ", flush=True)
-        category = classify_one(event, few_shot, args.model)
-        print(f"→ {category or '(none)'}")
-        results.append((event, category))
-        if category:
-            updates.append((event["id"], category))
+    try:
+        results, updates = classify_events(
+            events, few_shot, args.model, client, args.batch_size, args.parallel)
+    finally:
+        client.close()
 
     # Batch update DB unless dry-run
     if not args.dry_run and updates:
         batch_update_categories(updates)
+    elif args.dry_run:
+        print(f"\n  DRY RUN: would update {len(updates)} events")
 
     # Summary
     print("\n--- Summary ---")
-    from collections import Counter
+    print(f"  {len(results)} unique titles classified → {len(updates)} total events to update")
     cats = Counter(cat for _, cat in results)
     for cat, count in cats.most_common():
         print(f"  {count:4d}  {cat or '(none)'}")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Rule-based pre-classification, run before events are sent to the LLM.
+
+Many events can be categorized locally and deterministically: a MaxPreps
+feed is always high school sports, a Legistar feed is always government
+meetings, an ICS tag of "Music" means Music / Concerts. PreClassifier
+resolves those, and classify_events_json.py only sends what is left to
+the API.
+
+Rules, in order of precedence (the first kind that resolves wins):
+
+  override      curator overrides: an event whose normalized title and
+                location match an override gets the override's category
+  source        regex searched in the event's source name, feed id
+                (source_id, the .ics filename) and URL host
+  ics_category  regex matched against each ICS tag; the category names and
+                their " / " parts in categories.json are rules of their own
+  title         regex searched in the title
+
+source, ics_category and title rules live in classification_rules.json at
+the repo root. Within a kind, an event resolves only if every matching
+rule agrees on the category; conflicting matches fall through to the next
+kind, and finally to the API.
+
+Usage (report only; classify_events_json.py applies the rules):
+    python3 scripts/preclassify.py cities/*/events.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlparse
+
+from ics_to_json import iter_events
+
+ROOT = Path(__file__).resolve().parent.parent
+RULES_FILE = ROOT / "classification_rules.json"
+CATEGORIES_FILE = ROOT / "categories.json"
+RULE_KINDS = ("source", "ics_category", "title")
+
+
+def _normalize(value):
+    return " ".join(unicodedata.normalize("NFKC", value or "").casefold().split())
+
+
+class Rule:
+    """A regex on one part of an event that implies a category."""
+
+    def __init__(self, kind, pattern, category):
+        self.kind = kind
+        self.pattern = pattern
+        self.category = category
+        self.regex = re.compile(pattern, re.IGNORECASE)
+
+    @property
+    def name(self):
+        return f"{self.kind}:{self.pattern}"
+
+    def matches(self, event):
+        if self.kind == "source":
+            return bool(self.regex.search(_source_text(event)))
+        if self.kind == "ics_category":
+            return any(self.regex.fullmatch(_normalize(str(tag))) for tag in _ics_tags(event))
+        return bool(self.regex.search(event.get("title") or ""))
+
+
+def _source_text(event):
+    host = urlparse(event.get("url") or "").netloc
+    return " ".join([event.get("source") or "", event.get("source_id") or "", host])
+
+
+def _ics_tags(event):
+    tags = event.get("ics_categories") or []
+    return tags if isinstance(tags, list) else [tags]
+
+
+def category_rules(categories):
+    """ICS tag rules from category names: each name and each of its " / " parts."""
+    rules = []
+    for category in categories:
+        terms = [category] + [part.strip() for part in category.split("/")]
+        for term in dict.fromkeys(_normalize(t) for t in terms if t.strip()):
+            rules.append(Rule("ics_category", re.escape(term) + "s?", category))
+    return rules
+
+
+def override_titles(overrides):
+    """{(normalized title, normalized location): category} from curator overrides.
+
+    Falls back to the embedded events row for overrides predating the
+    snapshot columns. A title and location the curator has put in more
+    than one category is left out.
+    """
+    seen = {}
+    for o in overrides or []:
+        ev = o.get("events") or {}
+        title = _normalize(o.get("event_title") or ev.get("title"))
+        location = _normalize(o.get("event_location") or ev.get("location"))
+        category = o.get("category")
+        if title and category:
+            seen.setdefault((title, location), set()).add(category)
+    return {key: cats.pop() for key, cats in seen.items() if len(cats) == 1}
+
+
+class PreClassifier:
+    """Resolve events locally by rule, counting hits per rule.
+
+    classify() returns (category, rule name), or (None, None) for events
+    that should go to the API. Counts accumulate across calls so one
+    instance can report on a whole run.
+    """
+
+    def __init__(self, rules, overrides=None, categories=None):
+        valid = set(categories) if categories is not None else None
+        self.rules = {kind: [] for kind in RULE_KINDS}
+        for rule in rules:
+            if valid is not None and rule.category not in valid:
+                print(f"  WARNING: skipping rule {rule.name}: unknown category {rule.category!r}",
+                      file=sys.stderr)
+                continue
+            self.rules[rule.kind].append(rule)
+        self.overrides = {
+            key: cat for key, cat in override_titles(overrides).items()
+            if valid is None or cat in valid
+        }
+        self.seen = 0
+        self.hits = Counter()  # (rule name, category) -> events
+
+    @classmethod
+    def load(cls, overrides=None, rules_path=RULES_FILE, categories_path=CATEGORIES_FILE):
+        """Rules from classification_rules.json and categories.json, plus curator overrides."""
+        with Path(categories_path).open() as f:
+            categories = [c["name"] for c in json.load(f)]
+        rules = category_rules(categories)
+        with Path(rules_path).open() as f:
+            data = json.load(f)
+        for kind in RULE_KINDS:
+            for entry in data.get(kind, []):
+                rules.append(Rule(kind, entry["pattern"], entry["category"]))
+        return cls(rules, overrides, categories)
+
+    def match(self, event):
+        """(category, rule name) for an event, or (None, None); does not count."""
+        key = (_normalize(event.get("title")), _normalize(event.get("location")))
+        if key in self.overrides:
+            return self.overrides[key], "override:title+location"
+        for kind in RULE_KINDS:
+            matched = [rule for rule in self.rules[kind] if rule.matches(event)]
+            if matched and len({rule.category for rule in matched}) == 1:
+                return matched[0].category, matched[0].name
+        return None, None
+
+    def classify(self, event):
+        """match(), counting the event and the rule that resolved it."""
+        category, rule = self.match(event)
+        self.seen += 1
+        if category:
+            self.hits[(rule, category)] += 1
+        return category, rule
+
+    def report(self):
+        """Hit rate and per-rule counts, as printable lines."""
+        resolved = sum(self.hits.values())
+        rate = 100 * resolved / self.seen if self.seen else 0
+        lines = [f"Rule pre-classifier: {resolved}/{self.seen} events ({rate:.1f}%) resolved without the API"]
+        for (rule, category), count in self.hits.most_common():
+            lines.append(f"  {count:5d}  {rule} → {category}")
+        return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report what the classification rules resolve")
+    parser.add_argument("files", nargs="+", help="events.json files")
+    args = parser.parse_args()
+
+    pre = PreClassifier.load()
+    for filepath in args.files:
+        for event in iter_events(Path(filepath)):
+            if not event.get("category"):
+                pre.classify(event)
+    print("\n".join(pre.report()))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,9 +12,18 @@ fork-without-credentials case), the runner may parse the tracked
 ``[db-first] fallback=feeds.txt reason=...`` and reported — and counts
 as migration debt on the main instance, never silent success.
 
+Every row runs under a wall-clock --timeout (default 15 minutes; 0 for
+none). --jobs N runs up to N rows at once; each row's output is still
+printed as one RUN ... EXIT block, in row order. With --in-process, rows
+whose command is a plain ``python script.py ...`` call run in long-lived
+worker processes (see scraper_runner.py) instead of a fresh interpreter
+each. Output and the RUN/EXIT bracketing are the same in every mode.
+
 Usage:
     python scripts/run_scrapers_from_db.py --city santarosa
     python scripts/run_scrapers_from_db.py --city santarosa --list
+    python scripts/run_scrapers_from_db.py --city santarosa --jobs 4 --timeout 600
+    python scripts/run_scrapers_from_db.py --city santarosa --in-process --jobs 4
 """
 
 from __future__ import annotations
@@ -23,14 +32,19 @@ import argparse
 import json
 import os
 import shlex
+import signal
 import subprocess
 import sys
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from scraper_runner import TIMEOUT_EXIT, ScraperPool, resolve_command
+
 ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_TIMEOUT = 900
 
 
 def load_dotenv(path: Path) -> list[str]:
@@ -186,30 +200,75 @@ def localize_cmd(cmd: str) -> str:
     return shlex.join(tokens)
 
 
-def run_rows(city: str, rows: list[dict], months: str) -> int:
-    """Execute rows with RUN/EXIT log bracketing; return count of failures."""
+def run_subprocess(cmd: str, env: dict, timeout: float | None = None) -> tuple[int, str, str]:
+    """Run a stored command through bash; (returncode, stdout, stderr).
+
+    On timeout the command's whole process group is killed, so nothing
+    it started outlives it, and the output so far is returned with 124.
+    """
+    proc = subprocess.Popen(
+        localize_cmd(cmd),
+        cwd=ROOT,
+        env=env,
+        shell=True,
+        executable="/bin/bash",
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        stdout, stderr = proc.communicate()
+        return TIMEOUT_EXIT, stdout, stderr + f"Timed out after {timeout:g}s\n"
+    return proc.returncode, stdout, stderr
+
+
+def run_row(row: dict, env: dict, pool: ScraperPool | None = None,
+            timeout: float | None = None) -> tuple[int, str, str]:
+    """Run one row in the worker pool when its command resolves, else as a subprocess."""
+    resolved = resolve_command(row["scraper_cmd"]) if pool else None
+    if resolved:
+        result = pool.run(*resolved, timeout=timeout)
+        if result is not None:
+            return result
+    return run_subprocess(row["scraper_cmd"], env, timeout)
+
+
+def run_rows(city: str, rows: list[dict], months: str, in_process: bool = False,
+             timeout: float | None = DEFAULT_TIMEOUT, jobs: int = 1) -> int:
+    """Execute rows with RUN/EXIT log bracketing; return count of failures.
+
+    With jobs > 1 rows run concurrently; each row's output is buffered and
+    printed as one block when its turn in row order comes, so blocks never
+    interleave.
+    """
     env = os.environ.copy()
     env["SCRAPE_MONTHS"] = months
+    timeout = timeout or None
+    jobs = max(1, jobs)
     failures = 0
-    for row in rows:
-        label = row["name"]
-        local_cmd = localize_cmd(row["scraper_cmd"])
-        print(f"[{city}][scraper] RUN {label}")
-        result = subprocess.run(
-            local_cmd,
-            cwd=ROOT,
-            env=env,
-            shell=True,
-            executable="/bin/bash",
-            capture_output=True,
-            text=True,
-        )
-        for stream in (result.stdout, result.stderr):
-            for line in stream.splitlines():
-                print(f"[{city}][scraper] {line}")
-        print(f"[{city}][scraper] EXIT {result.returncode} {label}")
-        if result.returncode != 0:
-            failures += 1
+    pool = ScraperPool(months, workers=jobs) if in_process else None
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(lambda row: run_row(row, env, pool, timeout), rows)
+            for row, (returncode, stdout, stderr) in zip(rows, results):
+                label = row["name"]
+                lines = [f"[{city}][scraper] RUN {label}"]
+                for stream in (stdout, stderr):
+                    lines.extend(f"[{city}][scraper] {line}" for line in stream.splitlines())
+                lines.append(f"[{city}][scraper] EXIT {returncode} {label}")
+                print("\n".join(lines), flush=True)
+                if returncode != 0:
+                    failures += 1
+    finally:
+        if pool:
+            pool.close()
     return failures
 
 
@@ -220,6 +279,12 @@ def main() -> int:
                         help="SCRAPE_MONTHS value for scraper commands (default: 3)")
     parser.add_argument("--list", action="store_true",
                         help="List the execution set without running anything")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run python scraper commands in long-lived worker processes")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Rows to run concurrently (default: 1)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Per-row wall-clock limit in seconds, 0 for none (default: {DEFAULT_TIMEOUT})")
     args = parser.parse_args()
 
     load_dotenv(ROOT / ".env")
@@ -235,7 +300,8 @@ def main() -> int:
         print(f"[db-first] no scraper rows for {args.city}")
         return 0
 
-    failures = run_rows(args.city, rows, args.months)
+    failures = run_rows(args.city, rows, args.months, in_process=args.in_process,
+                        timeout=args.timeout, jobs=args.jobs)
     print(f"[db-first] city={args.city} ran={len(rows)} failures={failures} "
           f"fallback_used={execution['fallback_used']}")
     # Scraper failures do not fail the build (|| true semantics); a
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Run scraper commands inside long-lived worker processes.
+
+run_scrapers_from_db.py normally starts ``bash -> python`` for every
+scraper row, so each row pays the requests/bs4/lxml/icalendar imports
+again. In --in-process mode it uses this module instead: a row's
+``python scrapers/foo.py --args`` command is resolved to the script's
+entry point — a module-level ``main()`` or a ``SomeScraper.main()``
+classmethod call under ``if __name__ == '__main__':`` — and run in a
+worker that keeps its imports (and the scraper modules it has loaded)
+between rows.
+
+Each run is isolated the way a subprocess would be: sys.argv is the
+row's arguments, stdout and stderr are captured separately, the root
+logger gets a fresh handler on the captured stderr, and a wall-clock
+timeout (SIGALRM) stops a hung scraper. The result is (returncode,
+stdout, stderr), as from subprocess.run; SystemExit codes are kept,
+an uncaught exception prints its traceback and returns 1, a timeout
+returns 124. A scraper stuck where SIGALRM can't interrupt it (inside a
+C call) is caught TIMEOUT_GRACE seconds later by ScraperPool, which
+kills and restarts the pool and also returns 124.
+
+Commands this cannot resolve (shell syntax, no recognisable entry
+point) return None from resolve_command() and run as a subprocess, as
+does a row whose worker process dies under it.
+"""
+
+from __future__ import annotations
+
+import ast
+import contextlib
+import importlib.util
+import io
+import logging
+import os
+import shlex
+import signal
+import sys
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Heavy third-party imports shared by most scrapers, loaded once per worker
+PRELOAD = ("requests", "bs4", "lxml.html", "icalendar")
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+TIMEOUT_EXIT = 124
+# Seconds past a row's timeout before ScraperPool gives up on the worker
+TIMEOUT_GRACE = 10
+
+# Expansions that need a shell even inside double quotes
+_SHELL_EXPANSIONS = ("$", "`")
+
+_entry_points: dict[Path, tuple[str, str] | None] = {}
+_modules: dict[Path, object] = {}
+
+
+class ScraperTimeout(BaseException):
+    """Raised in a worker when a scraper exceeds its timeout.
+
+    A BaseException so scrapers' ``except Exception`` blocks don't swallow it.
+    """
+
+
+def entry_point(script: Path) -> tuple[str, str] | None:
+    """How a script runs as __main__: ("function", "main"), ("class", "Name") or None.
+
+    Only a guard whose body is a single ``main()``, ``sys.exit(main())`` or
+    ``Name.main()`` call is recognised; anything else (argument parsing
+    inline in the guard, several statements) is left to a subprocess.
+    """
+    if script in _entry_points:
+        return _entry_points[script]
+    result = None
+    try:
+        tree = ast.parse(script.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        tree = None
+    for node in tree.body if tree else []:
+        if isinstance(node, ast.If) and _is_main_guard(node.test) and len(node.body) == 1:
+            result = _entry_call(node.body[0])
+    _entry_points[script] = result
+    return result
+
+
+def _is_main_guard(test: ast.expr) -> bool:
+    return (
+        isinstance(test, ast.Compare)
+        and isinstance(test.left, ast.Name) and test.left.id == "__name__"
+        and len(test.comparators) == 1
+        and isinstance(test.comparators[0], ast.Constant) and test.comparators[0].value == "__main__"
+    )
+
+
+def _entry_call(stmt: ast.stmt) -> tuple[str, str] | None:
+    if not isinstance(stmt, ast.Expr) or not isinstance(stmt.value, ast.Call):
+        return None
+    call = stmt.value
+    # sys.exit(main())
+    if (isinstance(call.func, ast.Attribute) and call.func.attr == "exit"
+            and len(call.args) == 1 and isinstance(call.args[0], ast.Call)):
+        call = call.args[0]
+    if call.args or call.keywords:
+        return None
+    if isinstance(call.func, ast.Name) and call.func.id == "main":
+        return ("function", "main")
+    if (isinstance(call.func, ast.Attribute) and call.func.attr == "main"
+            and isinstance(call.func.value, ast.Name)):
+        return ("class", call.func.value.id)
+    return None
+
+
+def resolve_command(cmd: str) -> tuple[str, list[str]] | None:
+    """(script path, arguments) for a plain ``python script.py ...`` command, else None."""
+    if any(ch in cmd for ch in _SHELL_EXPANSIONS):
+        return None
+    lexer = shlex.shlex(cmd, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        return None
+    # Unquoted pipes, redirects, ; && || and subshells come out as operator tokens
+    if any(set(t) <= set(lexer.punctuation_chars) for t in tokens):
+        return None
+    if len(tokens) < 2 or Path(tokens[0]).name not in ("python", "python3") or not tokens[1].endswith(".py"):
+        return None
+    script = (ROOT / tokens[1]).resolve()
+    if not script.is_file() or entry_point(script) is None:
+        return None
+    return str(script), tokens[2:]
+
+
+def init_worker(months: str):
+    """ProcessPoolExecutor initializer: environment, cwd, import paths, preloads."""
+    os.environ["SCRAPE_MONTHS"] = months
+    os.chdir(ROOT)
+    for path in (ROOT / "scripts", ROOT / "scrapers", ROOT):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+    for name in PRELOAD:
+        with contextlib.suppress(ImportError):
+            importlib.import_module(name)
+
+
+def _load_module(script: Path):
+    module = _modules.get(script)
+    if module is None:
+        name = f"_scraper_{script.parent.name}_{script.stem}"
+        spec = importlib.util.spec_from_file_location(name, script)
+        module = importlib.util.module_from_spec(spec)
+        # Scripts import siblings by bare name, as when run directly
+        if str(script.parent) not in sys.path:
+            sys.path.insert(0, str(script.parent))
+        spec.loader.exec_module(module)
+        _modules[script] = module
+    return module
+
+
+def _on_alarm(signum, frame):
+    raise ScraperTimeout()
+
+
+def run_script(script: str, args: list[str], timeout: float | None = None) -> tuple[int, str, str]:
+    """Run a resolved script's entry point in this process; (returncode, stdout, stderr)."""
+    path = Path(script)
+    stdout, stderr = io.StringIO(), io.StringIO()
+    root_logger = logging.getLogger()
+    handler = logging.StreamHandler(stderr)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    saved_argv = sys.argv
+    root_logger.handlers = [handler]
+    root_logger.setLevel(logging.INFO)
+    sys.argv = [script, *args]
+    old_alarm = signal.signal(signal.SIGALRM, _on_alarm) if timeout else None
+    returncode = 0
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            if timeout:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            try:
+                kind, name = entry_point(path)
+                module = _load_module(path)
+                result = module.main() if kind == "function" else getattr(module, name).main()
+                returncode = result if isinstance(result, int) else 0
+            except SystemExit as exc:
+                returncode = _exit_code(exc.code, stderr)
+            except ScraperTimeout:
+                print(f"Timed out after {timeout:g}s", file=stderr)
+                returncode = TIMEOUT_EXIT
+            except Exception:
+                traceback.print_exc(file=stderr)
+                returncode = 1
+            finally:
+                if timeout:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+    except ScraperTimeout:
+        # The alarm fired between the call returning and being cancelled
+        returncode = returncode or TIMEOUT_EXIT
+    finally:
+        if old_alarm is not None:
+            signal.signal(signal.SIGALRM, old_alarm)
+        sys.argv = saved_argv
+        root_logger.handlers = []
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+
+def _exit_code(code, stderr) -> int:
+    """Process exit status for sys.exit(code), as the interpreter would set it."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+class ScraperPool:
+    """Long-lived worker processes for run_script(); safe to share between threads."""
+
+    def __init__(self, months: str, workers: int = 1):
+        self.months = months
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=(self.months,))
+
+    def run(self, script: str, args: list[str], timeout: float | None = None) -> tuple[int, str, str] | None:
+        """run_script() in a worker; None if the worker died (the pool is restarted).
+
+        If the worker hasn't answered TIMEOUT_GRACE seconds after the timeout,
+        the pool is killed and restarted and the row reports TIMEOUT_EXIT.
+        Other rows running in the pool at the time see a dead worker (None).
+        """
+        with self._lock:
+            executor = self._executor
+        try:
+            future = executor.submit(run_script, script, args, timeout)
+            return future.result(timeout=timeout + TIMEOUT_GRACE if timeout else None)
+        except FutureTimeout:
+            self._restart(executor, kill=True)
+            return TIMEOUT_EXIT, "", f"Timed out after {timeout:g}s\n"
+        except BrokenProcessPool:
+            self._restart(executor)
+            return None
+
+    def _restart(self, executor: ProcessPoolExecutor, kill: bool = False):
+        with self._lock:
+            if self._executor is not executor:
+                return  # another thread already restarted it
+            if kill:
+                for process in list(executor._processes.values()):
+                    process.kill()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._start()
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -24,6 +24,8 @@ from collections import defaultdict
 from difflib import SequenceMatcher
 from pathlib import Path
 
+from title_similarity import TitleSimilarity
+
 
 def similarity_sequencematcher(a, b):
     """stdlib SequenceMatcher ratio (0-1)."""
@@ -51,26 +53,15 @@ def similarity_levenshtein(a, b):
     return 1.0 - distance / max(m, n)
 
 
+_title_similarity = TitleSimilarity()
+
+
 def similarity_token_set(a, b):
-    """Token set ratio: compare word sets, ignore order. 0-1 similarity."""
-    words_a = set(a.lower().split())
-    words_b = set(b.lower().split())
-    if not words_a and not words_b:
-        return 1.0
-    if not words_a or not words_b:
-        return 0.0
-    intersection = words_a & words_b
-    sorted_inter = ' '.join(sorted(intersection))
-    remaining_a = ' '.join(sorted(words_a - intersection))
-    remaining_b = ' '.join(sorted(words_b - intersection))
-    combined_a = (sorted_inter + ' ' + remaining_a).strip()
-    combined_b = (sorted_inter + ' ' + remaining_b).strip()
-    ratios = [
-        SequenceMatcher(None, sorted_inter, combined_a).ratio() if combined_a else 1.0,
-        SequenceMatcher(None, sorted_inter, combined_b).ratio() if combined_b else 1.0,
-        SequenceMatcher(None, combined_a, combined_b).ratio(),
-    ]
-    return max(ratios)
+    """Token set ratio: compare word sets, ignore order. 0-1 similarity.
+
+    Same engine (and scores) as ics_to_json.cluster_by_title_similarity.
+    """
+    return _title_similarity.score(a, b)
 
 
 ALGORITHMS = {
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Token-set title similarity shared by ics_to_json.py and similarity_test.py.
+
+TitleSimilarity.score(a, b) is the token-set ratio used to cluster event
+titles: lowercase, split into a word set, and take the best of three
+SequenceMatcher ratios over the shared words and each title's combined
+words. Titles are profiled once and kept:
+
+- words are interned as integer token ids, so shared words are an integer
+  set intersection;
+- the combined-string length and character counts, which bound every
+  ratio from above (see bounds()).
+
+bounds(title, others) computes those upper bounds for one title against
+many in a batch, with NumPy when it is installed (and the batch is large
+enough to pay for it) and plain Python otherwise; both give the same
+values. Callers only need score() for pairs whose bound reaches their
+threshold.
+
+    sim = TitleSimilarity()
+    sim.score('Family Storytime', 'Bilingual Family Storytime')   # 1.0
+"""
+
+from difflib import SequenceMatcher
+
+try:
+    import numpy as np
+except ImportError:  # optional; bounds() falls back to pure Python
+    np = None
+
+# Below this many titles per bounds() call, array setup costs more than it saves
+NUMPY_MIN_BATCH = 32
+
+
+def _int_array(values):
+    """int64 NumPy array of a sized iterable (set, dict keys or values)."""
+    return np.fromiter(values, dtype=np.int64, count=len(values))
+
+
+class _Profile:
+    __slots__ = ('words', 'token_ids', 'length', 'char_ids', 'char_counts', 'chars')
+
+    def __init__(self, words, token_ids, length, chars):
+        self.words = words
+        self.token_ids = token_ids      # frozenset of interned word ids
+        self.length = length            # len of the words joined by spaces
+        self.chars = chars              # {char id: count} in that string
+        self.char_ids = None            # NumPy arrays, built on first use
+        self.char_counts = None
+
+
+class TitleSimilarity:
+    """Memoized token-set similarity over interned title tokens."""
+
+    def __init__(self, use_numpy=None):
+        self.use_numpy = np is not None if use_numpy is None else use_numpy and np is not None
+        self._token_ids = {}
+        self._token_lengths = []
+        self._char_ids = {}
+        self._profiles = {}
+        self._scores = {}
+
+    def profile(self, title):
+        """Cached _Profile for a title."""
+        profile = self._profiles.get(title)
+        if profile is None:
+            words = frozenset(title.lower().split())
+            token_ids = frozenset(self._intern_token(w) for w in words)
+            length = sum(len(w) for w in words) + len(words) - 1 if words else 0
+            chars = {}
+            for ch in ' '.join(words):
+                cid = self._char_ids.setdefault(ch, len(self._char_ids))
+                chars[cid] = chars.get(cid, 0) + 1
+            profile = self._profiles[title] = _Profile(words, token_ids, length, chars)
+        return profile
+
+    def _intern_token(self, word):
+        tid = self._token_ids.get(word)
+        if tid is None:
+            tid = self._token_ids[word] = len(self._token_lengths)
+            self._token_lengths.append(len(word))
+        return tid
+
+    def score(self, a, b):
+        """Compare word sets, ignore order. Returns 0-1.
+        'Family Storytime' vs 'Bilingual Family Storytime' scores high because
+        the shared words dominate."""
+        key = (a, b)
+        result = self._scores.get(key)
+        if result is None:
+            result = self._scores[key] = self._score(self.profile(a).words, self.profile(b).words)
+        return result
+
+    @staticmethod
+    def _score(words_a, words_b):
+        if not words_a and not words_b:
+            return 1.0
+        if not words_a or not words_b:
+            return 0.0
+        intersection = words_a & words_b
+        sorted_inter = ' '.join(sorted(intersection))
+        remaining_a = ' '.join(sorted(words_a - intersection))
+        remaining_b = ' '.join(sorted(words_b - intersection))
+        combined_a = (sorted_inter + ' ' + remaining_a).strip()
+        combined_b = (sorted_inter + ' ' + remaining_b).strip()
+        ratios = [
+            SequenceMatcher(None, sorted_inter, combined_a).ratio() if combined_a else 1.0,
+            SequenceMatcher(None, sorted_inter, combined_b).ratio() if combined_b else 1.0,
+            SequenceMatcher(None, combined_a, combined_b).ratio(),
+        ]
+        return max(ratios)
+
+    def bounds(self, title, others):
+        """Upper bounds on score(title, o) for each title in others.
+
+        Each SequenceMatcher ratio is at most its quick_ratio(). The shared
+        words' string is a prefix of both combined strings, so the first two
+        ratios are bounded by its length; the third by the characters the
+        two titles have in common. Titles without words get 1.0.
+        """
+        pa = self.profile(title)
+        profiles = [self.profile(o) for o in others]
+        if self.use_numpy and len(profiles) >= NUMPY_MIN_BATCH:
+            return self._bounds_numpy(pa, profiles)
+        return [self._bound(pa, pb) for pb in profiles]
+
+    def _bound(self, pa, pb):
+        if not pa.words or not pb.words:
+            return 1.0
+        shared = pa.token_ids & pb.token_ids
+        len_shared = sum(self._token_lengths[t] for t in shared) + len(shared) - 1 if shared else 0
+        small, large = pa.chars, pb.chars
+        if len(small) > len(large):
+            small, large = large, small
+        common_chars = sum(min(n, large.get(c, 0)) for c, n in small.items())
+        return max(
+            2 * len_shared / (len_shared + pa.length),
+            2 * len_shared / (len_shared + pb.length),
+            2 * common_chars / (pa.length + pb.length),
+        )
+
+    def _char_arrays(self, profile):
+        if profile.char_ids is None:
+            profile.char_ids = _int_array(profile.chars.keys())
+            profile.char_counts = _int_array(profile.chars.values())
+        return profile.char_ids, profile.char_counts
+
+    def _bounds_numpy(self, pa, profiles):
+        k = len(profiles)
+        if not pa.words:
+            return [1.0] * k
+        lengths = np.array([pb.length for pb in profiles], dtype=np.int64)
+        has_words = np.array([bool(pb.words) for pb in profiles])
+
+        # Shared-word string length: token lengths of the intersection plus separators
+        token_lengths = np.array(self._token_lengths, dtype=np.int64)
+        tokens = [_int_array(pb.token_ids) for pb in profiles]
+        owners = np.repeat(np.arange(k), [len(t) for t in tokens])
+        flat = np.concatenate(tokens)
+        hit = np.isin(flat, _int_array(pa.token_ids))
+        shared_count = np.bincount(owners[hit], minlength=k)
+        shared_chars = np.bincount(owners[hit], weights=token_lengths[flat[hit]], minlength=k)
+        len_shared = np.where(shared_count > 0, shared_chars + shared_count - 1, 0)
+
+        # Common characters: min of the two counts for each character id
+        a_counts = np.zeros(len(self._char_ids), dtype=np.int64)
+        a_ids, a_n = self._char_arrays(pa)
+        a_counts[a_ids] = a_n
+        arrays = [self._char_arrays(pb) for pb in profiles]
+        char_owners = np.repeat(np.arange(k), [len(ids) for ids, _ in arrays])
+        char_ids = np.concatenate([ids for ids, _ in arrays])
+        char_counts = np.concatenate([n for _, n in arrays])
+        common = np.minimum(char_counts, a_counts[char_ids])
+        common_chars = np.bincount(char_owners, weights=common, minlength=k)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bound = np.maximum.reduce([
+                2 * len_shared / (len_shared + pa.length),
+                2 * len_shared / (len_shared + lengths),
+                2 * common_chars / (pa.length + lengths),
+            ])
+        return np.where(has_words, bound, 1.0).tolist()
+
+    def candidate_pairs(self, titles, threshold):
+        """Index pairs (i < j) of titles that can reach threshold; falsy titles are skipped.
+
+        Titles sharing a word are found through an inverted token index.
+        Titles sharing none only score through the combined-string ratio,
+        which is at most 2*min/(len_a + len_b), so they are only paired with
+        titles of similar length.
+        """
+        profiles = [self.profile(t) if t else None for t in titles]
+        pairs = set()
+        by_token = {}
+        for i, p in enumerate(profiles):
+            if p is not None:
+                for t in p.token_ids:
+                    by_token.setdefault(t, []).append(i)
+        for members in by_token.values():
+            for n, i in enumerate(members):
+                for j in members[n + 1:]:
+                    pairs.add((i, j))
+
+        # Titles with no words (whitespace only) are paired with every title
+        by_length = sorted((p.length, i) for i, p in enumerate(profiles) if p is not None)
+        max_ratio = (2 - threshold) / threshold if threshold > 0 else float('inf')
+        for n, (len_i, i) in enumerate(by_length):
+            for len_j, j in by_length[n + 1:]:
+                if len_i and len_j > len_i * max_ratio:
+                    break
+                pairs.add((i, j) if i < j else (j, i))
+        return sorted(pairs)
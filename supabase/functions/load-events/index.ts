@@ -18,10 +18,20 @@ Deno.serve(async (req) => {
     const body = await req.json().catch(() => ({}));
 
     // --- Direct POST mode: CI sends {city, events} per city ---
+    // Delta mode ({city, mode: "delta", events, source_uids}): events holds only
+    // the inserted/updated rows (scripts/events_delta.py), source_uids every
+    // current uid for the stale-event cleanup.
     if (body.city && Array.isArray(body.events)) {
       const city = body.city;
       const events = body.events;
-      console.log(`Direct POST: ${events.length} events for ${city}`);
+      const isDelta = body.mode === "delta";
+      if (isDelta && !Array.isArray(body.source_uids)) {
+        return new Response(JSON.stringify({ success: false, city, error: "delta mode requires source_uids" }), {
+          status: 400,
+          headers: { ...corsHeaders, "Content-Type": "application/json" },
+        });
+      }
+      console.log(`Direct POST${isDelta ? " (delta)" : ""}: ${events.length} events for ${city}`);
 
       for (const event of events) {
         event.city = event.city || city;
@@ -70,7 +80,7 @@ Deno.serve(async (req) => {
 
       // Remove stale events for this city that are no longer in the feed
       // Uses RPC to avoid URL length limits with large IN lists
-      const newSourceUids = Array.from(uniqueEvents.keys());
+      const newSourceUids: string[] = isDelta ? body.source_uids : Array.from(uniqueEvents.keys());
       let deleted = 0;
       if (newSourceUids.length > 0) {
         const { data: delCount, error: delError } = await supabase
@@ -86,7 +96,7 @@ Deno.serve(async (req) => {
         console.log(`Cleaned up ${deleted} stale events for ${city}`);
       }
 
-      const result: any = { success: errors === 0, city, fetched: events.length, unique: uniqueEvents.size, deleted, inserted, errors };
+      const result: any = { success: errors === 0, city, mode: isDelta ? "delta" : "full", fetched: events.length, unique: uniqueEvents.size, total: newSourceUids.length, deleted, inserted, errors };
       if (errorDetails.length > 0) {
         result.errorDetails = errorDetails;
       }
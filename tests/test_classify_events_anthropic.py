@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Tests for title-deduplicated, token-budgeted batching in
+scripts/classify_events_anthropic.py.
+
+Run: python -m pytest tests/test_classify_events_anthropic.py -v
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+# The module requires Supabase settings at import time
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_KEY', 'test')
+
+from scripts.classify_events_anthropic import classify_events  # noqa: E402
+from scripts.classify_prompt import (  # noqa: E402
+    BATCH_TOKEN_BUDGET, CATEGORIES, build_prompt_prefix, event_tokens,
+)
+
+
+def _category(title):
+    return CATEGORIES[len(title) % len(CATEGORIES)]
+
+
+def _fake_call(calls):
+    """anthropic_call stand-in answering every numbered event line."""
+    def call(api_key, model, prompt, system=None):
+        titles = re.findall(r'^(\d+)\. Title: "(.*?)"', prompt, re.MULTILINE)
+        calls.append((system, [t for _, t in titles]))
+        return json.dumps([{'index': int(i), 'category': _category(t)} for i, t in titles])
+    return call
+
+
+class TestClassifyEvents:
+
+    def test_batches_follow_token_budget_and_titles_fan_out(self, capsys):
+        events = [
+            {'id': n * 10 + copy, 'title': f'Lecture {n}', 'location': 'Hall', 'description': 'x' * 300}
+            for n in range(100) for copy in range(2)
+        ]
+        calls = []
+        with patch('scripts.classify_events_anthropic.anthropic_call', _fake_call(calls)):
+            results, updates = classify_events(events, '', 'key', 'model')
+
+        # One request per budget-sized batch of unique titles, in order
+        sent = [title for _, titles in calls for title in titles]
+        assert sent == [f'Lecture {n}' for n in range(100)]
+        assert len(calls) > 1
+        for _, titles in calls:
+            assert sum(event_tokens(events[0]) for _ in titles) <= BATCH_TOKEN_BUDGET
+        assert {system for system, _ in calls} == {build_prompt_prefix('')}
+
+        assert [(e['title'], c) for e, c in results] == [
+            (f'Lecture {n}', _category(f'Lecture {n}')) for n in range(100)
+        ]
+        assert sorted(updates) == sorted((e['id'], _category(e['title'])) for e in events)
+        assert '100 unique titles (deduplicated from 200 events)' in capsys.readouterr().out
+
+    def test_unparseable_reply_leaves_batch_unclassified(self, capsys):
+        events = [{'id': 1, 'title': 'Jazz Night'}, {'id': 2, 'title': 'jazz night '}]
+        with patch('scripts.classify_events_anthropic.anthropic_call', return_value='Sorry, no.'):
+            results, updates = classify_events(events, '', 'key', 'model')
+        assert results == [(events[0], None)]
+        assert updates == []
+        assert 'no JSON array' in capsys.readouterr().err
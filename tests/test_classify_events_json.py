@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Tests for the classification cache and the concurrent, rate-limited
+classification engine in scripts/classify_events_json.py.
+
+Run: python -m pytest tests/test_classify_events_json.py -v
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+# The module requires Supabase settings at import time
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_KEY', 'test')
+
+from scripts.preclassify import PreClassifier, Rule  # noqa: E402
+from scripts.classify_events_json import (  # noqa: E402
+    CATEGORIES, RateLimiter, build_prompt_prefix, cache_config_key, event_fingerprint,
+    load_classification_cache, process_file, process_files, save_classification_cache,
+)
+from scripts.classify_prompt import event_tokens, plan_batches  # noqa: E402
+
+CONFIG = {'api_key': 'test', 'model': 'test-model'}
+HEADERS = {'anthropic-ratelimit-tokens-limit': '10000', 'anthropic-ratelimit-tokens-remaining': '9000'}
+
+
+def _event(title, uid, source='Library', location='Main Branch'):
+    return {'title': title, 'source_uid': uid, 'source': source, 'location': location}
+
+
+def _write(path, events):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(events))
+    return path
+
+
+def _fake_classify(calls):
+    def classify(events, few_shot, api_key, model):
+        calls.append([e['title'] for e in events])
+        return {i + 1: CATEGORIES[0] for i in range(len(events))}, HEADERS
+    return classify
+
+
+class TestFingerprint:
+
+    def test_normalizes_case_and_whitespace(self):
+        a = _event('Family  Storytime', '1')
+        b = _event(' family storytime ', '2', source='LIBRARY', location='main branch')
+        assert event_fingerprint(a) == event_fingerprint(b)
+
+    def test_location_and_ics_categories_matter(self):
+        base = _event('Open Mic', '1')
+        assert event_fingerprint(base) != event_fingerprint(_event('Open Mic', '1', location='Cafe'))
+        tagged = {**base, 'ics_categories': ['Music', 'Community']}
+        reordered = {**base, 'ics_categories': ['community', 'music']}
+        assert event_fingerprint(tagged) == event_fingerprint(reordered) != event_fingerprint(base)
+
+
+class TestCache:
+
+    @pytest.fixture(autouse=True)
+    def no_sleep(self):
+        with patch('scripts.classify_events_json.time.sleep'):
+            yield
+
+    def test_series_classified_once_across_cities_and_runs(self, tmp_path):
+        toronto = _write(tmp_path / 'toronto' / 'events.json', [
+            _event('Storytime', 't1'), _event('Storytime', 't2'), _event('Trivia Night', 't3'),
+        ])
+        davis = _write(tmp_path / 'davis' / 'events.json', [
+            _event('Storytime', 'd1'), _event('Chess Club', 'd2'),
+        ])
+        cache, calls = {}, []
+        with patch('scripts.classify_events_json.classify_batch', _fake_classify(calls)):
+            process_file(toronto, CONFIG, '', cache=cache)
+            process_file(davis, CONFIG, '', cache=cache)
+        # Storytime from Library/Main Branch was already known when davis ran
+        assert calls == [['Storytime', 'Trivia Night'], ['Chess Club']]
+        assert all(e['category'] == CATEGORIES[0] for e in json.loads(davis.read_text()))
+
+        # Next night: new source_uids, same series — no API calls at all
+        key = cache_config_key('test-model', [])
+        save_classification_cache(tmp_path / 'cache.json', key, cache)
+        rerun = _write(tmp_path / 'toronto2' / 'events.json', [_event('STORYTIME', 'x9'), _event('Trivia Night', 'x8')])
+        calls.clear()
+        cache = load_classification_cache(tmp_path / 'cache.json', key)
+        with patch('scripts.classify_events_json.classify_batch', _fake_classify(calls)):
+            process_file(rerun, CONFIG, '', cache=cache)
+        assert calls == []
+        assert [e['category'] for e in json.loads(rerun.read_text())] == [CATEGORIES[0]] * 2
+
+    def test_rules_resolve_before_cache_and_api(self, tmp_path, capsys):
+        pre = PreClassifier([Rule('source', 'legistar', CATEGORIES[1])], categories=CATEGORIES)
+        path = _write(tmp_path / 'davis' / 'events.json', [
+            {**_event('City Council', 'c1'), 'source_id': 'legistar'},
+            _event('Storytime', 'c2'),
+        ])
+        cache, calls = {}, []
+        with patch('scripts.classify_events_json.classify_batch', _fake_classify(calls)):
+            process_file(path, CONFIG, '', cache=cache, preclassifier=pre)
+        assert calls == [['Storytime']]
+        assert [e['category'] for e in json.loads(path.read_text())] == [CATEGORIES[1], CATEGORIES[0]]
+        # Rule hits are not cached; they are re-derived from the rules each run
+        assert len(cache) == 1
+        assert '1 events resolved by rules, 1 left' in capsys.readouterr().out
+        assert pre.report()[0] == 'Rule pre-classifier: 1/2 events (50.0%) resolved without the API'
+
+    def test_config_change_discards_cache(self, tmp_path):
+        path = tmp_path / 'cache.json'
+        overrides = [{'event_title': 'Yoga', 'event_location': 'Park', 'event_city': 'davis', 'category': CATEGORIES[1]}]
+        key = cache_config_key('m', overrides)
+        save_classification_cache(path, key, {'f': {'category': CATEGORIES[0], 'seen': '2999-01-01'}})
+        assert load_classification_cache(path, key) == {'f': {'category': CATEGORIES[0], 'seen': '2999-01-01'}}
+        assert load_classification_cache(path, cache_config_key('m', [])) == {}
+        assert load_classification_cache(path, cache_config_key('other-model', overrides)) == {}
+
+    def test_stale_entries_are_pruned(self, tmp_path):
+        path = tmp_path / 'cache.json'
+        kept = save_classification_cache(path, 'k', {
+            'old': {'category': CATEGORIES[0], 'seen': '2000-01-01'},
+            'new': {'category': CATEGORIES[0], 'seen': '2999-01-01'},
+        })
+        assert kept == 1
+        assert list(load_classification_cache(path, 'k')) == ['new']
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRateLimiter:
+
+    def test_waits_for_refill(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=600, requests_per_minute=100, clock=clock, sleep=clock.sleep)
+        assert limiter.acquire(500) == 0
+        # 100 tokens left, refilling at 10/s
+        assert limiter.acquire(300) == pytest.approx(20)
+
+    def test_headers_set_limit_and_cap_remaining(self):
+        clock = FakeClock()
+        limiter = RateLimiter(tokens_per_minute=10000, clock=clock, sleep=clock.sleep)
+        info = limiter.update({
+            'anthropic-ratelimit-tokens-limit': '1200',
+            'anthropic-ratelimit-tokens-remaining': '0',
+            'anthropic-ratelimit-requests-limit': '50',
+            'anthropic-ratelimit-requests-remaining': '49',
+        })
+        assert info == {'tokens_limit': 1200, 'tokens_remaining': 0}
+        # Empty bucket refilling at 1200/min
+        assert limiter.acquire(600) == pytest.approx(30)
+        assert limiter.update({}) is None
+
+
+class StubMessagesAPI(BaseHTTPRequestHandler):
+    """Messages API stand-in with its own token bucket and anthropic-ratelimit-* headers.
+
+    Charges a token per four characters of system prompt, prompt and reply, answers 429 when the
+    bucket is short, and assigns each event CATEGORIES[len(title) % len(CATEGORIES)].
+    """
+
+    limit = 1500
+    window = 1.0
+    delay = 0.05
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        prompt = body['messages'][0]['content']
+        system = ''.join(block['text'] for block in body.get('system', []))
+        server.bodies.append(body)
+        titles = re.findall(r'^(\d+)\. Title: "(.*?)"', prompt, re.MULTILINE)
+        reply = json.dumps([
+            {'index': int(i), 'category': CATEGORIES[len(t) % len(CATEGORIES)]} for i, t in titles
+        ])
+        cost = (len(system) + len(prompt) + len(reply)) // 4
+        with server.lock:
+            now = time.monotonic()
+            server.level = min(self.limit, server.level + (now - server.updated) * self.limit / self.window)
+            server.updated = now
+            ok = server.level >= cost
+            if ok:
+                server.level -= cost
+                server.spent += cost
+            else:
+                server.rejected += 1
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            remaining = max(0, int(server.level))
+        time.sleep(self.delay)
+        with server.lock:
+            server.active -= 1
+
+        payload = json.dumps({'content': [{'type': 'text', 'text': reply}]}).encode()
+        self.send_response(200 if ok else 429)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('anthropic-ratelimit-tokens-limit', str(self.limit))
+        self.send_header('anthropic-ratelimit-tokens-remaining', str(remaining))
+        self.send_header('anthropic-ratelimit-requests-limit', '1000')
+        self.send_header('anthropic-ratelimit-requests-remaining', '999')
+        if not ok:
+            self.send_header('retry-after', '0')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubMessagesAPI)
+    server.lock = threading.Lock()
+    server.level, server.updated = float(StubMessagesAPI.limit), time.monotonic()
+    server.spent = server.rejected = server.active = server.peak = 0
+    server.bodies = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/v1/messages'
+    with patch('scripts.classify_events_json.ANTHROPIC_API_URL', url):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestConcurrentEngine:
+
+    def test_batches_from_all_files_share_the_budget(self, tmp_path, stub_api, capsys):
+        files = []
+        for city in ('toronto', 'davis', 'bloomington'):
+            events = [_event(f'{city} event {"x" * n}', f'{city}{n}') for n in range(8)]
+            files.append((_write(tmp_path / city / 'events.json', events), ''))
+        limiter = RateLimiter(tokens_per_minute=StubMessagesAPI.limit, window=StubMessagesAPI.window)
+
+        written = []
+        with patch('scripts.classify_events_json.MAX_BATCH_SIZE', 3):
+            process_files(files, CONFIG, rate_limiter=limiter, workers=8, on_file_done=written.append)
+
+        assert written == [path for path, _ in files]
+        for path, _ in files:
+            for event in json.loads(path.read_text()):
+                assert event['category'] == CATEGORIES[len(event['title']) % len(CATEGORIES)]
+        # Nine batches overlapped, needed more than one window's budget, and none was refused
+        assert stub_api.peak > 1
+        assert stub_api.spent > StubMessagesAPI.limit
+        assert stub_api.rejected == 0
+        assert 'ERROR' not in capsys.readouterr().err
+
+    def test_static_prefix_is_a_cached_system_block(self, tmp_path, stub_api):
+        few_shot = '\nHere are examples:\n  Title: "Jazz Night" Location: "Cafe" → Music'
+        path = _write(tmp_path / 'davis' / 'events.json', [_event('Chess Club', 'd1')])
+        process_files([(path, few_shot)], CONFIG)
+
+        [body] = stub_api.bodies
+        assert body['system'] == [{
+            'type': 'text', 'text': build_prompt_prefix(few_shot), 'cache_control': {'type': 'ephemeral'},
+        }]
+        assert few_shot in body['system'][0]['text']
+        assert 'Chess Club' in body['messages'][0]['content']
+        assert few_shot not in body['messages'][0]['content']
+
+
+class TestPlanBatches:
+
+    def test_batch_size_follows_event_length(self):
+        short = [_event(f'Trivia {i}', str(i)) for i in range(40)]
+        long = [{**_event(f'Talk {i}', str(i)), 'description': 'x' * 300} for i in range(40)]
+        budget = 20 * event_tokens(long[0])
+
+        assert [len(b) for b in plan_batches(long, budget, 150)] == [20, 20]
+        assert [len(b) for b in plan_batches(short, budget, 150)] == [40]
+        assert [len(b) for b in plan_batches(short, budget, 15)] == [15, 15, 10]
+        assert [event for b in plan_batches(long, budget, 150) for event in b] == long
+
+    def test_oversized_event_gets_its_own_batch(self):
+        events = [_event('a', '0'), {**_event('b', '1'), 'description': 'x' * 300}, _event('c', '2')]
+        assert [len(b) for b in plan_batches(events, 10, 150)] == [1, 1, 1]
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Tests for scripts/combine_ics.py combine-stage behavior.
+
+Run: python -m pytest tests/test_combine_ics.py -v
+"""
+
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from scripts.combine_ics import (
+    AGGREGATORS, combine_ics_files, dedupe_cross_source, dedupe_fuzzy, load_parse_cache,
+)
+from scripts.ics_event import IcsEvent
+from tests.helpers import make_ics, make_vevent
+
+
+def _day(offset):
+    return (date.today() + timedelta(days=offset)).strftime('%Y%m%d')
+
+
+def _write_city(tmp_path):
+    city = tmp_path / 'city'
+    city.mkdir()
+    one_off = make_vevent(
+        'Jazz Jam', f'DTSTART:{_day(3)}T190000', f'DTEND:{_day(3)}T210000', 'jazz-1@test',
+    )
+    weekly = make_vevent(
+        'Storytime', f'DTSTART:{_day(1)}T100000', f'DTEND:{_day(1)}T110000', 'story@test',
+        rrule='FREQ=WEEKLY;COUNT=4',
+    )
+    (city / 'venue.ics').write_text(make_ics(one_off), newline='')
+    (city / 'library.ics').write_text(make_ics(weekly), newline='')
+    return city
+
+
+class TestParseCache:
+    """Unchanged sources are served from the per-source parse cache."""
+
+    def test_warm_run_matches_cold_run(self, tmp_path, capsys):
+        city = _write_city(tmp_path)
+        cache = tmp_path / 'parse_cache.json'
+        out = tmp_path / 'combined.ics'
+
+        combine_ics_files(str(city), str(out), 'Test', parse_cache=str(cache))
+        cold = out.read_bytes()
+        assert 'Parse cache: 0/2 sources unchanged' in capsys.readouterr().out
+
+        combine_ics_files(str(city), str(out), 'Test', parse_cache=str(cache))
+        assert out.read_bytes() == cold
+        assert 'Parse cache: 2/2 sources unchanged' in capsys.readouterr().out
+
+    def test_changed_source_is_reparsed(self, tmp_path, capsys):
+        city = _write_city(tmp_path)
+        cache = tmp_path / 'parse_cache.json'
+        out = tmp_path / 'combined.ics'
+        combine_ics_files(str(city), str(out), 'Test', parse_cache=str(cache))
+
+        renamed = make_vevent(
+            'Late Jazz Jam', f'DTSTART:{_day(3)}T220000', f'DTEND:{_day(3)}T230000', 'jazz-1@test',
+        )
+        (city / 'venue.ics').write_text(make_ics(renamed), newline='')
+        capsys.readouterr()
+        combine_ics_files(str(city), str(out), 'Test', parse_cache=str(cache))
+
+        assert 'Parse cache: 1/2 sources unchanged' in capsys.readouterr().out
+        assert 'SUMMARY:Late Jazz Jam' in out.read_text()
+
+    def test_removed_source_is_pruned(self, tmp_path):
+        city = _write_city(tmp_path)
+        cache = tmp_path / 'parse_cache.json'
+        out = tmp_path / 'combined.ics'
+        combine_ics_files(str(city), str(out), 'Test', parse_cache=str(cache))
+
+        (city / 'venue.ics').unlink()
+        combine_ics_files(str(city), str(out), 'Test', parse_cache=str(cache))
+
+        assert set(load_parse_cache(cache)) == {'library'}
+
+
+class TestOutput:
+    """combined.ics is streamed to a temp file and renamed into place."""
+
+    def test_replaces_output_without_leftovers(self, tmp_path):
+        city = _write_city(tmp_path)
+        out = tmp_path / 'out' / 'combined.ics'
+        out.parent.mkdir()
+        out.write_text('stale')
+
+        combine_ics_files(str(city), str(out), 'Test')
+
+        text = out.read_bytes().decode('utf-8')
+        assert text.startswith('BEGIN:VCALENDAR\r\nVERSION:2.0\r\n')
+        assert text.endswith('END:VEVENT\r\nEND:VCALENDAR')
+        assert text.count('BEGIN:VEVENT') == 5
+        assert [p.name for p in out.parent.iterdir()] == ['combined.ics']
+
+
+class TestRecordsSidecar:
+    """ics_to_json reads combine's records sidecar with the same result as combined.ics."""
+
+    def test_records_match_combined_ics(self, tmp_path):
+        from scripts.ics_to_json import ics_to_json
+
+        city = _write_city(tmp_path)
+        out = tmp_path / 'combined.ics'
+        records = tmp_path / 'combined.records.jsonl'
+        combine_ics_files(str(city), str(out), 'Test', records_file=str(records))
+
+        from_ics = ics_to_json(str(out), str(tmp_path / 'a.json'), city='santarosa')
+        from_records = ics_to_json(str(records), str(tmp_path / 'b.json'), city='santarosa')
+
+        assert len(from_ics) == 5
+        assert from_records == from_ics
+
+
+class TestGeoFilter:
+    """Events whose address is outside city.conf are dropped, however LOCATION is written."""
+
+    def test_parameterised_location_is_filtered(self, tmp_path):
+        city = tmp_path / 'city'
+        city.mkdir()
+        (city / 'city.conf').write_text('Santa Rosa\n')
+        events = ''
+        for uid, location in [
+            ('local', 'LOCATION:100 Main St\\, Santa Rosa\\, CA 95404'),
+            ('altrep', 'LOCATION;ALTREP="https://maps.example/x":1 Elm St\\, Fresno\\, CA 93701'),
+            ('lang', 'LOCATION;LANGUAGE=en:200 Oak Ave\\, Santa Rosa\\, CA 95401'),
+        ]:
+            vevent = make_vevent(uid, f'DTSTART:{_day(2)}T190000', f'DTEND:{_day(2)}T200000', f'{uid}@test')
+            events += vevent.replace('END:VEVENT', f'{location}\r\nEND:VEVENT')
+        (city / 'venue.ics').write_text(make_ics(events), newline='')
+        out = tmp_path / 'combined.ics'
+
+        combine_ics_files(str(city), str(out), 'Test', geo_report=str(tmp_path / 'geo.json'))
+
+        text = out.read_text()
+        assert 'UID:local@test' in text and 'UID:lang@test' in text
+        # Used to slip through: only bare "LOCATION:" lines were checked
+        assert 'UID:altrep@test' not in text
+        assert 'Fresno' in (tmp_path / 'geo.json').read_text()
+
+
+class TestJobs:
+    """--jobs parses sources in worker processes without changing the output."""
+
+    def test_pool_matches_serial(self, tmp_path, capsys):
+        city = _write_city(tmp_path)
+        serial = tmp_path / 'serial.ics'
+        pooled = tmp_path / 'pooled.ics'
+
+        combine_ics_files(str(city), str(serial), 'Test')
+        serial_log = capsys.readouterr().out.replace(str(serial), 'OUT')
+        combine_ics_files(str(city), str(pooled), 'Test', jobs=2)
+        pooled_log = capsys.readouterr().out.replace(str(pooled), 'OUT')
+
+        assert pooled.read_bytes() == serial.read_bytes()
+        assert pooled_log == serial_log
+
+    def test_pool_uses_parse_cache(self, tmp_path, capsys):
+        city = _write_city(tmp_path)
+        cache = tmp_path / 'parse_cache.json'
+        out = tmp_path / 'combined.ics'
+
+        combine_ics_files(str(city), str(out), 'Test', parse_cache=str(cache))
+        cold = out.read_bytes()
+        capsys.readouterr()
+        combine_ics_files(str(city), str(out), 'Test', parse_cache=str(cache), jobs=2)
+
+        assert out.read_bytes() == cold
+        assert 'Parse cache: 2/2 sources unchanged' in capsys.readouterr().out
+
+
+def _event(title, source, uid, day=1):
+    content = f'SUMMARY:{title}\r\nUID:{uid}\r\nX-SOURCE:{source}\r\nURL:https://example.com/{uid}'
+    return IcsEvent(datetime(2030, 1, day, 19), content)
+
+
+class TestPrefixMerge:
+    """Same-date titles that extend another title merge only with an aggregator involved."""
+
+    AGGREGATOR = sorted(AGGREGATORS)[0]
+
+    def test_aggregator_suffix_merges(self):
+        events = [
+            _event('Hands on a Hardbody', 'Spreckels', 'a'),
+            _event('Hands on a Hardbody at Spreckels Performing Arts Center', self.AGGREGATOR, 'b'),
+            _event('Hands on a Hardbody at Spreckels Performing Arts Center', 'Spreckels', 'c', day=2),
+        ]
+        result = dedupe_cross_source(events, '.')
+        assert [e.raw('UID') for e in result] == ['a', 'c']
+        assert result[0].field('X-SOURCE') == f'Spreckels, {self.AGGREGATOR}'
+
+    def test_primary_sources_do_not_merge(self):
+        events = [
+            _event('After School Club', 'Library A', 'a'),
+            _event('After School Club Robotics Lab', 'Library B', 'b'),
+        ]
+        result = dedupe_cross_source(events, '.')
+        assert [e.raw('UID') for e in result] == ['a', 'b']
+
+    def test_short_titles_do_not_merge(self):
+        events = [
+            _event('Jazz Night', 'Venue', 'a'),
+            _event('Jazz Night at the Downtown Club', self.AGGREGATOR, 'b'),
+        ]
+        result = dedupe_cross_source(events, '.')
+        assert [e.raw('UID') for e in result] == ['a', 'b']
+
+
+def _fake_client(reply):
+    response = Mock()
+    response.content = [Mock(text=reply)]
+    response.usage = Mock(input_tokens=10, output_tokens=5)
+    client = Mock()
+    client.messages.create.return_value = response
+    return client
+
+
+def _fuzzy_events():
+    return [
+        _event('Swing Dance Social', 'Dance Hall', 'a'),
+        _event('Swing Social Night', sorted(AGGREGATORS)[0], 'b'),
+        _event('Poetry Reading', 'Library', 'c'),
+        _event('Solo Event', 'Library', 'd', day=2),
+    ]
+
+
+class TestFuzzyDedup:
+    """LLM clusters are applied by position; the rest of the list is untouched."""
+
+    def test_clusters_remove_duplicates(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test')
+        aggregator = sorted(AGGREGATORS)[0]
+        events = _fuzzy_events()
+        with patch('anthropic.Anthropic', return_value=_fake_client('[[2, 1], [3]]')):
+            result = dedupe_fuzzy(events, str(tmp_path))
+
+        assert [e.raw('UID') for e in result] == ['a', 'c', 'd']
+        assert result[0].field('X-SOURCE') == f'Dance Hall, {aggregator}'
+        assert 'Fuzzy matches found: 1' in (tmp_path / 'fuzzy_dedup.log').read_text()
+
+    def test_unchanged_dates_are_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test')
+        with patch('anthropic.Anthropic', return_value=_fake_client('[[2, 1], [3]]')):
+            first = dedupe_fuzzy(_fuzzy_events(), str(tmp_path))
+
+        client = _fake_client('[[1], [2], [3]]')
+        with patch('anthropic.Anthropic', return_value=client):
+            second = dedupe_fuzzy(_fuzzy_events(), str(tmp_path))
+
+        client.messages.create.assert_not_called()
+        assert [e.content for e in second] == [e.content for e in first]
+        log = (tmp_path / 'fuzzy_dedup.log').read_text()
+        assert 'Cache hits: 1' in log
+        assert 'Cache misses: 0' in log
+
+    def test_failed_dates_are_not_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test')
+        with patch('anthropic.Anthropic', return_value=_fake_client('not json')):
+            result = dedupe_fuzzy(_fuzzy_events(), str(tmp_path))
+        assert len(result) == 4
+
+        client = _fake_client('[[1], [2], [3]]')
+        with patch('anthropic.Anthropic', return_value=client):
+            dedupe_fuzzy(_fuzzy_events(), str(tmp_path))
+        assert client.messages.create.call_count == 1
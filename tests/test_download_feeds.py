@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Tests for scripts/download_feeds.py conditional fetching and reporting.
+
+Run: python -m pytest tests/test_download_feeds.py -v
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from scripts import download_feeds
+from scripts.download_feeds import conditional_headers, download_one, fetch_feed, file_sha256
+from tests.helpers import make_ics, make_vevent
+
+URL = 'https://example.com/calendar.ics'
+FILENAME = 'example_calendar_ics.ics'
+MEC_URL = 'https://www.browncounty.com/events/?ical=1'
+
+
+def _ics(*titles):
+    return make_ics(''.join(
+        make_vevent(t, 'DTSTART:20300101T100000', 'DTEND:20300101T110000', f'{t}@test')
+        for t in titles
+    )).encode()
+
+
+class StubResponse:
+
+    def __init__(self, status_code=200, content=b'', headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class StubSession:
+    """Answers get() from a list of responses (or exceptions), recording request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.sent.append(headers or {})
+        resp = self.responses.pop(0)
+        if isinstance(resp, Exception):
+            raise resp
+        return resp
+
+
+@pytest.fixture
+def outdir(tmp_path):
+    return str(tmp_path)
+
+
+def _fetch(session, outdir, entry=None, name='Example Venue', fallback=None):
+    return download_one(session, outdir, URL, name, fallback, entry)
+
+
+class TestConditionalHeaders:
+
+    def test_headers_from_entry_when_file_matches(self, tmp_path):
+        path = tmp_path / FILENAME
+        path.write_bytes(_ics('A'))
+        entry = {'sha256': file_sha256(str(path)), 'etag': '"v1"',
+                 'last_modified': 'Wed, 01 Jan 2030 00:00:00 GMT', 'source': 'Venue', 'source_url': None}
+        assert conditional_headers(entry, str(path), 'Venue') == {
+            'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 01 Jan 2030 00:00:00 GMT',
+        }
+
+    def test_sha256_mismatch_suppresses_headers(self, tmp_path):
+        path = tmp_path / FILENAME
+        path.write_bytes(_ics('A'))
+        entry = {'sha256': 'not-the-file', 'etag': '"v1"', 'source': 'Venue', 'source_url': None}
+        assert conditional_headers(entry, str(path), 'Venue') == {}
+        assert conditional_headers(None, str(path), 'Venue') == {}
+
+    def test_changed_source_suppresses_headers(self, tmp_path):
+        path = tmp_path / FILENAME
+        path.write_bytes(_ics('A'))
+        entry = {'sha256': file_sha256(str(path)), 'etag': '"v1"', 'source': 'Venue', 'source_url': None}
+        assert conditional_headers(entry, str(path), 'Renamed Venue') == {}
+        assert conditional_headers(entry, str(path), 'Venue', 'https://venue.example/') == {}
+
+
+class TestFetchFeed:
+
+    def test_network_error_leaves_file(self, tmp_path):
+        path = tmp_path / FILENAME
+        path.write_bytes(b'old')
+        session = StubSession(requests.ConnectionError('boom'))
+        assert fetch_feed(session, URL, str(path)) is None
+        assert path.read_bytes() == b'old'
+
+    def test_304_keeps_file_and_200_overwrites(self, tmp_path):
+        path = tmp_path / FILENAME
+        path.write_bytes(b'old')
+        fetch_feed(StubSession(StubResponse(304)), URL, str(path))
+        assert path.read_bytes() == b'old'
+        fetch_feed(StubSession(StubResponse(200, b'new')), URL, str(path))
+        assert path.read_bytes() == b'new'
+
+    @pytest.mark.parametrize('resp', [StubResponse(200, b''), StubResponse(500, b'oops'),
+                                      StubResponse(503, b'')])
+    def test_empty_or_error_body_is_a_failed_fetch(self, tmp_path, resp):
+        path = tmp_path / FILENAME
+        path.write_bytes(b'old')
+        assert fetch_feed(StubSession(resp), URL, str(path)) is None
+        assert path.read_bytes() == b'old'
+
+
+class TestDownloadOne:
+
+    def test_200_injects_source_and_records_entry(self, outdir):
+        session = StubSession(StubResponse(200, _ics('A', 'B'), {'ETag': '"v1"'}))
+        lines, entry = _fetch(session, outdir, fallback='https://venue.example/')
+        assert lines == [f'  ✅ {FILENAME}: 2 events (source: Example Venue)']
+        body = (Path(outdir) / FILENAME).read_text()
+        assert body.count('X-SOURCE:Example Venue') == 2
+        assert body.count('X-SOURCE-URL:https://venue.example/') == 2
+        assert entry['etag'] == '"v1"'
+        assert entry['source'] == 'Example Venue'
+        assert entry['source_url'] == 'https://venue.example/'
+        assert entry['changed'] is True
+
+    def test_304_reuses_file_without_reprocessing(self, outdir):
+        _, entry = _fetch(StubSession(StubResponse(200, _ics('A'), {'ETag': '"v1"'})), outdir)
+        before = (Path(outdir) / FILENAME).read_bytes()
+
+        session = StubSession(StubResponse(304))
+        lines, entry2 = _fetch(session, outdir, entry)
+        assert session.sent == [{'If-None-Match': '"v1"'}]
+        assert lines == [f'  ✅ {FILENAME}: 1 events (source: Example Venue) [not modified]']
+        assert (Path(outdir) / FILENAME).read_bytes() == before
+        assert entry2['etag'] == '"v1"'
+        assert entry2['changed'] is False
+
+    def test_identical_200_is_unchanged(self, outdir):
+        _, entry = _fetch(StubSession(StubResponse(200, _ics('A'))), outdir)
+        _, entry2 = _fetch(StubSession(StubResponse(200, _ics('A'))), outdir, entry)
+        assert entry2['changed'] is False
+        _, entry3 = _fetch(StubSession(StubResponse(200, _ics('A', 'B'))), outdir, entry2)
+        assert entry3['changed'] is True
+
+    def test_renamed_source_refetches_and_reinjects(self, outdir):
+        _, entry = _fetch(StubSession(StubResponse(200, _ics('A'), {'ETag': '"v1"'})), outdir)
+
+        session = StubSession(StubResponse(200, _ics('A'), {'ETag': '"v1"'}))
+        _, entry2 = _fetch(session, outdir, entry, name='New Name')
+        assert session.sent == [{}]
+        body = (Path(outdir) / FILENAME).read_text()
+        assert 'X-SOURCE:New Name' in body
+        assert 'X-SOURCE:Example Venue' not in body
+        assert entry2['source'] == 'New Name'
+
+    def test_network_error_reports_stale_file_as_failed(self, outdir):
+        _, entry = _fetch(StubSession(StubResponse(200, _ics('A', 'B'))), outdir)
+
+        lines, entry2 = _fetch(StubSession(requests.ConnectionError('boom')), outdir, entry)
+        assert lines == [f'  ❌ {FILENAME}: fetch failed, keeping 2 events from last run [stale]']
+        assert entry2['sha256'] == entry['sha256']
+        assert entry2['changed'] is False
+
+    def test_empty_body_does_not_reprocess_last_run(self, outdir):
+        ics = make_ics(
+            'BEGIN:VEVENT\r\nDTSTART;TZID=America/Indiana/Indianapolis:20300601T080000\r\n'
+            'SUMMARY:Fair\r\nUID:fair@test\r\nEND:VEVENT\r\n'
+        ).encode()
+        lines, _ = download_one(StubSession(StubResponse(200, ics)), outdir, MEC_URL, 'Brown County', None)
+        filename = lines[-1].split()[1].rstrip(':')
+        path = Path(outdir) / filename
+        assert 'TZID=America/Indiana/Indianapolis:20300601T120000' in path.read_text()
+        before = path.read_bytes()
+
+        lines, _ = download_one(StubSession(StubResponse(200, b'')), outdir, MEC_URL, 'Brown County', None)
+        assert lines == [f'  ❌ {filename}: fetch failed, keeping 1 events from last run [stale]']
+        assert path.read_bytes() == before
+
+    @pytest.mark.parametrize('resp', [StubResponse(200, b'', {'ETag': '"empty"'}),
+                                      StubResponse(502, b'', {'ETag': '"error"'})])
+    def test_failed_response_keeps_previous_cache_entry(self, outdir, resp):
+        _, entry = _fetch(StubSession(StubResponse(200, _ics('A'), {'ETag': '"v1"'})), outdir)
+
+        _, entry2 = _fetch(StubSession(resp), outdir, entry)
+        assert entry2 == dict(entry, changed=False)
+
+        # The next run still asks with the validators of the file on disk
+        session = StubSession(StubResponse(304))
+        _fetch(session, outdir, entry2)
+        assert session.sent == [{'If-None-Match': '"v1"'}]
+
+    def test_network_error_without_file(self, outdir):
+        lines, entry = _fetch(StubSession(requests.ConnectionError('boom')), outdir)
+        assert lines == [f'  ❌ {FILENAME}: fetch failed']
+        assert entry is None
+
+
+class OutOfOrderSession(StubSession):
+    """Holds the first feed's response until every other feed has been answered."""
+
+    def __init__(self, bodies):
+        super().__init__()
+        self.bodies = bodies
+        self.others_done = threading.Event()
+        self.answered = 0
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get(self, url, headers=None, **kwargs):
+        if url == next(iter(self.bodies)):
+            assert self.others_done.wait(5), 'downloads did not run concurrently'
+        else:
+            with self.lock:
+                self.answered += 1
+                if self.answered == len(self.bodies) - 1:
+                    self.others_done.set()
+        return StubResponse(200, self.bodies[url])
+
+
+class TestDownloadFeeds:
+
+    def test_report_follows_feed_order_under_concurrency(self, tmp_path, monkeypatch, capsys):
+        bodies = {f'https://example.com/feed{i}.ics': _ics(*'ABC'[:i]) for i in (1, 2, 3)}
+        city = tmp_path / 'cities' / 'testcity'
+        city.mkdir(parents=True)
+        (city / 'feeds.txt').write_text(''.join(f'# Feed {i}\n{url}\n' for i, url in enumerate(bodies, 1)))
+        session = OutOfOrderSession(bodies)
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv('SUPABASE_URL', raising=False)
+        monkeypatch.setattr(download_feeds, 'make_session', lambda jobs, per_host: session)
+
+        download_feeds.download_feeds('testcity', jobs=3)
+
+        report = [line for line in capsys.readouterr().out.splitlines() if '✅' in line]
+        assert report == [
+            f'  ✅ example_feed{i}_ics.ics: {i} events (source: Feed {i})' for i in (1, 2, 3)
+        ]
+        cache = download_feeds.load_feed_cache(str(city))
+        assert set(cache) == set(bodies)
+        assert all(entry['changed'] for entry in cache.values())
@@ -163,7 +163,7 @@ class TestFetchPage:
         with open(self.FIXTURE_PATH, encoding="utf-8") as f:
             fixture_html = f.read()
 
-        with patch("scrapers.lib.em_events.requests.post") as mock_post:
+        with patch("scrapers.lib.http_client.ScopedHttpClient.post") as mock_post:
             mock_post.return_value.text = fixture_html
             mock_post.return_value.status_code = 200
             mock_post.return_value.ok = True
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Tests for scripts/events_delta.py.
+
+Run: python -m pytest tests/test_events_delta.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from scripts.events_delta import build_payload, compute_delta
+
+
+def _event(uid, title, category=None):
+    return {'title': title, 'start_time': '2030-01-01T10:00:00', 'source_uid': uid,
+            'city': '', 'category': category}
+
+
+def _write(path, events):
+    path.write_text(json.dumps(events, indent=2))
+    return str(path)
+
+
+class TestComputeDelta:
+
+    def test_inserts_updates_deletes(self, tmp_path):
+        prev = _write(tmp_path / 'prev.json', [
+            _event('same', 'Jazz Jam', 'music'),
+            _event('edited', 'Yoga'),
+            _event('recategorized', 'Lecture'),
+            _event('gone', 'Old Show'),
+        ])
+        current = _write(tmp_path / 'events.json', [
+            _event('same', 'Jazz Jam', 'music'),
+            _event('edited', 'Yoga at Noon'),
+            _event('recategorized', 'Lecture', 'education'),
+            _event('added', 'New Thing'),
+            _event('added', 'Duplicate uid, dropped as load-events does'),
+        ])
+
+        delta = compute_delta(prev, current, 'davis')
+
+        assert [e['source_uid'] for e in delta['inserts']] == ['added']
+        assert delta['inserts'][0]['title'] == 'New Thing'
+        assert [e['source_uid'] for e in delta['updates']] == ['edited', 'recategorized']
+        assert delta['deletes'] == ['gone']
+        assert delta['unchanged'] == 1
+        assert delta['source_uids'] == ['same', 'edited', 'recategorized', 'added']
+
+    def test_city_default_matches_server(self, tmp_path):
+        # load-events fills in an empty city, so '' and the city name are the same row
+        prev = _write(tmp_path / 'prev.json', [{**_event('a', 'Jazz Jam'), 'city': 'davis'}])
+        current = _write(tmp_path / 'events.json', [_event('a', 'Jazz Jam')])
+        assert compute_delta(prev, current, 'davis')['unchanged'] == 1
+
+
+class TestBuildPayload:
+
+    def test_full_without_previous(self, tmp_path):
+        current = _write(tmp_path / 'events.json', [_event('a', 'Jazz Jam'), _event('b', 'Yoga')])
+        payload, _ = build_payload('davis', current)
+        assert payload == {'city': 'davis', 'events': json.loads(Path(current).read_text())}
+
+    def test_delta_payload(self, tmp_path):
+        prev = _write(tmp_path / 'prev.json', [_event('a', 'Jazz Jam'), _event('gone', 'Old')])
+        current = _write(tmp_path / 'events.json', [_event('a', 'Jazz Jam'), _event('b', 'Yoga')])
+        payload, summary = build_payload('davis', current, prev)
+        assert payload['mode'] == 'delta'
+        assert [e['source_uid'] for e in payload['events']] == ['b']
+        assert payload['source_uids'] == ['a', 'b']
+        assert summary == 'delta upload: 1 inserted, 0 updated, 1 deleted, 1 unchanged'
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Tests for the shared scraper HTTP client, against a local stub server."""
+
+import gzip
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scrapers.lib import http_client
+from scrapers.lib.http_client import HostRateLimiter, HttpClient
+from scrapers.lib.jsonld import JsonLdScraper
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    # path -> list of statuses to serve in turn (last one repeats)
+    statuses: dict = {}
+    hits: dict = {}
+    ports: set = set()
+    # path -> headers of the last request, lower-cased names
+    received: dict = {}
+
+    def do_GET(self):
+        StubHandler.hits[self.path] = StubHandler.hits.get(self.path, 0) + 1
+        StubHandler.received[self.path] = {k.lower(): v for k, v in self.headers.items()}
+        StubHandler.ports.add(self.client_address[1])
+        queue = StubHandler.statuses.get(self.path, [200])
+        status = queue.pop(0) if len(queue) > 1 else queue[0]
+        body = b'ok'
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    StubHandler.statuses, StubHandler.hits, StubHandler.ports = {}, {}, set()
+    StubHandler.received = {}
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _client(**kwargs):
+    sleeps = []
+    return HttpClient(sleep=sleeps.append, **kwargs), sleeps
+
+
+class TestHttpClient:
+
+    def test_connections_are_reused_and_gzip_decoded(self, server):
+        client, _ = _client()
+        for _ in range(5):
+            response = client.get(f"{server}/page")
+            assert response.text == 'ok'
+        assert StubHandler.hits['/page'] == 5
+        assert len(StubHandler.ports) == 1
+
+    def test_retries_transient_statuses(self, server):
+        StubHandler.statuses['/flaky'] = [503, 429, 200]
+        client, sleeps = _client(max_retries=3)
+        assert client.get(f"{server}/flaky").status_code == 200
+        assert StubHandler.hits['/flaky'] == 3
+        # Backoff after the 503, Retry-After: 0 after the 429
+        assert len(sleeps) == 2 and sleeps[0] >= 1.0 and sleeps[1] == 0
+
+    def test_returns_last_response_when_retries_run_out(self, server):
+        StubHandler.statuses['/down'] = [502]
+        client, sleeps = _client(max_retries=2)
+        assert client.get(f"{server}/down").status_code == 502
+        assert StubHandler.hits['/down'] == 2
+
+    def test_client_errors_are_not_retried(self, server):
+        StubHandler.statuses['/missing'] = [404]
+        client, sleeps = _client(max_retries=3)
+        assert client.get(f"{server}/missing").status_code == 404
+        assert StubHandler.hits['/missing'] == 1 and sleeps == []
+
+
+class TestHostRateLimiter:
+
+    def test_spaces_requests_per_host(self):
+        now, sleeps = [0.0], []
+        limiter = HostRateLimiter(rate=2.0, clock=lambda: now[0], sleep=sleeps.append)
+        for _ in range(3):
+            limiter.wait('a.example')
+        limiter.wait('b.example')
+        assert sleeps == [0.5, 1.0]
+
+    def test_host_override_and_disable(self):
+        sleeps = []
+        limiter = HostRateLimiter(rate=1.0, clock=lambda: 0.0, sleep=sleeps.append)
+        limiter.set_rate('fast.example', 0)
+        for _ in range(3):
+            limiter.wait('fast.example')
+        assert sleeps == []
+
+
+class SlowHostScraper(JsonLdScraper):
+    host_rate_limits = {'slow.example': 0.5}
+
+
+class TestScraperScope:
+
+    @pytest.fixture(autouse=True)
+    def fresh_client(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(http_client, '_client', HttpClient(host_rate=0, sleep=sleeps.append))
+        return sleeps
+
+    def test_host_rate_limits_stay_with_their_scraper(self):
+        limiter = http_client.get_http_client().limiter
+        limiter._clock = lambda: 0.0
+        sleeps = []
+        limiter._sleep = sleeps.append
+        for _ in range(2):
+            SlowHostScraper().http.throttle('https://slow.example/a')
+        assert sleeps == [2.0]
+        # A later scraper in the same process gets the global rate (none)
+        sleeps.clear()
+        for _ in range(2):
+            JsonLdScraper().http.throttle('https://slow.example/a')
+        assert sleeps == []
+        assert limiter.host_rates == {}
+
+    def test_jsonld_fetch_sends_only_its_own_headers(self, server):
+        assert JsonLdScraper().fetch_html(f"{server}/page") == 'ok'
+        received = StubHandler.received['/page']
+        assert received['user-agent'] == JsonLdScraper.headers['User-Agent']
+        assert received['accept'] == JsonLdScraper.headers['Accept']
+        # None of the requests session's defaults
+        assert 'gzip' not in received.get('accept-encoding', '')
+        assert received.get('connection') != 'keep-alive'
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for the single-pass ICS property tokenizer (scripts/ics_props.py).
+
+Run: python -m pytest tests/test_ics_props.py -v
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from scripts.ics_props import parse_properties, prop_params, prop_raw, prop_text
+
+
+CONTENT = (
+    "UID:abc@example.com\r\n"
+    "DTSTART;TZID=America/New_York:20250115T190000\r\n"
+    "SUMMARY:Open Mic\\, Poetry \\; Songs\r\n"
+    "DESCRIPTION:A long description that the producer folded across\r\n"
+    " two lines\\nwith an escaped newline\r\n"
+    "LOCATION;ALTREP=\"https://maps.example.com/x\":Main St\\, Santa Rosa\\, CA\r\n"
+    "X-SOURCE-ID:venue\r\n"
+    "X-SOURCE:The Venue\r\n"
+    "ATTACH;FMTTYPE=image/png:https://img.example.com/1.png\r\n"
+    "ATTACH;FMTTYPE=image/jpeg:https://img.example.com/2.jpg"
+)
+
+
+class TestParseProperties:
+    def test_params_and_raw_value_are_kept(self):
+        props = parse_properties(CONTENT)
+        assert prop_raw(props, 'DTSTART') == '20250115T190000'
+        assert prop_params(props, 'DTSTART') == 'TZID=America/New_York'
+
+    def test_folded_lines_are_unfolded(self):
+        props = parse_properties(CONTENT)
+        assert prop_text(props, 'DESCRIPTION') == (
+            'A long description that the producer folded acrosstwo lines with an escaped newline'
+        )
+        assert prop_text(props, 'DESCRIPTION', newline='\n').endswith('two lines\nwith an escaped newline')
+
+    def test_text_is_unescaped(self):
+        assert prop_text(parse_properties(CONTENT), 'SUMMARY') == 'Open Mic, Poetry ; Songs'
+
+    def test_quoted_colon_in_params(self):
+        props = parse_properties(CONTENT)
+        assert prop_params(props, 'LOCATION') == 'ALTREP="https://maps.example.com/x"'
+        assert prop_text(props, 'LOCATION') == 'Main St, Santa Rosa, CA'
+
+    def test_prefix_names_do_not_collide(self):
+        props = parse_properties(CONTENT)
+        assert prop_text(props, 'X-SOURCE') == 'The Venue'
+        assert prop_text(props, 'X-SOURCE-ID') == 'venue'
+
+    def test_repeated_properties_in_order(self):
+        props = parse_properties(CONTENT)
+        assert [v for _, v in props['ATTACH']] == [
+            'https://img.example.com/1.png', 'https://img.example.com/2.jpg',
+        ]
+
+    def test_names_are_case_insensitive_and_lf_endings(self):
+        props = parse_properties("summary:Lower\nUid:x")
+        assert prop_text(props, 'SUMMARY') == 'Lower'
+        assert prop_raw(props, 'UID') == 'x'
+
+    def test_missing_and_empty(self):
+        props = parse_properties("SUMMARY:\r\nSUMMARY:Second")
+        assert prop_text(props, 'SUMMARY') == 'Second'
+        assert prop_text(props, 'URL') is None
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for scripts/ics_to_json.py title clustering and output formats.
+
+Run: python -m pytest tests/test_ics_to_json.py -v
+"""
+
+import hashlib
+import json
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from scripts.ics_to_json import (
+    cluster_by_title_similarity, events_meta_path, ics_to_json, iter_events, token_set_similarity,
+)
+from tests.helpers import make_ics, make_vevent
+
+
+def _slot(*titles, location=''):
+    return [{'title': t, 'location': location, 'start_time': '2030-01-01T10:00'} for t in titles]
+
+
+def _clusters(events):
+    by_id = {}
+    for e in cluster_by_title_similarity(events):
+        if 'cluster_id' in e:
+            by_id.setdefault(e['cluster_id'], []).append(e['title'])
+    return sorted(sorted(c) for c in by_id.values())
+
+
+class TestClusterByTitleSimilarity:
+
+    def test_docstring_examples(self):
+        events = _slot(
+            'Family Storytime', 'Bilingual Family Storytime',
+            'Community Coffee Tasting', 'Community Yoga',
+            'Mushroom Hike', 'Mushroom Identification',
+        )
+        assert _clusters(events) == [['Bilingual Family Storytime', 'Family Storytime']]
+
+    def test_titles_without_shared_words_can_cluster(self):
+        # No common word, but the combined strings are near-identical
+        assert token_set_similarity('Storytime', 'Storytimes') >= 0.85
+        assert _clusters(_slot('Storytime', 'Storytimes', 'Lego Club')) == [['Storytime', 'Storytimes']]
+
+    def test_different_locations_do_not_cluster(self):
+        events = _slot('Tech Help', location='Main Library') + _slot('One-On-One Tech Help', location='Branch')
+        assert _clusters(events) == []
+
+
+@pytest.fixture
+def combined_ics(tmp_path):
+    day = (date.today() + timedelta(days=2)).strftime('%Y%m%d')
+    events = [
+        make_vevent('Family Storytime', f'DTSTART:{day}T100000', f'DTEND:{day}T110000', 'a@test'),
+        make_vevent('Bilingual Family Storytime', f'DTSTART:{day}T100000', f'DTEND:{day}T110000', 'b@test'),
+        make_vevent('Café Night', f'DTSTART:{day}T190000', f'DTEND:{day}T210000', 'c@test'),
+    ]
+    path = tmp_path / 'combined.ics'
+    path.write_text(make_ics(''.join(events)), newline='')
+    return path
+
+
+class TestOutputFormats:
+
+    def test_formats_hold_the_same_events(self, tmp_path, combined_ics):
+        pretty = ics_to_json(str(combined_ics), str(tmp_path / 'pretty.json'))
+        ics_to_json(str(combined_ics), str(tmp_path / 'compact.json'), output_format='compact')
+        ics_to_json(str(combined_ics), str(tmp_path / 'events.ndjson'), output_format='ndjson')
+
+        assert json.loads((tmp_path / 'pretty.json').read_text()) == pretty
+        assert json.loads((tmp_path / 'compact.json').read_text()) == pretty
+        lines = (tmp_path / 'events.ndjson').read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line) for line in lines] == pretty
+
+    def test_meta_sidecar(self, tmp_path, combined_ics):
+        out = tmp_path / 'events.json'
+        ics_to_json(str(combined_ics), str(out))
+
+        meta = json.loads(events_meta_path(out).read_text())
+        assert events_meta_path(out).name == 'events.meta.json'
+        assert meta['count'] == 3
+        assert meta['clusters'] == 1
+        assert meta['format'] == 'pretty'
+        assert meta['sha256'] == hashlib.sha256(out.read_bytes()).hexdigest()
+
+    @pytest.mark.parametrize('output_format', ['pretty', 'compact', 'ndjson'])
+    def test_iter_events_streams_every_format(self, tmp_path, combined_ics, output_format):
+        out = tmp_path / 'events.json'
+        events = ics_to_json(str(combined_ics), str(out), output_format=output_format)
+        # A tiny chunk size forces elements to span buffer refills
+        assert list(iter_events(out, chunk_size=7)) == events
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Tests for scripts/merge_categories.py.
+
+Run: python -m pytest tests/test_merge_categories.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from scripts.ics_to_json import iter_events, read_events_meta, write_events, write_events_meta
+from scripts.merge_categories import merge_categories
+
+
+def _event(uid, title, category=None):
+    return {'title': title, 'start_time': '2030-01-01T10:00:00', 'source_uid': uid, 'category': category}
+
+
+def _write(path, events, output_format='pretty'):
+    digest = write_events(events, path, output_format)
+    write_events_meta(path, events, digest, output_format)
+
+
+class TestMergeCategories:
+
+    def test_carries_categories_and_reports_delta(self, tmp_path):
+        prev, current = tmp_path / 'events.prev.json', tmp_path / 'events.json'
+        _write(prev, [_event('a', 'Jazz Jam', 'music'), _event('b', 'Yoga', 'fitness'), _event('gone', 'Old', 'arts')])
+        _write(current, [_event('a', 'Jazz Jam'), _event('b', 'Yoga at Noon'), _event('c', 'New Thing')], 'compact')
+
+        carried, delta = merge_categories(str(prev), str(current))
+
+        assert carried == 2
+        assert [e['category'] for e in iter_events(current)] == ['music', 'fitness', None]
+        assert delta['new'] == ['c']
+        assert delta['changed'] == ['b']
+        assert delta['removed'] == ['gone']
+        assert delta['unchanged'] == 1
+        # Rewritten in its own format, with a fresh sidecar
+        assert not current.read_text().startswith('[\n')
+        assert read_events_meta(current)['format'] == 'compact'
+
+    def test_rewrites_compact_without_sidecar(self, tmp_path):
+        prev, current = tmp_path / 'events.prev.json', tmp_path / 'events.json'
+        _write(prev, [_event('a', 'Jazz Jam', 'music')])
+        current.write_text(json.dumps([_event('a', 'Jazz Jam')], indent=2))
+
+        carried, _ = merge_categories(str(prev), str(current))
+
+        assert carried == 1
+        assert current.read_text().startswith('[{"title":"Jazz Jam",')
+        assert read_events_meta(current)['format'] == 'compact'
+
+    def test_skips_rewrite_when_nothing_carried(self, tmp_path):
+        prev, current = tmp_path / 'events.prev.json', tmp_path / 'events.json'
+        _write(prev, [_event('a', 'Jazz Jam')])
+        _write(current, [_event('a', 'Jazz Jam', 'music')])
+        before = current.stat().st_mtime_ns
+
+        carried, delta = merge_categories(str(prev), str(current))
+
+        assert carried == 0
+        assert current.stat().st_mtime_ns == before
+        assert delta['unchanged'] == 1
+
+    def test_reads_ndjson_previous_file(self, tmp_path):
+        prev, current = tmp_path / 'events.prev.json', tmp_path / 'events.json'
+        prev.write_text('\n'.join(json.dumps(e) for e in [_event('a', 'Jazz Jam', 'music')]) + '\n')
+        _write(current, [_event('a', 'Jazz Jam')])
+
+        carried, _ = merge_categories(str(prev), str(current))
+
+        assert carried == 1
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Tests for batched, concurrent classification in scripts/ollama_classify.py.
+
+Runs against a local stub of Ollama's /api/generate that answers over
+HTTP/1.1 keep-alive connections.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+# The module requires Supabase settings at import time
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_KEY', 'test')
+
+from scripts.ollama_classify import CATEGORIES, OllamaClient, classify_events  # noqa: E402
+
+
+def _category(title):
+    return CATEGORIES[len(title) % len(CATEGORIES)]
+
+
+class StubOllama(BaseHTTPRequestHandler):
+    """/api/generate stand-in: numbered prompts get a JSON object, single ones a name."""
+
+    protocol_version = 'HTTP/1.1'
+    delay = 0.05
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.bodies.append(body)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        time.sleep(self.delay)
+        with server.lock:
+            server.active -= 1
+
+        titles = re.findall(r'^(\d+)\. Title: "(.*?)"', body['prompt'], re.MULTILINE)
+        if titles:
+            response = json.dumps({i: _category(t) for i, t in titles})
+        else:
+            response = _category(re.search(r'^Title: (.*)$', body['prompt'], re.MULTILINE).group(1))
+        payload = json.dumps({'response': response, 'done': True}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOllama)
+    server.lock = threading.Lock()
+    server.bodies = []
+    server.connections = server.active = server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = OllamaClient(f'http://127.0.0.1:{server.server_address[1]}', timeout=10)
+    yield server, client
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def _events(n, repeats=1):
+    return [
+        {'id': n * r + i, 'title': f'Event {"x" * i}', 'location': 'Hall'}
+        for r in range(repeats) for i in range(n)
+    ]
+
+
+class TestClassifyEvents:
+
+    def test_batches_one_request_per_batch_of_unique_titles(self, ollama, capsys):
+        server, client = ollama
+        events = _events(10, repeats=3)
+        results, updates = classify_events(events, '', 'm', client, batch_size=4, parallel=1)
+
+        assert len(server.bodies) == 3
+        assert all(body['format'] == 'json' and body['keep_alive'] for body in server.bodies)
+        assert [event['id'] for event, _ in results] == list(range(10))
+        assert all(category == _category(event['title']) for event, category in results)
+        # Every instance of a title gets its representative's category
+        assert sorted(updates) == sorted((e['id'], _category(e['title'])) for e in events)
+        assert '10 unique titles (deduplicated from 30 events)' in capsys.readouterr().out
+
+    def test_requests_reuse_one_connection_per_worker(self, ollama):
+        server, client = ollama
+        classify_events(_events(12), '', 'm', client, batch_size=2, parallel=1)
+        assert len(server.bodies) == 6
+        assert server.connections == 1
+
+    def test_parallel_batches_overlap_in_order(self, ollama, capsys):
+        server, client = ollama
+        results, _ = classify_events(_events(16), '', 'm', client, batch_size=2, parallel=4)
+        assert server.peak > 1
+        assert server.connections <= 4
+        assert [event['id'] for event, _ in results] == list(range(16))
+        batch_lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith('  Batch')]
+        assert batch_lines == [f'  Batch {n}/8 (2 events)' for n in range(1, 9)]
+
+    def test_batch_size_one_uses_single_event_prompt(self, ollama):
+        server, client = ollama
+        results, _ = classify_events(_events(3), '', 'm', client, batch_size=1)
+        assert 'format' not in server.bodies[0]
+        assert all(category == _category(event['title']) for event, category in results)
+
+    def test_dropped_connection_is_reopened(self, ollama):
+        server, client = ollama
+        classify_events(_events(2), '', 'm', client, batch_size=2, parallel=1)
+        # Simulate the server closing an idle keep-alive connection
+        [conn] = client._idle
+        conn.sock.close()
+        results, _ = classify_events(_events(2), '', 'm', client, batch_size=2, parallel=1)
+        assert all(category for _, category in results)
+        assert server.connections == 2
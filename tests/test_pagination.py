@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Tests for the concurrent page fetcher used by paginated scraper libraries."""
+
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scrapers.lib.pagination import fetch_pages
+
+
+class PageSource:
+    """Fake paginated API: records fetched pages and peak concurrency."""
+
+    def __init__(self, last_page, delay=0.01):
+        self.last_page = last_page
+        self.delay = delay
+        self.fetched = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, page):
+        with self.lock:
+            self.fetched.append(page)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(random.uniform(0, self.delay))
+        with self.lock:
+            self.active -= 1
+        items = [f"p{page}-{i}" for i in range(3)] if page <= self.last_page else []
+        return {'total_pages': self.last_page, 'items': items}
+
+
+class TestFetchPages:
+
+    def test_known_page_count_is_fetched_in_page_order(self):
+        source = PageSource(last_page=12)
+        results = list(fetch_pages(source, page_count=lambda d: d['total_pages'], max_workers=4))
+        assert [page for page, _ in results] == list(range(1, 13))
+        assert [d['items'][0] for _, d in results] == [f"p{n}-0" for n in range(1, 13)]
+        assert sorted(source.fetched) == list(range(1, 13))
+        assert 1 < source.peak <= 4
+
+    def test_max_pages_caps_the_count(self):
+        source = PageSource(last_page=50, delay=0)
+        results = list(fetch_pages(source, page_count=lambda d: d['total_pages'], max_pages=5))
+        assert [page for page, _ in results] == [1, 2, 3, 4, 5]
+
+    def test_unknown_count_stops_when_caller_breaks(self):
+        source = PageSource(last_page=6)
+        seen = []
+        for page, data in fetch_pages(source, max_workers=3):
+            if not data['items']:
+                break
+            seen.append(page)
+        assert seen == [1, 2, 3, 4, 5, 6]
+        # At most max_workers pages past the empty one were requested
+        assert max(source.fetched) <= 7 + 3
+
+    def test_single_worker_is_sequential(self):
+        source = PageSource(last_page=4, delay=0)
+        list(fetch_pages(source, page_count=lambda d: d['total_pages'], max_workers=1))
+        assert source.fetched == [1, 2, 3, 4]
+        assert source.peak == 1
+
+    def test_bad_first_page_count_fetches_nothing_more(self):
+        source = PageSource(last_page=3, delay=0)
+        results = list(fetch_pages(source, page_count=lambda d: d['missing'], max_pages=1))
+        assert [page for page, _ in results] == [1]
+
+    def test_errors_surface_at_their_page(self):
+        def fetch(page):
+            if page == 3:
+                raise RuntimeError('boom')
+            return page
+
+        pages = fetch_pages(fetch, page_count=lambda _: 5)
+        assert [next(pages)[0], next(pages)[0]] == [1, 2]
+        with pytest.raises(RuntimeError):
+            next(pages)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Tests for the rule-based pre-classifier in scripts/preclassify.py."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from scripts.preclassify import PreClassifier, Rule, category_rules  # noqa: E402
+
+CATEGORIES = ['Music / Concerts', 'Family / Kids', 'Government / Civic', 'Sports / Fitness', 'Games / Trivia']
+
+
+def _pre(rules=(), overrides=None):
+    return PreClassifier(category_rules(CATEGORIES) + list(rules), overrides, CATEGORIES)
+
+
+class TestRules:
+
+    def test_source_matches_name_feed_id_or_url_host(self):
+        pre = _pre([Rule('source', 'maxpreps', 'Sports / Fitness')])
+        assert pre.match({'title': 'Varsity Football', 'source_id': 'maxpreps_piner_high'})[0] == 'Sports / Fitness'
+        assert pre.match({'title': 'Varsity Football',
+                          'url': 'https://www.maxpreps.com/games/1'})[0] == 'Sports / Fitness'
+        assert pre.match({'title': 'Varsity Football', 'source': 'Piner High'}) == (None, None)
+
+    def test_category_names_and_parts_match_ics_tags(self):
+        pre = _pre()
+        assert pre.match({'title': 'x', 'ics_categories': ['concerts']})[0] == 'Music / Concerts'
+        assert pre.match({'title': 'x', 'ics_categories': [' kids ']})[0] == 'Family / Kids'
+        assert pre.match({'title': 'x', 'ics_categories': 'Music / Concerts'})[0] == 'Music / Concerts'
+        # Tags that are only part of a word don't match
+        assert pre.match({'title': 'x', 'ics_categories': ['Musical Theatre']}) == (None, None)
+
+    def test_conflicting_matches_fall_through(self):
+        pre = _pre([Rule('title', r'\btrivia\b', 'Games / Trivia')])
+        event = {'title': 'Music Trivia', 'ics_categories': ['Music', 'Kids']}
+        assert pre.match(event) == ('Games / Trivia', r'title:\btrivia\b')
+        assert pre.match({**event, 'title': 'Bandstand'}) == (None, None)
+
+    def test_source_beats_ics_tag_beats_title(self):
+        pre = _pre([Rule('source', 'legistar', 'Government / Civic'),
+                    Rule('title', r'\btrivia\b', 'Games / Trivia')])
+        event = {'title': 'Trivia', 'ics_categories': ['Music'], 'source_id': 'legistar'}
+        assert pre.match(event)[0] == 'Government / Civic'
+        assert pre.match({**event, 'source_id': ''})[0] == 'Music / Concerts'
+
+    def test_unknown_categories_are_skipped(self, capsys):
+        pre = _pre([Rule('title', 'poetry', 'Poems')])
+        assert pre.match({'title': 'Poetry slam'}) == (None, None)
+        assert 'unknown category' in capsys.readouterr().err
+
+
+class TestOverrides:
+
+    def test_override_title_and_location_win(self):
+        overrides = [
+            {'event_title': 'Lego Club', 'event_location': 'Main Library', 'category': 'Family / Kids'},
+            {'events': {'title': 'Open Mic', 'location': 'Cafe'}, 'category': 'Music / Concerts'},
+        ]
+        pre = _pre([Rule('title', 'club', 'Games / Trivia')], overrides)
+        assert pre.match({'title': 'LEGO  club', 'location': 'main library'}) == (
+            'Family / Kids', 'override:title+location')
+        assert pre.match({'title': 'Lego Club', 'location': 'Branch'})[0] == 'Games / Trivia'
+        assert pre.match({'title': 'Open Mic', 'location': 'Cafe'})[0] == 'Music / Concerts'
+
+    def test_disagreeing_overrides_are_ignored(self):
+        overrides = [
+            {'event_title': 'Game Night', 'event_location': 'Hall', 'category': 'Games / Trivia'},
+            {'event_title': 'Game Night', 'event_location': 'Hall', 'category': 'Family / Kids'},
+        ]
+        assert _pre(overrides=overrides).match({'title': 'Game Night', 'location': 'Hall'}) == (None, None)
+
+
+class TestReport:
+
+    def test_hit_rate_and_per_rule_counts(self):
+        pre = _pre([Rule('source', 'songkick', 'Music / Concerts')])
+        for event in [{'title': 'A', 'source_id': 'songkick'}] * 3 + [{'title': 'B'}]:
+            pre.classify(event)
+        assert pre.report() == [
+            'Rule pre-classifier: 3/4 events (75.0%) resolved without the API',
+            '      3  source:songkick → Music / Concerts',
+        ]
+
+    def test_shipped_rules_load(self):
+        pre = PreClassifier.load()
+        assert pre.rules['source'] and pre.rules['title']
+        assert pre.match({'title': 'Board of Supervisors', 'source_id': 'legistar'})[0] == 'Government / Civic'
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Tests for run_scrapers_from_db.run_rows in subprocess and --in-process modes."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import scraper_runner
+from scripts.run_scrapers_from_db import run_rows
+from scripts.scraper_runner import resolve_command
+
+SCRIPTS = {
+    # BaseScraper-style: Name.main() under the guard, logging to stderr
+    'class_entry.py': '''
+import argparse, logging
+
+class DemoScraper:
+    @classmethod
+    def main(cls):
+        logging.basicConfig(level=logging.INFO,
+                            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        parser = argparse.ArgumentParser()
+        parser.add_argument('--output')
+        args = parser.parse_args()
+        print(f"wrote {args.output}")
+        logging.getLogger('DemoScraper').warning('one event skipped')
+
+if __name__ == '__main__':
+    DemoScraper.main()
+''',
+    'exits.py': '''
+import sys
+
+def main():
+    print("giving up")
+    return 3
+
+if __name__ == '__main__':
+    sys.exit(main())
+''',
+    'raises.py': '''
+def main():
+    raise ValueError("bad page")
+
+if __name__ == '__main__':
+    main()
+''',
+    'hangs.py': '''
+import time
+
+def main():
+    try:
+        time.sleep(30)
+    except Exception:
+        print("swallowed")
+
+if __name__ == '__main__':
+    main()
+''',
+    'ignores_alarm.py': '''
+import signal, time
+
+def main():
+    # Like a scraper stuck in a C call: the SIGALRM timeout can't interrupt it
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(30)
+
+if __name__ == '__main__':
+    main()
+''',
+    'chatty.py': '''
+import sys, time
+
+def main():
+    for i in range(3):
+        print(f"{sys.argv[1]} line {i}", flush=True)
+        time.sleep(0.05)
+
+if __name__ == '__main__':
+    main()
+''',
+    'stamps.py': '''
+import time
+
+def main():
+    start = time.monotonic()
+    time.sleep(0.5)
+    print("span", start, time.monotonic())
+
+if __name__ == '__main__':
+    main()
+''',
+    'inline.py': '''
+import sys
+if __name__ == '__main__':
+    print("inline", sys.argv[1:])
+''',
+}
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    for name, source in SCRIPTS.items():
+        (tmp_path / name).write_text(source)
+    return tmp_path
+
+
+def _row(scripts, name, args=''):
+    return {'name': name, 'scraper_cmd': f"python {scripts / name} {args}".strip()}
+
+
+def _run(capsys, rows, **kwargs):
+    failures = run_rows('testcity', rows, '3', **kwargs)
+    return failures, capsys.readouterr().out.splitlines()
+
+
+class TestResolveCommand:
+
+    def test_resolves_entry_points(self, scripts):
+        assert resolve_command(f"python {scripts / 'class_entry.py'} --output 'a b.ics'") == (
+            str(scripts / 'class_entry.py'), ['--output', 'a b.ics'])
+        assert resolve_command(f"python {scripts / 'exits.py'}")
+
+    def test_shell_syntax_and_inline_guards_are_not_resolved(self, scripts):
+        assert resolve_command(f"python {scripts / 'exits.py'} > out.txt") is None
+        assert resolve_command(f"python {scripts / 'exits.py'} && echo done") is None
+        assert resolve_command(f"python {scripts / 'exits.py'} --name \"$NAME\"") is None
+        assert resolve_command(f"python {scripts / 'inline.py'} x") is None
+
+
+class TestRunRows:
+
+    def test_in_process_output_matches_subprocess(self, scripts, capsys):
+        rows = [
+            _row(scripts, 'class_entry.py', '--output x.ics'),
+            _row(scripts, 'exits.py'),
+            _row(scripts, 'inline.py', 'arg'),
+        ]
+        sub_failures, sub_lines = _run(capsys, rows)
+        inproc_failures, inproc_lines = _run(capsys, rows, in_process=True)
+
+        assert sub_failures == inproc_failures == 1
+        # Log lines carry timestamps; compare everything else
+        strip = [line.split(' - ', 1)[-1] for line in sub_lines]
+        assert strip == [line.split(' - ', 1)[-1] for line in inproc_lines]
+        assert inproc_lines[0] == '[testcity][scraper] RUN class_entry.py'
+        assert '[testcity][scraper] wrote x.ics' in inproc_lines
+        assert '[testcity][scraper] EXIT 3 exits.py' in inproc_lines
+        assert "[testcity][scraper] inline ['arg']" in inproc_lines
+
+    def test_exception_reports_traceback(self, scripts, capsys):
+        failures, lines = _run(capsys, [_row(scripts, 'raises.py')], in_process=True)
+        assert failures == 1
+        assert '[testcity][scraper] Traceback (most recent call last):' in lines
+        assert '[testcity][scraper] ValueError: bad page' in lines
+        assert lines[-1] == '[testcity][scraper] EXIT 1 raises.py'
+
+    def test_timeout_is_not_swallowed(self, scripts, capsys):
+        rows = [_row(scripts, 'hangs.py'), _row(scripts, 'exits.py')]
+        failures, lines = _run(capsys, rows, in_process=True, timeout=0.5)
+        assert failures == 2
+        assert '[testcity][scraper] swallowed' not in lines
+        assert '[testcity][scraper] EXIT 124 hangs.py' in lines
+        # The worker survives to run the next row
+        assert '[testcity][scraper] EXIT 3 exits.py' in lines
+
+    def test_unresponsive_worker_is_killed(self, scripts, capsys, monkeypatch):
+        monkeypatch.setattr(scraper_runner, 'TIMEOUT_GRACE', 0.5)
+        rows = [_row(scripts, 'ignores_alarm.py'), _row(scripts, 'exits.py')]
+        start = time.monotonic()
+        failures, lines = _run(capsys, rows, in_process=True, timeout=0.5)
+        assert time.monotonic() - start < 10
+        assert failures == 2
+        assert '[testcity][scraper] Timed out after 0.5s' in lines
+        assert '[testcity][scraper] EXIT 124 ignores_alarm.py' in lines
+        # The restarted pool runs the next row
+        assert '[testcity][scraper] EXIT 3 exits.py' in lines
+
+
+class TestJobs:
+
+    @pytest.mark.parametrize('in_process', [False, True])
+    def test_blocks_are_grouped_in_row_order(self, scripts, capsys, in_process):
+        rows = [_row(scripts, 'chatty.py', f"r{n}") | {'name': f"row {n}"} for n in range(6)]
+        failures, lines = _run(capsys, rows, jobs=3, in_process=in_process)
+        assert failures == 0
+        expected = []
+        for n in range(6):
+            expected += [f"[testcity][scraper] RUN row {n}"]
+            expected += [f"[testcity][scraper] r{n} line {i}" for i in range(3)]
+            expected += [f"[testcity][scraper] EXIT 0 row {n}"]
+        assert lines == expected
+
+    def test_rows_run_concurrently(self, scripts, capsys):
+        rows = [_row(scripts, 'stamps.py') for _ in range(4)]
+        _, lines = _run(capsys, rows, jobs=4)
+        spans = [tuple(map(float, line.split()[-2:])) for line in lines if 'span' in line]
+        # Every row started before any finished
+        assert len(spans) == 4
+        assert max(start for start, _ in spans) < min(end for _, end in spans)
+
+    def test_subprocess_timeout_kills_the_row(self, scripts, capsys):
+        rows = [_row(scripts, 'hangs.py'), _row(scripts, 'exits.py')]
+        start = time.monotonic()
+        failures, lines = _run(capsys, rows, jobs=2, timeout=0.5)
+        assert time.monotonic() - start < 10
+        assert failures == 2
+        assert lines[:3] == [
+            '[testcity][scraper] RUN hangs.py',
+            '[testcity][scraper] Timed out after 0.5s',
+            '[testcity][scraper] EXIT 124 hangs.py',
+        ]
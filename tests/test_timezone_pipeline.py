@@ -20,7 +20,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
 
 from scripts.combine_ics import expand_rrules, parse_ics_datetime as combine_parse_dt
-from scripts.ics_to_json import parse_ics_datetime as json_parse_dt, extract_field
+from scripts.ics_props import parse_properties
+from scripts.ics_to_json import parse_ics_datetime as json_parse_dt, props_field, props_raw_datetime
 from tests.helpers import make_ics, make_vevent, VTIMEZONE_LA, VTIMEZONE_NY
 
 
@@ -68,7 +69,7 @@ class TestIcsToJsonParseDatetime:
         7pm Eastern = 4pm Pacific, but we get 7pm Pacific. Wrong by 3 hours.
         """
         la_tz = ZoneInfo("America/Los_Angeles")
-        # This is what extract_field currently returns for
+        # This is what props_field currently returns for
         # DTSTART;TZID=America/New_York:20250115T190000
         # — it strips the TZID and returns just "20250115T190000"
         result = json_parse_dt("20250115T190000", la_tz)
@@ -107,35 +108,42 @@ class TestIcsToJsonParseDatetime:
 
 
 # ===========================================================================
-# Test 2: extract_field — does it preserve or lose TZID?
+# Test 2: props_field — does it preserve or lose TZID?
 # ===========================================================================
 
-class TestExtractField:
-    """Tests for ics_to_json.py extract_field with DTSTART."""
+class TestPropsField:
+    """Tests for ics_to_json.py props_field / props_raw_datetime with DTSTART."""
 
     def test_bare_dtstart(self):
         """DTSTART with no params returns bare value."""
         content = "DTSTART:20250115T190000\r\nSUMMARY:Test"
-        result = extract_field(content, 'DTSTART')
+        result = props_field(parse_properties(content), 'DTSTART')
         assert result == "20250115T190000"
 
     def test_tzid_dtstart_loses_tzid(self):
         """
-        BUG: extract_field strips TZID, returns only the datetime value.
-        The regex (?:;[^:]*)?:([^\r\n]*) captures only after the colon.
+        props_field strips TZID, returns only the datetime value.
+        Datetime fields go through props_raw_datetime instead.
         """
         content = "DTSTART;TZID=America/New_York:20250115T190000\r\nSUMMARY:Test"
-        result = extract_field(content, 'DTSTART')
+        result = props_field(parse_properties(content), 'DTSTART')
         # Currently returns just the datetime — TZID is lost
         assert result == "20250115T190000"
 
-    def test_extract_field_should_preserve_tzid(self):
+    def test_props_raw_datetime_keeps_tzid(self):
+        """props_raw_datetime returns the full property when it has params."""
+        props = parse_properties("DTSTART;TZID=America/New_York:20250115T190000\r\nSUMMARY:Test")
+        assert props_raw_datetime(props, 'DTSTART') == "DTSTART;TZID=America/New_York:20250115T190000"
+        props = parse_properties("DTSTART:20250115T190000\r\nSUMMARY:Test")
+        assert props_raw_datetime(props, 'DTSTART') == "20250115T190000"
+
+    def test_props_field_should_preserve_tzid(self):
         """
         DESIRED BEHAVIOR: For datetime fields, we need the TZID.
 
         This test documents what we WANT. The fix could be:
         (a) A new extract_datetime_field that returns (tzid, value), or
-        (b) Change extract_field to return "TZID=America/New_York:20250115T190000", or
+        (b) Change props_field to return "TZID=America/New_York:20250115T190000", or
         (c) Have parse_ics_datetime receive the full raw line from event_content directly.
         """
         content = "DTSTART;TZID=America/New_York:20250115T190000\r\nSUMMARY:Test"
@@ -266,7 +274,7 @@ class TestFullPipeline:
         """
         la_tz = ZoneInfo("America/Los_Angeles")
 
-        # Simulate what extract_field + parse_ics_datetime currently does:
+        # Simulate what props_field + parse_ics_datetime would do:
         # The TZID is lost, so 7pm is stamped as Pacific
         raw_line = "DTSTART;TZID=America/New_York:20250115T190000"
         result = json_parse_dt(raw_line, la_tz)
@@ -620,16 +628,14 @@ class TestRealIcsFiles:
         if not ics_path.exists():
             return []
         content = ics_path.read_text(encoding='utf-8', errors='ignore')
-        from scripts.ics_to_json import extract_raw_datetime, parse_ics_datetime, unfold_ics_lines
-        content = unfold_ics_lines(content)
         local_tz = ZoneInfo(city_tz_name)
         pattern = r'BEGIN:VEVENT\r?\n(.*?)\r?\nEND:VEVENT'
         matches = re.findall(pattern, content, re.DOTALL)
         results = []
         for event_content in matches[:max_events]:
-            raw = extract_raw_datetime(event_content, 'DTSTART')
+            raw = props_raw_datetime(parse_properties(event_content), 'DTSTART')
             if raw:
-                parsed = parse_ics_datetime(raw, local_tz)
+                parsed = json_parse_dt(raw, local_tz)
                 if parsed:
                     results.append((raw, parsed))
         return results
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for scripts/title_similarity.py.
+
+Run: python -m pytest tests/test_title_similarity.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from scripts.similarity_test import similarity_token_set
+from scripts.title_similarity import NUMPY_MIN_BATCH, TitleSimilarity
+
+TITLES = [
+    'Family Storytime', 'Bilingual Family Storytime', 'Storytime', 'Storytimes',
+    'Open Mic', 'Open-Mic Night', 'Honky Tonk Open Mic', 'Karaoke Sundays',
+    'Sabroso Sundays', 'Jazz Jam', 'Jazz Jams', 'Lego Club', 'Café Crème', '  ',
+]
+
+
+class TestScore:
+
+    @pytest.mark.parametrize('a, b, expected', [
+        ('One-On-One Tech Help', 'Tech Help', 1.0),
+        ('Bilingual Family Storytime', 'Family Storytime', 1.0),
+        ('Community Coffee Tasting', 'Community Yoga', 0.783),
+        ('Mushroom Hike', 'Mushroom Identification', 0.762),
+        ('Karaoke Sundays', 'Sabroso Sundays', 0.733),
+        ('Honky Tonk Open Mic', 'Open Mic Night', 0.727),
+    ])
+    def test_known_scores(self, a, b, expected):
+        assert TitleSimilarity().score(a, b) == pytest.approx(expected, abs=0.001)
+
+    def test_similarity_test_uses_same_scores(self):
+        sim = TitleSimilarity()
+        for a in TITLES:
+            for b in TITLES:
+                assert similarity_token_set(a, b) == sim.score(a, b)
+
+
+class TestBounds:
+    """Bounds never under-estimate a score, with or without NumPy."""
+
+    @pytest.mark.parametrize('use_numpy', [False, True])
+    def test_upper_bound_holds(self, use_numpy):
+        if use_numpy:
+            pytest.importorskip('numpy')
+        sim = TitleSimilarity(use_numpy=use_numpy)
+        others = TITLES * (NUMPY_MIN_BATCH // len(TITLES) + 1)
+        for a in TITLES:
+            for b, bound in zip(others, sim.bounds(a, others)):
+                assert bound >= sim.score(a, b)
+
+    def test_numpy_matches_pure_python(self):
+        pytest.importorskip('numpy')
+        others = TITLES * (NUMPY_MIN_BATCH // len(TITLES) + 1)
+        for a in TITLES:
+            assert TitleSimilarity(use_numpy=True).bounds(a, others) == \
+                TitleSimilarity(use_numpy=False).bounds(a, others)
+
+    def test_candidates_cover_matches(self):
+        sim = TitleSimilarity()
+        candidates = set(sim.candidate_pairs(TITLES, 0.85))
+        for i, a in enumerate(TITLES):
+            for j in range(i + 1, len(TITLES)):
+                if sim.score(a, TITLES[j]) >= 0.85:
+                    assert (i, j) in candidates
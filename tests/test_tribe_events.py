@@ -53,7 +53,7 @@ class TestFetchEventsHeaders:
     """TribeEventsScraper.fetch_events() should pass the correct headers."""
 
     def test_fetch_events_uses_headers(self):
-        """fetch_events should pass HEADERS to requests.get."""
+        """fetch_events should pass HEADERS to the shared HTTP client."""
         mock_response = {
             'events': [],
             'total': 0,
@@ -70,14 +70,14 @@ class TestFetchEventsHeaders:
 
         scraper = TestScraper()
 
-        with patch('scrapers.lib.tribe_events.requests.get') as mock_get:
+        with patch('scrapers.lib.http_client.ScopedHttpClient.get') as mock_get:
             mock_get.return_value.ok = True
             mock_get.return_value.status_code = 200
             mock_get.return_value.json.return_value = mock_response
 
             scraper.fetch_events()
 
-            # Verify requests.get was called once with the correct headers
+            # Verify http.get was called once with the correct headers
             mock_get.assert_called_once_with(
                 f"{scraper.api_url}?per_page={scraper.per_page}&page=1",
                 headers=HEADERS,